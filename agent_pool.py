@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Agent Pool for the Disney Coordinator
+Runs several interchangeable replicas of one character side by side
+"""
+
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Union
+from agent_reservation import Reservation
+
+# Replica counts: one number for every character, or per character
+ReplicaConfig = Union[int, Dict[str, int]]
+
+
+class AgentPool:
+    """
+    Agent Pool - interchangeable replicas of one character.
+
+    A performance reserves a free replica for as long as it runs, so with N
+    replicas up to N performances of the same character can run at once.
+    The first replica keeps the character's plain name; the others are
+    numbered ("Mickey Mouse #2") so their events and results can be told apart.
+    """
+
+    def __init__(self, agent_class, size: int = 1, engine=None, policy=None):
+        if size < 1:
+            raise ValueError(f"An agent pool needs at least 1 replica, got {size}")
+        self.replicas: List = [agent_class(engine=engine) for _ in range(size)]
+        for number, replica in enumerate(self.replicas[1:], start=2):
+            replica.name = f"{replica.name} #{number}"
+        # Orders free replicas for try_reserve (e.g. an EnergyPolicy); None keeps pool order
+        self.policy = policy
+        # Requests turned away because every replica was busy
+        self.rejections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        """The character's name."""
+        return self.primary.name
+
+    @property
+    def primary(self):
+        """The first replica, used wherever a single agent is expected."""
+        return self.replicas[0]
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.replicas)
+
+    def try_reserve(self, holder: str) -> Optional[Reservation]:
+        """Reserve the first free replica in policy order, or return None when every replica is busy."""
+        replicas = self.replicas if self.policy is None else self.policy.order(self.replicas)
+        for replica in replicas:
+            if replica.is_performing:
+                continue
+            # Another thread may take it between the check and the reservation
+            reservation = replica.reservation.try_reserve(holder)
+            if reservation is not None:
+                return reservation
+        with self._lock:
+            self.rejections += 1
+        return None
+
+    @property
+    def available(self) -> int:
+        """Number of free replicas."""
+        return sum(1 for replica in self.replicas if not replica.is_performing)
+
+    @property
+    def energy(self) -> int:
+        """Average energy across the replicas."""
+        return round(sum(replica.energy for replica in self.replicas) / len(self.replicas))
+
+    def get_status(self) -> Dict[str, str]:
+        """The character's status, aggregated across every replica."""
+        status = self.primary.get_status()
+        status["name"] = self.name
+        status["energy"] = f"{self.energy}%"
+        status["is_performing"] = str(self.available == 0)
+        status["replicas"] = str(len(self.replicas))
+        status["replicas_available"] = str(self.available)
+        status["busy_rejections"] = str(self.rejections)
+        return status
+
+    def get_reservation_stats(self) -> Dict[str, Dict]:
+        """Reservation and contention counters for each replica."""
+        return {replica.name: replica.reservation.get_stats() for replica in self.replicas}
+
+
+def replicas_for(config: ReplicaConfig, character: str) -> int:
+    """Replica count for one character from a ReplicaConfig (default 1)."""
+    if isinstance(config, int):
+        return config
+    return config.get(character, 1)
+
+
+def replicas_from_environment(variable: str = "DISNEY_REPLICAS") -> ReplicaConfig:
+    """
+    Read replica counts from an environment variable.
+
+    Accepts a number for every character (e.g. "8") or per-character counts
+    ("mickey=8,donald=4"); unset means one of each.
+    """
+    value = os.environ.get(variable, "").strip()
+    if not value:
+        return 1
+    try:
+        if "=" not in value:
+            return int(value)
+        config = {}
+        for item in value.split(","):
+            character, count = item.split("=")
+            config[character.strip().lower()] = int(count)
+        return config
+    except ValueError:
+        raise ValueError(f"Invalid {variable} value '{value}': use a number or 'name=count' pairs")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Agent Population for the Disney Coordinator
+Thousands of simulated characters kept as parallel typed arrays
+"""
+
+import random
+import threading
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+from energy_policy import DEFAULT_REST_THRESHOLD
+from performance_catalog import Catalog, PerformerCatalog, default_catalog
+
+# Performer -> (display name, starting mood), as the full agents start
+PERFORMERS: Dict[str, Tuple[str, str]] = {
+    "mickey": ("Mickey Mouse", "happy"),
+    "donald": ("Donald Duck", "energetic"),
+}
+MOODS = ("happy", "energetic", "excited", "tired", "grumpy")
+ACTIONS = ("idle", "sing", "wave", "dance", "show", "rest")
+# Energy change of each action, as the agents' scripts apply it. A show's
+# inner wave, song and dance ask for the agent the show already holds, so
+# they report it busy and a whole show leaves energy unchanged
+ENERGY_CHANGES = {"sing": -10, "dance": -15, "show": 0, "rest": 30}
+MAX_ENERGY = 100
+
+# One byte per field per character
+FIELD_TYPE = "B"
+
+
+class AgentPopulation:
+    """
+    Agent Population - many simulated characters as one struct of arrays.
+
+    Instead of a full agent object per character (with its own reservation,
+    lock and condition, over a kilobyte each), each character is one position
+    in a few typed arrays: performer, energy, mood, a busy flag and the
+    current action, one byte each. Songs and dances come from the shared catalog.
+    `member` returns a small slotted view of one character when code wants
+    an object; the arrays stay the only copy of the state.
+
+    `try_start` books a character for an action like a reservation does
+    (False if it is busy) and applies the action's energy change; `finish`
+    frees it. `tick` advances a whole population one step.
+    """
+
+    def __init__(self, catalog: Optional[Catalog] = None):
+        self.catalog = catalog or default_catalog()
+        self._lock = threading.Lock()
+        self._performer_keys = list(PERFORMERS)
+        self.performers = array(FIELD_TYPE)
+        self.energy = array(FIELD_TYPE)
+        self.moods = array(FIELD_TYPE)
+        self.busy = array(FIELD_TYPE)
+        self.actions = array(FIELD_TYPE)
+        # Requests turned away because the character was busy
+        self.conflicts = 0
+
+    def __len__(self) -> int:
+        return len(self.performers)
+
+    def add(self, performer: str, count: int = 1, energy: int = MAX_ENERGY,
+            mood: Optional[str] = None) -> range:
+        """Add `count` characters of one performer; returns their indexes."""
+        if performer not in PERFORMERS:
+            raise ValueError(f"Unknown performer '{performer}' (expected one of {', '.join(PERFORMERS)})")
+        # Raises CatalogError if the catalog has nothing for them
+        self.catalog.performer(performer)
+        mood = mood or PERFORMERS[performer][1]
+        if mood not in MOODS:
+            raise ValueError(f"Unknown mood '{mood}' (expected one of {', '.join(MOODS)})")
+        if not 0 <= energy <= MAX_ENERGY or count < 0:
+            raise ValueError(f"Energy must be between 0 and {MAX_ENERGY} and count non-negative")
+        with self._lock:
+            start = len(self.performers)
+            self.performers.extend(array(FIELD_TYPE, [self._performer_keys.index(performer)]) * count)
+            self.energy.extend(array(FIELD_TYPE, [energy]) * count)
+            self.moods.extend(array(FIELD_TYPE, [MOODS.index(mood)]) * count)
+            self.busy.extend(array(FIELD_TYPE, [0]) * count)
+            self.actions.extend(array(FIELD_TYPE, [0]) * count)
+        return range(start, start + count)
+
+    def member(self, index: int) -> "PopulationMember":
+        """A view of one character (raises IndexError for unknown indexes)."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"No character {index} in a population of {len(self)}")
+        return PopulationMember(self, index)
+
+    def __iter__(self) -> Iterator["PopulationMember"]:
+        for index in range(len(self)):
+            yield PopulationMember(self, index)
+
+    def performer(self, index: int) -> str:
+        return self._performer_keys[self.performers[index]]
+
+    def performer_catalog(self, index: int) -> PerformerCatalog:
+        """The shared catalog entry of a character's performer."""
+        return self.catalog.performer(self.performer(index))
+
+    def try_start(self, index: int, action: str) -> bool:
+        """Book a character for `action` if it is free; never waits."""
+        code = ACTIONS.index(action)
+        with self._lock:
+            if self.busy[index]:
+                self.conflicts += 1
+                return False
+            self.busy[index] = 1
+            self.actions[index] = code
+            change = ENERGY_CHANGES.get(action, 0)
+            self.energy[index] = max(0, min(MAX_ENERGY, self.energy[index] + change))
+        return True
+
+    def finish(self, index: int):
+        """Free a character after its action."""
+        with self._lock:
+            self.busy[index] = 0
+            self.actions[index] = 0
+
+    def tick(self, rng: Optional[random.Random] = None,
+             rest_threshold: int = DEFAULT_REST_THRESHOLD) -> int:
+        """
+        One simulation step: busy characters finish, tired ones (below
+        `rest_threshold`) rest and everyone else starts a random song, wave
+        or dance. Returns the number of actions started.
+        """
+        rng = rng or random
+        choices = [ACTIONS.index(action) for action in ("sing", "wave", "dance")]
+        rest = ACTIONS.index("rest")
+        started = 0
+        with self._lock:
+            energy, busy, actions = self.energy, self.busy, self.actions
+            for index in range(len(busy)):
+                if busy[index]:
+                    busy[index] = actions[index] = 0
+                    continue
+                code = rest if energy[index] < rest_threshold else rng.choice(choices)
+                change = ENERGY_CHANGES.get(ACTIONS[code], 0)
+                energy[index] = max(0, min(MAX_ENERGY, energy[index] + change))
+                busy[index], actions[index] = 1, code
+                started += 1
+        return started
+
+    def get_status(self, index: int) -> Dict[str, str]:
+        """A character's status, in the shape the full agents report it."""
+        catalog = self.performer_catalog(index)
+        return {
+            "name": PopulationMember(self, index).name,
+            "mood": MOODS[self.moods[index]],
+            "energy": f"{self.energy[index]}%",
+            "is_performing": str(bool(self.busy[index])),
+            "available_songs": str(len(catalog.song_titles)),
+            "available_dances": str(len(catalog.dance_titles))
+        }
+
+    def nbytes(self) -> int:
+        """Bytes held by the state arrays."""
+        return sum(len(field) * field.itemsize
+                   for field in (self.performers, self.energy, self.moods, self.busy, self.actions))
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            count = len(self)
+            return {
+                "characters": count,
+                "busy": self.busy.count(1),
+                "actions": {action: self.actions.count(code)
+                            for code, action in enumerate(ACTIONS) if code},
+                "average_energy": round(sum(self.energy) / count, 1) if count else 0.0,
+                "conflicts": self.conflicts,
+                "bytes": self.nbytes(),
+            }
+
+
+class PopulationMember:
+    """
+    Population Member - one character of an AgentPopulation.
+
+    Only a reference to the population and an index; reading or setting an
+    attribute reads or writes the population's arrays.
+    """
+
+    __slots__ = ("population", "index")
+
+    def __init__(self, population: AgentPopulation, index: int):
+        self.population = population
+        self.index = index
+
+    @property
+    def performer(self) -> str:
+        return self.population.performer(self.index)
+
+    @property
+    def name(self) -> str:
+        """Display name, numbered like pool replicas ("Mickey Mouse #12")."""
+        return f"{PERFORMERS[self.performer][0]} #{self.index + 1}"
+
+    @property
+    def catalog(self) -> PerformerCatalog:
+        return self.population.performer_catalog(self.index)
+
+    @property
+    def songs(self):
+        return self.catalog.song_titles
+
+    @property
+    def dance_moves(self):
+        return self.catalog.dance_titles
+
+    @property
+    def energy(self) -> int:
+        return self.population.energy[self.index]
+
+    @energy.setter
+    def energy(self, value: int):
+        self.population.energy[self.index] = max(0, min(MAX_ENERGY, value))
+
+    @property
+    def mood(self) -> str:
+        return MOODS[self.population.moods[self.index]]
+
+    @mood.setter
+    def mood(self, value: str):
+        if value not in MOODS:
+            raise ValueError(f"Unknown mood '{value}' (expected one of {', '.join(MOODS)})")
+        self.population.moods[self.index] = MOODS.index(value)
+
+    @property
+    def is_performing(self) -> bool:
+        return bool(self.population.busy[self.index])
+
+    @property
+    def action(self) -> str:
+        """What the character is doing ("idle" when free)."""
+        return ACTIONS[self.population.actions[self.index]]
+
+    def get_status(self) -> Dict[str, str]:
+        return self.population.get_status(self.index)
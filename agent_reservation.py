@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Agent Reservations for the Disney Coordinator
+Atomically books agents for a performance and releases them afterwards
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+from performance_engine import PerformanceScript
+
+
+class AgentReservation:
+    """
+    Agent Reservation - the lock-protected "who is performing" slot of one agent.
+
+    `try_reserve` either books the agent and returns a `Reservation` or returns
+    None straight away; `reserve` waits for the agent to become free. Counters
+    record how often requests found the agent busy, how long they waited for
+    it, and how often threads had to queue for the slot's own lock.
+    """
+
+    __slots__ = ("agent", "_condition", "_holder", "coordinating", "_reservations", "_conflicts", "_waits",
+                 "_wait_seconds", "_lock_contentions", "_lock_wait_seconds")
+
+    def __init__(self, agent):
+        self.agent = agent
+        self._condition = threading.Condition(threading.Lock())
+        self._holder: Optional[str] = None
+        # Set by the holder while the agent performs in a coordinated duet or
+        # ensemble; cleared on release however the performance ends
+        self.coordinating = False
+        self._reservations = 0
+        self._conflicts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._lock_contentions = 0
+        self._lock_wait_seconds = 0.0
+
+    @property
+    def is_reserved(self) -> bool:
+        """Whether the agent is booked for a performance."""
+        return self._holder is not None
+
+    @property
+    def holder(self) -> Optional[str]:
+        """What the agent is booked for (e.g. "sing" or "duet_song"), or None."""
+        return self._holder
+
+    def _acquire_lock(self):
+        if self._condition.acquire(blocking=False):
+            return
+        started = time.perf_counter()
+        self._condition.acquire()
+        self._lock_contentions += 1
+        self._lock_wait_seconds += time.perf_counter() - started
+
+    def try_reserve(self, holder: str) -> Optional["Reservation"]:
+        """Book the agent if it is free; never waits."""
+        self._acquire_lock()
+        try:
+            if self._holder is not None:
+                self._conflicts += 1
+                return None
+            self._holder = holder
+            self._reservations += 1
+        finally:
+            self._condition.release()
+        return Reservation([self], holder)
+
+    def reserve(self, holder: str, timeout: Optional[float] = None) -> Optional["Reservation"]:
+        """Book the agent, waiting up to `timeout` seconds for it; None on timeout."""
+        self._acquire_lock()
+        try:
+            if self._holder is not None:
+                self._waits += 1
+                started = time.perf_counter()
+                free = self._condition.wait_for(lambda: self._holder is None, timeout)
+                self._wait_seconds += time.perf_counter() - started
+                if not free:
+                    self._conflicts += 1
+                    return None
+            self._holder = holder
+            self._reservations += 1
+        finally:
+            self._condition.release()
+        return Reservation([self], holder)
+
+    def release(self):
+        """Free the agent and wake anyone waiting for it."""
+        self._acquire_lock()
+        try:
+            self._holder = None
+            self.coordinating = False
+            self._condition.notify_all()
+        finally:
+            self._condition.release()
+
+    def get_stats(self) -> Dict:
+        """Reservation and contention counters."""
+        return {
+            "holder": self._holder,
+            "coordinating": self.coordinating,
+            "reservations": self._reservations,
+            "conflicts": self._conflicts,
+            "waits": self._waits,
+            "wait_ms": round(self._wait_seconds * 1000, 3),
+            "lock_contentions": self._lock_contentions,
+            "lock_wait_ms": round(self._lock_wait_seconds * 1000, 3),
+        }
+
+
+class Reservation:
+    """
+    Reservation - one or more agents booked together. Use it as a context
+    manager so the agents are released however the performance ends.
+    """
+
+    def __init__(self, slots: List[AgentReservation], holder: str):
+        self.slots = slots
+        self.holder = holder
+        self._released = False
+
+    @property
+    def agents(self) -> List:
+        """The reserved agents."""
+        return [slot.agent for slot in self.slots]
+
+    def join(self, other: "Reservation") -> "Reservation":
+        """Merge another reservation into a new one that releases both."""
+        joined = Reservation(self.slots + other.slots, self.holder)
+        self._released = other._released = True
+        return joined
+
+    def release(self):
+        """Release every agent; calling it again does nothing."""
+        if self._released:
+            return
+        self._released = True
+        for slot in reversed(self.slots):
+            slot.release()
+
+    def __enter__(self) -> "Reservation":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _ordered(slots: Iterable[AgentReservation]) -> List[AgentReservation]:
+    # One global order for multi-agent bookings, so two waiting requests
+    # can never each hold an agent the other needs
+    return sorted(slots, key=id)
+
+
+def try_reserve_all(slots: Iterable[AgentReservation], holder: str) -> Optional[Reservation]:
+    """Book every agent or none of them; never waits."""
+    taken = []
+    for slot in _ordered(slots):
+        reservation = slot.try_reserve(holder)
+        if reservation is None:
+            for held in reversed(taken):
+                held.release()
+            return None
+        taken.append(slot)
+    return Reservation(taken, holder)
+
+
+def reserve_all(slots: Iterable[AgentReservation], holder: str,
+                timeout: Optional[float] = None) -> Optional[Reservation]:
+    """Book every agent, waiting up to `timeout` seconds in total; None on timeout."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    taken = []
+    for slot in _ordered(slots):
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        reservation = slot.reserve(holder, remaining)
+        if reservation is None:
+            for held in reversed(taken):
+                held.release()
+            return None
+        taken.append(slot)
+    return Reservation(taken, holder)
+
+
+def reserved_script(slot: AgentReservation, holder: str, script: Callable[[], PerformanceScript],
+                    busy_result: str) -> PerformanceScript:
+    """Run a performance script while holding an agent's reservation; returns `busy_result` if it is taken."""
+    reservation = slot.try_reserve(holder)
+    if reservation is None:
+        return busy_result
+    with reservation:
+        return (yield from script())
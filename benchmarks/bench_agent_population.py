@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Agent Population Benchmark for the Disney Coordinator
+Memory per character for full agents and for the array-backed population, and simulation speed
+
+Usage: python3 benchmarks/bench_agent_population.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_population import AgentPopulation
+from donald_duck_agent import DonaldDuckAgent
+from mickey_mouse_agent import MickeyMouseAgent
+from output_sinks import NullSink
+from performance_catalog import default_catalog
+from performance_engine import PerformanceEngine
+
+
+def traced(build):
+    """What `build()` allocates, in bytes, and its result."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return allocated, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ticks", type=int, default=10)
+    args = parser.parse_args()
+
+    # Load the shared catalog up front so no measurement includes it
+    default_catalog()
+    engine = PerformanceEngine(None, [NullSink()])
+
+    def agents(size):
+        return [(MickeyMouseAgent if number % 2 else DonaldDuckAgent)(engine=engine) for number in range(size)]
+
+    def population(size):
+        characters = AgentPopulation()
+        characters.add("mickey", size - size // 2)
+        characters.add("donald", size // 2)
+        return characters
+
+    print(f"{'characters':>10}  {'agents B/each':>13}  {'population B/each':>17}  {'+views B/each':>13}  "
+          f"{'tick ms':>8}")
+    for size in args.sizes:
+        agent_bytes, _ = traced(lambda: agents(size))
+        population_bytes, characters = traced(lambda: population(size))
+        # Views are only made on demand; this is the cost of holding one per character
+        view_bytes, _ = traced(lambda: list(characters))
+        generator = random.Random(5)
+        started = time.perf_counter()
+        for _ in range(args.ticks):
+            characters.tick(generator)
+        tick = (time.perf_counter() - started) / args.ticks
+        print(f"{size:>10}  {agent_bytes / size:>13.0f}  {population_bytes / size:>17.1f}  "
+              f"{view_bytes / size:>13.0f}  {tick * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Energy Policy Benchmark for the Disney Coordinator
+Reports the sustained shows/hour a steady programme achieves at each rest threshold
+
+Usage: python3 benchmarks/bench_energy.py [--shows 200]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disney_coordinator import DisneyCoordinatorVisualAudio
+from energy_policy import EnergyPolicy
+from performance_clock import VirtualClock
+
+# A steady programme: solos for both characters and a duet
+PROGRAMME = [("mickey", "sing"), ("mickey", "dance"), ("donald", "sing"), ("donald", "dance"), ("duet", "song")]
+
+
+def measure(threshold, shows):
+    """Run the programme back to back in virtual time and return the energy report."""
+    random.seed(0)
+    coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[],
+                                               energy_policy=EnergyPolicy(threshold))
+    lowest = 100
+    for agent, action in itertools.islice(itertools.cycle(PROGRAMME), shows):
+        coordinator.perform(agent, action)
+        lowest = min(lowest, coordinator.mickey.energy, coordinator.donald.energy)
+    report = coordinator.get_energy_report()
+    report["lowest_energy"] = lowest
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shows", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'threshold':>9}  {'rests':>5}  {'rest %':>6}  {'shows/h':>8}  {'lowest':>6}")
+    for threshold in (0, 15, 30, 50, 70):
+        report = measure(threshold, args.shows)
+        rest_share = 100 * report["rest_seconds"] / report["performance_seconds"]
+        print(f"{threshold:>9}  {report['rests']:>5}  {rest_share:>6.1f}  "
+              f"{report['shows_per_hour']:>8.1f}  {report['lowest_energy']:>5}%")
+
+
+if __name__ == "__main__":
+    main()
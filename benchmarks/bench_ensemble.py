@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Ensemble Show Benchmark for the Disney Coordinator
+Compares how long the ensemble show takes with its solo segments run serially or in parallel
+
+Usage: python3 benchmarks/bench_ensemble.py [--shows 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disney_coordinator import DisneyCoordinatorVisualAudio, ENSEMBLE_MODES
+from performance_clock import VirtualClock
+
+
+def measure(mode, shows):
+    """Average show length in performance time, and wall-clock cost of computing one."""
+    random.seed(0)
+    coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+    started = time.perf_counter()
+    for _ in range(shows):
+        coordinator.perform_ensemble_show(mode)
+        # Keep energy from running low so every show has the same shape
+        for agent in (coordinator.mickey, coordinator.donald):
+            agent.energy = 100
+    elapsed = time.perf_counter() - started
+    return coordinator.clock.now() / shows, elapsed / shows * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shows", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'mode':>8}  {'show length s':>13}  {'cpu ms/show':>11}")
+    for mode in ENSEMBLE_MODES:
+        length, cpu_ms = measure(mode, args.shows)
+        print(f"{mode:>8}  {length:>13.1f}  {cpu_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
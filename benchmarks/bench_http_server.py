@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+HTTP Server Benchmark for the Disney Coordinator
+Compares the legacy single-threaded server with the bounded worker pool
+
+Usage: python3 benchmarks/bench_http_server.py [--requests 2000] [--concurrency 16]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(port, extra_args):
+    """Start web_server.py in a subprocess and wait until it accepts connections."""
+    process = subprocess.Popen(
+        [sys.executable, "web_server.py", "--port", str(port)] + extra_args,
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env=dict(os.environ, DISNEY_TIME_SCALE="virtual"),
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def timed_request(port, path, timeout):
+    """Issue one GET on a fresh connection; returns latency in seconds or None on error."""
+    started = time.perf_counter()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+        connection.request("GET", path)
+        connection.getresponse().read()
+        connection.close()
+        return time.perf_counter() - started
+    except OSError:
+        return None
+
+
+def hold_slow_client(port, hold_seconds, ready):
+    """Open a connection, send half a request line and go quiet, like a slow client."""
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(b"GET /api/status HTT")
+        ready.set()
+        time.sleep(hold_seconds)
+
+
+def run_load(port, path, requests, concurrency, timeout):
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        latencies = list(pool.map(lambda _: timed_request(port, path, timeout), range(requests)))
+        elapsed = time.perf_counter() - started
+    ok = sorted(latency for latency in latencies if latency is not None)
+    return {
+        "rps": len(ok) / elapsed,
+        "p50": statistics.median(ok) * 1000 if ok else float("nan"),
+        "p99": ok[int(len(ok) * 0.99) - 1] * 1000 if ok else float("nan"),
+        "errors": len(latencies) - len(ok),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--path", default="/api/status")
+    parser.add_argument("--slow-hold", type=float, default=2.0,
+                        help="seconds the slow client keeps its connection open")
+    parser.add_argument("--port", type=int, default=18081)
+    args = parser.parse_args()
+
+    servers = [("single-threaded", ["--single-threaded"]), ("worker pool", ["--workers", "64"])]
+    print(f"{'server':<16} {'scenario':<12} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for offset, (name, extra_args) in enumerate(servers):
+        # A fresh port per server so TIME_WAIT sockets from the previous run don't matter
+        port = args.port + offset
+        process = start_server(port, extra_args)
+        try:
+            for scenario in ("plain", "slow client"):
+                slow = None
+                if scenario == "slow client":
+                    ready = threading.Event()
+                    slow = threading.Thread(target=hold_slow_client, args=(port, args.slow_hold, ready))
+                    slow.start()
+                    ready.wait()
+                result = run_load(port, args.path, args.requests, args.concurrency,
+                                  timeout=args.slow_hold + 10)
+                if slow:
+                    slow.join()
+                print(f"{name:<16} {scenario:<12} {result['rps']:>9.0f} {result['p50']:>9.2f} "
+                      f"{result['p99']:>9.2f} {result['errors']:>7}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
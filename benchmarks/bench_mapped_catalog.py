@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Mapped Catalog Benchmark for the Disney Coordinator
+Startup time, memory and lookup cost of JSON and memory-mapped catalogs of growing size
+
+Usage: python3 benchmarks/bench_mapped_catalog.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from performance_catalog import convert_catalog
+
+WORDS = ["magic", "quack", "dance", "star", "wish", "friend", "song", "spin",
+         "happy", "duck", "mouse", "bounce", "twirl", "shine", "heart", "dream"]
+
+# Runs in a fresh interpreter so each measurement starts from a clean process
+MEASURE = """
+import random, sys, time
+sys.path.insert(0, {root!r})
+from performance_catalog import open_catalog
+
+def rss():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+
+before = rss()
+started = time.perf_counter()
+catalog = open_catalog({path!r})
+opened = time.perf_counter() - started
+opened_memory = rss() - before
+performer = catalog.performer("mickey")
+titles = [f"Song {{random.randrange({songs})}}" for _ in range(10000)]
+started = time.perf_counter()
+for title in titles:
+    performer.lyrics(title)
+lookup = (time.perf_counter() - started) / len(titles)
+print(opened, opened_memory, rss() - before, lookup)
+"""
+
+
+def entry_lines(number):
+    return [" ".join(WORDS[(number * 7 + line * 3 + word) % len(WORDS)] for word in range(6)).capitalize() + "!"
+            for line in range(4)]
+
+
+def write_sources(directory, size):
+    """A JSON catalog and the same entries as JSON Lines, written as a stream."""
+    songs = size // 2
+    json_path = os.path.join(directory, "catalog.json")
+    jsonl_path = os.path.join(directory, "catalog.jsonl")
+    fallback = ["La la la..."]
+    with open(json_path, "w") as as_json, open(jsonl_path, "w") as as_jsonl:
+        as_json.write('{"version": 1, "performers": {"mickey": {')
+        for section, kind, first, count in (("songs", "song", 0, songs), ("dances", "dance", songs, size - songs)):
+            as_json.write(f'{", " if section == "dances" else ""}"{section}": {{')
+            for number in range(first, first + count):
+                title = f"{'Song' if kind == 'song' else 'Dance'} {number - first}"
+                lines = entry_lines(number)
+                as_json.write(f'{", " if number > first else ""}{json.dumps(title)}: {json.dumps(lines)}')
+                as_jsonl.write(json.dumps({"performer": "mickey", "kind": kind, "title": title, "lines": lines}) + "\n")
+            as_json.write("}")
+        as_json.write(f', "fallback_song": {json.dumps(fallback)}, "fallback_dance": {json.dumps(fallback)}}}}}}}')
+        for kind in ("fallback_song", "fallback_dance"):
+            as_jsonl.write(json.dumps({"performer": "mickey", "kind": kind, "lines": fallback}) + "\n")
+    return json_path, jsonl_path
+
+
+def measure(path, songs):
+    output = subprocess.run([sys.executable, "-c", MEASURE.format(root=ROOT, path=path, songs=songs)],
+                            check=True, capture_output=True, text=True).stdout
+    opened, opened_memory, memory, lookup = output.split()
+    return float(opened), int(opened_memory), int(memory), float(lookup)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    # RSS after opening, and after 10k random lookups (mapped pages touched by them count too)
+    print(f"{'entries':>9}  {'format':>6}  {'file MiB':>8}  {'startup':>9}  {'RSS MiB':>8}  "
+          f"{'+lookups':>8}  {'lookup µs':>9}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            json_path, jsonl_path = write_sources(directory, size)
+            mapped_path = os.path.join(directory, "catalog.dcat")
+            started = time.perf_counter()
+            convert_catalog(jsonl_path, mapped_path)
+            converted = time.perf_counter() - started
+            for name, path in (("json", json_path), ("mapped", mapped_path)):
+                opened, opened_memory, memory, lookup = measure(path, size // 2)
+                print(f"{size:>9}  {name:>6}  {os.path.getsize(path) / 2 ** 20:>8.1f}  "
+                      f"{opened * 1000:>7.1f}ms  {opened_memory / 2 ** 20:>8.1f}  "
+                      f"{memory / 2 ** 20:>8.1f}  {lookup * 1e6:>9.2f}")
+            print(f"{'':>9}  converted in {converted:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Output Sink Benchmark for the Disney Coordinator
+Times headless duet songs with each output sink, against line-by-line terminal output
+
+Usage: python3 benchmarks/bench_output_sinks.py [--shows 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disney_coordinator import DisneyCoordinatorVisualAudio
+from performance_clock import VirtualClock
+from output_sinks import OutputSink, NullSink, StdoutSink, RotatingFileSink, RingBufferSink
+
+
+def time_shows(output, shows):
+    """Microseconds per duet song (virtual clock, so only the work is timed)."""
+    random.seed(0)
+    coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), output=output)
+    started = time.perf_counter()
+    for _ in range(shows):
+        coordinator.perform("duet", "song")
+    output.flush()
+    return (time.perf_counter() - started) / shows * 1e6
+
+
+class TerminalSink(OutputSink):
+    """What TerminalRenderer does: one write per line, flushed at every newline on a terminal."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write_line(self, text):
+        self.stream.write(text + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shows", type=int, default=300, help="duet songs to perform")
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", buffering=1) as devnull, tempfile.TemporaryDirectory() as directory:
+        sinks = [
+            ("terminal", TerminalSink(devnull)),
+            ("stdout", StdoutSink(stream=devnull)),
+            ("file", RotatingFileSink(os.path.join(directory, "shows.log"), max_bytes=64 * 1024)),
+            ("ring", RingBufferSink()),
+            ("null", NullSink()),
+        ]
+        print(f"{'output':>10}  {'µs/show':>8}")
+        for name, sink in sinks:
+            print(f"{name:>10}  {time_shows(sink, args.shows):>8.0f}")
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Render Cache Benchmark for the Disney Coordinator
+Measures the CPU cost of a headless duet song with and without the melody frame cache
+
+Usage: python3 benchmarks/bench_render_cache.py [--shows 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disney_coordinator import DisneyCoordinatorVisualAudio
+from performance_clock import VirtualClock
+from render_cache import RenderCache
+
+
+class UncachedFrames(RenderCache):
+    """Renders every frame afresh, as before the cache existed."""
+
+    def get_or_render(self, key, render):
+        return render()
+
+
+def measure(cached, shows):
+    """Microseconds of CPU per duet song, and the frame cache's stats."""
+    random.seed(0)
+    coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+    if not cached:
+        coordinator.frames = UncachedFrames()
+    started = time.perf_counter()
+    for _ in range(shows):
+        coordinator.perform("duet", "song")
+    elapsed = time.perf_counter() - started
+    return elapsed / shows * 1e6, coordinator.frames.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shows", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'frames':>8}  {'us/duet':>8}  {'hit rate':>8}  {'entries':>7}")
+    for cached in (False, True):
+        micros, stats = measure(cached, args.shows)
+        print(f"{'cached' if cached else 'rebuilt':>8}  {micros:>8.0f}  {stats['hit_rate']:>8.3f}  {stats['entries']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Render Output Benchmark for the Disney Coordinator
+Counts write syscalls and bytes per show for line-by-line and frame-buffered output
+
+Usage: python3 benchmarks/bench_render_output.py [--shows 8] [--time-scale 20] [--fps 30]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disney_coordinator import DisneyCoordinatorVisualAudio
+from performance_clock import ScaledClock
+from terminal_renderer import TerminalRenderer, FrameBufferedRenderer
+
+
+class CountingSink(io.RawIOBase):
+    """A raw output file that counts write calls (one syscall each) and bytes."""
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.writes += 1
+        self.bytes += len(data)
+        return len(data)
+
+
+def terminal_stream(sink):
+    """A text stream that behaves like stdout on a terminal: flushed at every newline."""
+    return io.TextIOWrapper(io.BufferedWriter(sink), encoding="utf-8", line_buffering=True)
+
+
+async def run_shows(renderer, shows, time_scale):
+    random.seed(0)
+    coordinator = DisneyCoordinatorVisualAudio(clock=ScaledClock(time_scale), listeners=[renderer], replicas=shows)
+    await asyncio.gather(*(coordinator.perform_async("duet", "song") for _ in range(shows)))
+
+
+def measure(buffered, shows, time_scale, fps):
+    sink = CountingSink()
+    stream = terminal_stream(sink)
+    renderer = FrameBufferedRenderer(stream, fps=fps) if buffered else TerminalRenderer(stream)
+    asyncio.run(run_shows(renderer, shows, time_scale))
+    if buffered:
+        renderer.flush()
+    stream.flush()
+    return sink.writes / shows, sink.bytes / shows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shows", type=int, default=8, help="duet songs running at once")
+    parser.add_argument("--time-scale", type=float, default=20.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(f"{'renderer':>14}  {'writes/show':>11}  {'bytes/show':>10}")
+    for buffered in (False, True):
+        writes, written = measure(buffered, args.shows, args.time_scale, args.fps)
+        name = f"frames@{args.fps:g}fps" if buffered else "line by line"
+        print(f"{name:>14}  {writes:>11.1f}  {written:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Agent Replica Benchmark for the Disney Coordinator
+Measures how many Mickey songs complete under steady demand as replicas are added
+
+Usage: python3 benchmarks/bench_replicas.py [--clients 16] [--seconds 2] [--time-scale 100]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disney_coordinator import DisneyCoordinatorVisualAudio
+from performance_clock import ScaledClock
+
+
+async def client(coordinator, deadline, counts):
+    """Ask Mickey to sing again and again until the deadline, backing off briefly when rejected."""
+    while time.monotonic() < deadline:
+        result = await coordinator.perform_async("mickey", "sing")
+        if "already performing" in result:
+            counts["rejected"] += 1
+            await asyncio.sleep(0.005)
+        else:
+            counts["completed"] += 1
+
+
+async def measure(replicas, clients, seconds, time_scale):
+    coordinator = DisneyCoordinatorVisualAudio(clock=ScaledClock(time_scale), listeners=[], replicas=replicas)
+    counts = {"completed": 0, "rejected": 0}
+    deadline = time.monotonic() + seconds
+    await asyncio.gather(*(client(coordinator, deadline, counts) for _ in range(clients)))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--time-scale", type=float, default=100.0)
+    args = parser.parse_args()
+
+    print(f"{'replicas':>8}  {'songs':>6}  {'songs/s':>8}  {'rejected':>8}")
+    for replicas in (1, 2, 4, 8, 16):
+        counts = asyncio.run(measure(replicas, args.clients, args.seconds, args.time_scale))
+        rate = counts["completed"] / args.seconds
+        print(f"{replicas:>8}  {counts['completed']:>6}  {rate:>8.1f}  {counts['rejected']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Search Index Benchmark for the Disney Coordinator
+Build time, memory and query latency of the catalog search index on a large synthetic catalog
+
+Usage: python3 benchmarks/bench_search_index.py [--entries 100000] [--vocabulary 20000]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex
+
+
+def vocabulary(size):
+    """Made-up words; word `n` is drawn with a probability proportional to 1/(n+1), as in real text."""
+    syllables = ["ba", "do", "qua", "mi", "ck", "ey", "lu", "na", "ro", "ti", "ze", "po", "fa", "shi"]
+    words = []
+    for number in range(size):
+        word, value = "", number + 1
+        while value:
+            value, digit = divmod(value, len(syllables))
+            word += syllables[digit]
+        words.append(word)
+    cumulative = list(itertools.accumulate(1 / (rank + 1) for rank in range(size)))
+    return words, cumulative
+
+
+def rss():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+
+
+def build(entries, words, cumulative):
+    generator = random.Random(7)
+    index = SearchIndex()
+    started = time.perf_counter()
+    for number in range(entries):
+        title = " ".join(generator.choices(words, cum_weights=cumulative, k=3))
+        lines = [" ".join(generator.choices(words, cum_weights=cumulative, k=6)) for _ in range(4)]
+        index.add("mickey", "song" if number % 2 else "dance", f"{title} {number}", lines)
+    return index, time.perf_counter() - started
+
+
+def latency(index, queries, repeat):
+    """Median and 99th percentile latency in microseconds, and average result count."""
+    timings, found = [], 0
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            found += len(index.search(query))
+            timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99)], found / (repeat * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    words, cumulative = vocabulary(args.vocabulary)
+    before = rss()
+    index, built = build(args.entries, words, cumulative)
+    memory = rss() - before
+    stats = index.get_stats()
+    print(f"Indexed {stats['documents']} entries ({stats['terms']} terms, {stats['postings']} postings) "
+          f"in {built:.1f}s, {memory / 2 ** 20:.0f} MiB")
+
+    generator = random.Random(11)
+    rare = words[len(words) // 2:]
+    workloads = {
+        "rare term": generator.sample(rare, 50),
+        "common term": words[:50],
+        "two terms": [f"{generator.choice(words[:200])} {generator.choice(words[:2000])}" for _ in range(50)],
+        "rare + common": [f"{generator.choice(rare)} {generator.choice(words[:20])}" for _ in range(50)],
+        "two common": [f"{generator.choice(words[:5])} {generator.choice(words[5:20])}" for _ in range(50)],
+        "prefix": [word[:3] + "*" for word in generator.sample(words[:2000], 50)],
+    }
+    # The first run of a term sorts its posting list once; time the steady state
+    for queries in workloads.values():
+        latency(index, queries, 1)
+    print(f"{'query':>14}  {'median µs':>9}  {'p99 µs':>8}  {'results':>7}")
+    for name, queries in workloads.items():
+        median, p99, found = latency(index, queries, args.repeat)
+        print(f"{name:>14}  {median:>9.1f}  {p99:>8.1f}  {found:>7.1f}")
+
+    started = time.perf_counter()
+    index.add("mickey", "song", "A Brand New Song", ["Fresh off the press", "Sung just once"])
+    added = time.perf_counter() - started
+    assert index.search("brand new")[0].title == "A Brand New Song"
+    print(f"Adding one entry to the live index took {added * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
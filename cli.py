@@ -7,10 +7,14 @@ Provides interactive access to Mickey and Donald with visual audio
 import sys
 import os
 from disney_coordinator import DisneyCoordinatorVisualAudio
+from performance_clock import clock_from_environment
+from agent_pool import replicas_from_environment
 
 def main():
     """Main CLI interface for Disney Coordinator."""
-    coordinator = DisneyCoordinatorVisualAudio()
+    coordinator = DisneyCoordinatorVisualAudio(clock=clock_from_environment(), replicas=replicas_from_environment())
+    print("🎵 Rich visual audio system initialized!")
+    print("✨ Using musical symbols and animations for audio simulation!")
     
     print("🎭🎵🦆🐭")
     print("=" * 60)
@@ -58,6 +62,7 @@ def main():
                 print("  duet song       - Mickey and Donald sing together")
                 print("  duet dance      - Mickey and Donald dance together")
                 print("  ensemble        - Complete ensemble show")
+                print("  ensemble parallel - Ensemble show with solo segments side by side")
                 print()
                 print("Management:")
                 print("  status          - Check agent status")
@@ -100,9 +105,10 @@ def main():
                 result = coordinator.perform_duet_dance()
                 print(f"\n{result}\n")
             
-            elif command == 'ensemble':
+            elif command in ['ensemble', 'ensemble parallel']:
                 print("\n🎭 Performing ensemble show with visual audio!")
-                result = coordinator.perform_ensemble_show()
+                mode = "parallel" if command == 'ensemble parallel' else "serial"
+                result = coordinator.perform_ensemble_show(mode)
                 print(f"\n{result}\n")
             
             elif command.startswith('mickey '):
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP Server for the Disney Coordinator
+Serves connections from a bounded pool of worker threads
+"""
+
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+DEFAULT_WORKERS = 64
+DEFAULT_BACKLOG = 128
+DEFAULT_CONNECTION_TIMEOUT = 30.0
+
+
+class BoundedThreadPoolHTTPServer(socketserver.TCPServer):
+    """
+    Bounded Thread Pool HTTP Server - each connection is handled by one of
+    `max_workers` pooled threads, so a slow client only ties up its own worker.
+
+    When every worker is busy the server stops accepting, and new connections
+    wait in the kernel listen backlog (`backlog`) instead of piling up in
+    memory. Idle or stalled connections are dropped after `connection_timeout`
+    seconds. Long-lived event streams are capped at `max_event_streams` so
+    viewers can never starve regular API requests of workers.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class,
+                 max_workers: int = DEFAULT_WORKERS,
+                 backlog: int = DEFAULT_BACKLOG,
+                 connection_timeout: Optional[float] = DEFAULT_CONNECTION_TIMEOUT,
+                 max_event_streams: Optional[int] = None):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.max_workers = max_workers
+        # TCPServer passes request_queue_size to listen()
+        self.request_queue_size = backlog
+        self.connection_timeout = connection_timeout
+        if max_event_streams is None:
+            max_event_streams = max(1, max_workers // 2)
+        self.max_event_streams = max_event_streams
+
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="disney-http")
+        self._stream_lock = threading.Lock()
+        self._active_streams = 0
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        """Hand the connection to a free worker, waiting for one if necessary."""
+        if self.connection_timeout is not None:
+            request.settimeout(self.connection_timeout)
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._process_request_worker, request, client_address)
+        except RuntimeError:
+            # Executor already shut down
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def try_open_event_stream(self) -> bool:
+        """Reserve one of the event stream slots; False when all are in use."""
+        with self._stream_lock:
+            if self._active_streams >= self.max_event_streams:
+                return False
+            self._active_streams += 1
+            return True
+
+    def close_event_stream(self):
+        """Release an event stream slot."""
+        with self._stream_lock:
+            self._active_streams -= 1
+
+    @property
+    def active_event_streams(self) -> int:
+        """Number of event streams currently open."""
+        return self._active_streams
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Catalog Converter for the Disney Coordinator
+Turns a JSON or JSON Lines song and dance catalog into a memory-mapped catalog file
+
+Usage: python3 convert_catalog.py disney_catalog.json disney_catalog.dcat
+       DISNEY_CATALOG=disney_catalog.dcat python3 web_server.py
+"""
+
+import argparse
+import os
+import sys
+import time
+from performance_catalog import CatalogError, convert_catalog
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a song and dance catalog to the mapped format")
+    parser.add_argument("source", help="JSON catalog (like disney_catalog.json) or JSON Lines file (.jsonl)")
+    parser.add_argument("target", help="mapped catalog file to write")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        count = convert_catalog(args.source, args.target)
+    except CatalogError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    size = os.path.getsize(args.target)
+    print(f"✅ Wrote {count} songs and dances to {args.target} "
+          f"({size / 1024 / 1024:.1f} MiB) in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,20 +9,79 @@ import random
 import os
 import sys
 import math
-from typing import List, Dict, Optional, Tuple
+from dataclasses import replace
+from typing import Callable, List, Dict, Optional, Tuple
 from mickey_mouse_agent import MickeyMouseAgent
 from donald_duck_agent import DonaldDuckAgent
+from agent_pool import AgentPool, ReplicaConfig, replicas_for, replicas_from_environment
+from agent_reservation import Reservation
+from energy_policy import EnergyPolicy
+from performance_clock import VirtualClock, clock_from_environment
+from performance_scheduler import PerformanceScheduler
+from render_cache import RenderCache
+from performance_catalog import Lines, default_catalog
+from output_sinks import OutputSink
+from terminal_renderer import TerminalRenderer
+from event_log import EventLog, DEFAULT_LOG_LIMIT
+from search_index import DEFAULT_SEARCH_LIMIT, SearchResult, default_search_index, default_search_index_if_ready
+from show_timeline import Timeline, TimelineCache, TimelinePlayback, compile_timeline
+from performance_engine import PerformanceEngine, PerformanceScript, parallel
+from performance_events import (
+    PerformanceStarted, PerformanceFinished, Narration, LyricLine, DanceStep,
+    NotePlayed, MelodyPlayed, HarmonyPlayed
+)
+
+# Individual actions: the agent script that performs each one (run while the
+# coordinator holds the agent's reservation), and the parameters it accepts
+# (name -> default)
+INDIVIDUAL_ACTIONS: Dict[str, Tuple[str, Dict[str, Optional[str]]]] = {
+    "sing": ("sing_reserved_script", {"song_name": None}),
+    "dance": ("dance_reserved_script", {"dance_move": None}),
+    "wave": ("wave_reserved_script", {"style": "friendly"}),
+    "show": ("perform_show_reserved_script", {}),
+    "rest": ("rest_reserved_script", {}),
+}
+
+# Rendered frames kept: every fixed melody, and most random note pairs
+DEFAULT_FRAME_CACHE = 512
+
+# How the ensemble show runs the segments where Mickey and Donald perform on
+# their own: one after the other, or side by side
+ENSEMBLE_MODES = ("serial", "parallel")
 
 class DisneyCoordinatorVisualAudio:
     """
     Disney Coordinator Agent with Rich Visual Audio Simulation
     """
     
-    def __init__(self):
+    def __init__(self, clock=None, listeners=None, replicas: ReplicaConfig = 1,
+                 energy_policy: Optional[EnergyPolicy] = None, output: Optional[OutputSink] = None):
         self.name = "Disney Coordinator (Visual Audio)"
-        self.mickey = MickeyMouseAgent()
-        self.donald = DonaldDuckAgent()
-        self.is_coordinating = False
+        # One engine (clock and event listeners) drives the coordinator and both agents;
+        # pass listeners=[] or output=NullSink() to run headless
+        self.output = output
+        # The terminal renderer used when nothing else is given, so set_output can replace it
+        self._default_renderer: Optional[TerminalRenderer] = None
+        if output is not None:
+            # The sink replaces the default terminal renderer
+            listeners = [output, *(listeners or [])]
+        elif listeners is None:
+            self._default_renderer = TerminalRenderer()
+            listeners = [self._default_renderer]
+        self.engine = PerformanceEngine(clock, listeners)
+        self.clock = self.engine.clock
+        # Picks the most rested replicas and rests tired agents before they perform
+        self.energy_policy = energy_policy if energy_policy is not None else EnergyPolicy()
+        # Each character is a pool of replicas (e.g. replicas=8 or {"mickey": 8});
+        # self.mickey and self.donald are the first replica of each
+        self.pools = {
+            "mickey": AgentPool(MickeyMouseAgent, replicas_for(replicas, "mickey"), self.engine,
+                                self.energy_policy),
+            "donald": AgentPool(DonaldDuckAgent, replicas_for(replicas, "donald"), self.engine,
+                                self.energy_policy)
+        }
+        self.mickey = self.pools["mickey"].primary
+        self.donald = self.pools["donald"].primary
         
         # Musical notes with visual representations
         self.musical_notes = {
@@ -41,228 +100,276 @@ class DisneyCoordinatorVisualAudio:
             "harmony": ["G", "B", "D", "G", "B", "D", "E", "D"]
         }
         
-        # Duet songs that both agents can perform together
-        self.duet_songs = [
-            "Mickey and Donald's Friendship Song",
-            "The Disney Duet",
-            "Best Friends Forever",
-            "Magical Partners",
-            "Disney Harmony"
-        ]
-        
-        # Collaborative dance routines
-        self.duet_dances = [
-            "The Mickey-Donald Shuffle",
-            "Friendship Waltz",
-            "Disney Duo Dance",
-            "Magical Partners Spin",
-            "Best Friends Bounce"
-        ]
-        
-        print("🎵 Rich visual audio system initialized!")
-        print("✨ Using musical symbols and animations for audio simulation!")
-    
-    def _play_visual_note(self, note: str, duration: float = 0.3):
+        # Duet songs and collaborative dance routines, from the shared catalog
+        self.duet_catalog = default_catalog().performer("duet")
+        self.duet_songs = self.duet_catalog.song_titles
+        self.duet_dances = self.duet_catalog.dance_titles
+        
+        # Musical cues around individual actions: an intro melody, then an
+        # outro melody and its note duration for each action
+        self.performance_cues = {
+            "mickey": {
+                "intro": ["C", "E", "G"],
+                "sing": (["G", "E", "C"], 0.2),
+                "dance": (["C", "G", "C", "G"], 0.15),
+                "wave": (["C", "D", "E"], 0.1),
+                "show": (["C", "E", "G", "C", "E", "G", "A", "G"], 0.2),
+                "rest": (["G", "E", "C"], 0.3)
+            },
+            "donald": {
+                "intro": ["F", "A", "C"],
+                "sing": (["C", "A", "F"], 0.2),
+                "dance": (["F", "C", "F", "C"], 0.15),
+                "wave": (["F", "G", "A"], 0.1),
+                "show": (["F", "A", "C", "F", "A", "C", "D", "C"], 0.2),
+                "rest": (["C", "A", "F"], 0.3)
+            }
+        }
+        
+        # Performances involving both agents, by name: script, accepted parameters,
+        # and the script run once a Mickey and a Donald are reserved (None when
+        # the performance needs no agents)
+        self.group_performances = {
+            "duet_song": (self.perform_duet_song_script, {"song_name": None}, self._duet_song_script),
+            "duet_dance": (self.perform_duet_dance_script, {"dance_name": None}, self._duet_dance_script),
+            "ensemble_show": (self.perform_ensemble_show_script, {"mode": "serial"}, self._ensemble_show_script),
+            "energy_check": (self.check_energy_levels_script, {}, None),
+            "rest_both": (self.rest_both_agents_script, {}, self._rest_both_script)
+        }
+        
+        # Queues performances for busy agents instead of turning them away
+        self.scheduler = PerformanceScheduler(self)
+        # Recently compiled shows, by performance and parameters
+        self.timelines = TimelineCache()
+        # Rendered melody, harmony and note frames, by notes and duration
+        self.frames = RenderCache(DEFAULT_FRAME_CACHE)
+        # The most recent performance events, numbered so clients can tail them
+        self.event_log = EventLog()
+        self.engine.subscribe(self.event_log)
+    
+    def _play_visual_note(self, note: str, duration: float = 0.3) -> PerformanceScript:
         """Play a visual musical note with animation."""
-        if note in self.musical_notes:
-            visual_note = self.musical_notes[note]
-            print(f"🎵 {visual_note} Playing note {note} {visual_note}", end='', flush=True)
-            
-            # Animate the note
-            for i in range(int(duration * 10)):
-                print(".", end='', flush=True)
-                time.sleep(0.1)
-            print()  # New line after animation
-        else:
-            time.sleep(duration)
+        yield from self.frames.get_or_render(("note", note, duration), lambda: self._render_note(note, duration))
+    
+    def _render_note(self, note: str, duration: float) -> Tuple:
+        """The frames (events and pauses) of one visual note."""
+        if note not in self.musical_notes:
+            return (duration,)
+        # One animation dot per tenth of a second the note is held
+        ticks = int(duration * 10)
+        played = NotePlayed(self.name, note=note, symbol=self.musical_notes[note], ticks=ticks)
+        return (played, ticks * 0.1) if ticks else (played,)
     
-    def _play_visual_melody(self, melody: List[str], duration: float = 0.3):
+    def _note_symbols(self, notes: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Visual symbols for a sequence of known notes."""
+        return self.frames.get_or_render(("symbols", notes),
+                                         lambda: tuple(self.musical_notes[note] for note in notes))
+    
+    def _play_visual_melody(self, melody: List[str], duration: float = 0.3) -> PerformanceScript:
         """Play a sequence of visual musical notes."""
-        print("🎼 Playing melody:", end=' ')
-        for note in melody:
-            if note in self.musical_notes:
-                print(f"{self.musical_notes[note]}", end=' ')
-        print()
-        
+        key = ("melody", tuple(melody), duration)
+        yield from self.frames.get_or_render(key, lambda: self._render_melody(melody, duration))
+    
+    def _render_melody(self, melody: List[str], duration: float) -> Tuple:
+        """The frames of a melody: the melody line, then each note and the gap after it."""
+        notes = tuple(note for note in melody if note in self.musical_notes)
+        frames = [MelodyPlayed(self.name, notes=notes, symbols=self._note_symbols(notes))]
         for note in melody:
             if note in self.musical_notes:
-                self._play_visual_note(note, duration)
-            time.sleep(0.1)
+                frames.extend(self._render_note(note, duration))
+            frames.append(0.1)
+        return tuple(frames)
     
-    def _play_visual_harmony(self, notes: List[str], duration: float = 0.5):
+    def _play_visual_harmony(self, notes: List[str], duration: float = 0.5) -> PerformanceScript:
         """Play a visual harmony with multiple notes."""
-        print("🎶 Playing harmony:", end=' ')
-        for note in notes:
-            if note in self.musical_notes:
-                print(f"{self.musical_notes[note]}", end=' ')
-        print()
+        yield self.frames.get_or_render(("harmony", tuple(notes)), lambda: self._render_harmony(notes))
         
-        # Show harmony animation
+        # Show harmony animation (chosen afresh every time, so never cached)
         harmony_symbols = random.sample(self.harmony_notes, min(3, len(self.harmony_notes)))
+        yield HarmonyPlayed(self.name, symbols=tuple(harmony_symbols), label="", symbol_prefix="  ")
         for symbol in harmony_symbols:
-            print(f"  {symbol}", end=' ', flush=True)
-            time.sleep(duration / len(harmony_symbols))
-        print()
+            yield duration / len(harmony_symbols)
     
-    def _sing_with_visual_music(self, lyrics: List[str], singer: str, emoji: str):
+    def _render_harmony(self, notes: List[str]) -> MelodyPlayed:
+        """The harmony's notes as one melody line."""
+        notes = tuple(note for note in notes if note in self.musical_notes)
+        return MelodyPlayed(self.name, notes=notes, symbols=self._note_symbols(notes), label="🎶 Playing harmony:")
+    
+    def _sing_with_visual_music(self, lyrics: List[str], singer: str, emoji: str) -> PerformanceScript:
         """Sing lyrics with visual musical accompaniment."""
         for line in lyrics:
-            print(f"{emoji} {singer}: {line}")
+            yield LyricLine(singer, line=line, prefix=f"{emoji} {singer}:")
             
             # Visual musical accompaniment
             notes = random.sample(list(self.musical_notes.keys()), 2)
             for note in notes:
-                self._play_visual_note(note, 0.2)
+                yield from self._play_visual_note(note, 0.2)
             
-            time.sleep(0.5)
+            yield 0.5
     
-    def _play_visual_duet_harmony(self, mickey_line: str, donald_line: str):
+    def _play_visual_duet_harmony(self, mickey, donald, mickey_line: str, donald_line: str) -> PerformanceScript:
         """Play visual harmony for duet performance."""
-        print("🎵 DUET HARMONY:")
-        print(f"🐭 Mickey: {mickey_line}")
-        print(f"🦆 Donald: {donald_line}")
+        yield Narration(self.name, message="🎵 DUET HARMONY:")
+        yield LyricLine(mickey.name, line=mickey_line, prefix="🐭 Mickey:")
+        yield LyricLine(donald.name, line=donald_line, prefix="🦆 Donald:")
         
         # Visual harmony animation
         harmony_symbols = random.sample(self.harmony_notes, 4)
-        print("🎶 Harmony:", end=' ')
+        yield HarmonyPlayed(self.name, symbols=tuple(harmony_symbols))
         for symbol in harmony_symbols:
-            print(f"{symbol}", end=' ', flush=True)
-            time.sleep(0.3)
-        print()
+            yield 0.3
         
         # Musical notes for both voices
-        mickey_notes = random.sample(list(self.musical_notes.keys()), 2)
-        donald_notes = random.sample(list(self.musical_notes.keys()), 2)
+        mickey_notes = tuple(random.sample(list(self.musical_notes.keys()), 2))
+        donald_notes = tuple(random.sample(list(self.musical_notes.keys()), 2))
         
-        print("🐭 Mickey's notes:", end=' ')
-        for note in mickey_notes:
-            print(f"{self.musical_notes[note]}", end=' ')
-        print()
-        
-        print("🦆 Donald's notes:", end=' ')
-        for note in donald_notes:
-            print(f"{self.musical_notes[note]}", end=' ')
-        print()
+        yield MelodyPlayed(mickey.name, notes=mickey_notes, label="🐭 Mickey's notes:",
+                           symbols=self._note_symbols(mickey_notes))
+        yield MelodyPlayed(donald.name, notes=donald_notes, label="🦆 Donald's notes:",
+                           symbols=self._note_symbols(donald_notes))
         
-        time.sleep(0.8)
+        yield 0.8
     
     def get_agent_status(self, agent_name: str = "both") -> Dict[str, Dict]:
         """Get status of specified agent(s)."""
         if agent_name.lower() == "mickey":
-            return {"mickey": self.mickey.get_status()}
+            return {"mickey": self.pools["mickey"].get_status()}
         elif agent_name.lower() == "donald":
-            return {"donald": self.donald.get_status()}
+            return {"donald": self.pools["donald"].get_status()}
         else:
             return {
-                "mickey": self.mickey.get_status(),
-                "donald": self.donald.get_status()
+                "mickey": self.pools["mickey"].get_status(),
+                "donald": self.pools["donald"].get_status()
             }
     
-    def ask_mickey_to_perform(self, action: str, **kwargs) -> str:
-        """Ask Mickey to perform a specific action with visual audio."""
-        if self.mickey.is_performing:
-            return f"🎭 {self.mickey.name} is already performing! Please wait."
-        
-        print(f"🎵 Mickey is performing {action} with visual audio!")
+    def perform(self, agent: str, action: str, **params) -> str:
+        """Perform any available performance, e.g. perform("mickey", "sing") or perform("duet", "song")."""
+        return self.engine.run(self.perform_script(agent, action, **params))
+    
+    async def perform_async(self, agent: str, action: str, **params) -> str:
+        """Perform any available performance without blocking the event loop."""
+        return await self.engine.run_async(self.perform_script(agent, action, **params))
+    
+    async def perform_queued_async(self, agent: str, action: str, priority: Optional[str] = None,
+                                   deadline: Optional[float] = None, **params) -> str:
+        """Like perform_async(), but waits in the scheduler's queue while the agents are busy."""
+        return await self.scheduler.perform(agent, action, priority, deadline, **params)
+    
+    def perform_script(self, agent: str, action: str, **params) -> PerformanceScript:
+        """Performance script for perform(); raises ValueError for unknown performances or parameters."""
+        params = self.validate_performance(agent, action, params)
+        if agent in self.pools:
+            return self._individual_performance_script(agent, action, **params)
+        script, _, _ = self.group_performances[f"{agent}_{action}"]
+        return script(**params)
+    
+    def performance_parameters(self, agent: str, action: str) -> Dict[str, Optional[str]]:
+        """Parameters a performance accepts, with their defaults."""
+        if agent in self.pools and action in INDIVIDUAL_ACTIONS:
+            return dict(INDIVIDUAL_ACTIONS[action][1])
+        if f"{agent}_{action}" in self.group_performances:
+            return dict(self.group_performances[f"{agent}_{action}"][1])
+        raise ValueError(f"Unknown performance '{action}' for '{agent}'")
+    
+    def validate_performance(self, agent: str, action: str, params: Dict) -> Dict[str, Optional[str]]:
+        """Check a performance request before it runs; returns its parameters with defaults filled in."""
+        accepted = self.performance_parameters(agent, action)
+        unknown = sorted(set(params) - set(accepted))
+        if unknown:
+            raise ValueError(f"Unknown parameter(s) for {agent} {action}: {', '.join(unknown)}")
+        for name, value in params.items():
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"Parameter '{name}' must be a string")
+        if agent == "ensemble" and params.get("mode", "serial") not in ENSEMBLE_MODES:
+            raise ValueError(f"Parameter 'mode' must be one of: {', '.join(ENSEMBLE_MODES)}")
+        accepted.update(params)
+        return accepted
+    
+    def _individual_performance_script(self, agent_key: str, action: str, **kwargs) -> PerformanceScript:
+        """A free replica of one agent performs an action, framed by that agent's musical cues."""
+        pool = self.pools[agent_key]
+        reservation = self.reserve_performance(agent_key, action)
+        if reservation is None:
+            result = f"🎭 {pool.name} is already performing! Please wait."
+            yield PerformanceFinished(pool.name, action=action, result=result)
+            return result
+        return (yield from self.reserved_performance_script(agent_key, action, reservation, **kwargs))
+    
+    def _replica_performance_script(self, agent_key: str, agent, action: str, **kwargs) -> PerformanceScript:
+        first_name = agent.name.split()[0]
+        yield PerformanceStarted(agent.name, action=action, message=f"🎵 {first_name} is performing {action} with visual audio!")
         
         # Play musical intro
-        intro_melody = ["C", "E", "G"]
-        self._play_visual_melody(intro_melody, 0.2)
-        
-        if action == "sing":
-            result = self.mickey.sing(kwargs.get('song_name'))
-            # Play musical outro
-            outro_melody = ["G", "E", "C"]
-            self._play_visual_melody(outro_melody, 0.2)
-            return result
-        elif action == "dance":
-            result = self.mickey.dance(kwargs.get('dance_move'))
-            # Play dance rhythm
-            dance_rhythm = ["C", "G", "C", "G"]
-            self._play_visual_melody(dance_rhythm, 0.15)
-            return result
-        elif action == "wave":
-            result = self.mickey.wave(kwargs.get('style', 'friendly'))
-            # Play wave sound
-            wave_sound = ["C", "D", "E"]
-            self._play_visual_melody(wave_sound, 0.1)
-            return result
-        elif action == "show":
-            result = self.mickey.perform_show()
-            # Play show fanfare
-            fanfare = ["C", "E", "G", "C", "E", "G", "A", "G"]
-            self._play_visual_melody(fanfare, 0.2)
-            return result
-        elif action == "rest":
-            result = self.mickey.rest()
-            # Play rest sound
-            rest_sound = ["G", "E", "C"]
-            self._play_visual_melody(rest_sound, 0.3)
-            return result
+        cues = self.performance_cues[agent_key]
+        yield from self._play_visual_melody(cues["intro"], 0.2)
+        
+        if action in INDIVIDUAL_ACTIONS:
+            script_name, accepted = INDIVIDUAL_ACTIONS[action]
+            args = {name: kwargs.get(name, default) for name, default in accepted.items()}
+            result = yield from getattr(agent, script_name)(**args)
+            # Play the action's outro
+            outro, duration = cues[action]
+            yield from self._play_visual_melody(outro, duration)
         else:
-            return f"❌ Unknown action '{action}' for {self.mickey.name}"
+            result = f"❌ Unknown action '{action}' for {agent.name}"
+        
+        yield PerformanceFinished(agent.name, action=action, result=result)
+        return result
+    
+    def ask_mickey_to_perform(self, action: str, **kwargs) -> str:
+        """Ask Mickey to perform a specific action with visual audio."""
+        return self.engine.run(self.ask_mickey_to_perform_script(action, **kwargs))
+    
+    async def ask_mickey_to_perform_async(self, action: str, **kwargs) -> str:
+        """Ask Mickey to perform a specific action without blocking the event loop."""
+        return await self.engine.run_async(self.ask_mickey_to_perform_script(action, **kwargs))
+    
+    def ask_mickey_to_perform_script(self, action: str, **kwargs) -> PerformanceScript:
+        """Performance script for ask_mickey_to_perform(): yields pauses and events, returns the result."""
+        return self._individual_performance_script("mickey", action, **kwargs)
     
     def ask_donald_to_perform(self, action: str, **kwargs) -> str:
         """Ask Donald to perform a specific action with visual audio."""
-        if self.donald.is_performing:
-            return f"🎭 {self.donald.name} is already performing! Please wait."
-        
-        print(f"🎵 Donald is performing {action} with visual audio!")
-        
-        # Play musical intro
-        intro_melody = ["F", "A", "C"]
-        self._play_visual_melody(intro_melody, 0.2)
-        
-        if action == "sing":
-            result = self.donald.sing(kwargs.get('song_name'))
-            # Play musical outro
-            outro_melody = ["C", "A", "F"]
-            self._play_visual_melody(outro_melody, 0.2)
-            return result
-        elif action == "dance":
-            result = self.donald.dance(kwargs.get('dance_move'))
-            # Play dance rhythm
-            dance_rhythm = ["F", "C", "F", "C"]
-            self._play_visual_melody(dance_rhythm, 0.15)
-            return result
-        elif action == "wave":
-            result = self.donald.wave(kwargs.get('style', 'friendly'))
-            # Play wave sound
-            wave_sound = ["F", "G", "A"]
-            self._play_visual_melody(wave_sound, 0.1)
-            return result
-        elif action == "show":
-            result = self.donald.perform_show()
-            # Play show fanfare
-            fanfare = ["F", "A", "C", "F", "A", "C", "D", "C"]
-            self._play_visual_melody(fanfare, 0.2)
-            return result
-        elif action == "rest":
-            result = self.donald.rest()
-            # Play rest sound
-            rest_sound = ["C", "A", "F"]
-            self._play_visual_melody(rest_sound, 0.3)
-            return result
-        else:
-            return f"❌ Unknown action '{action}' for {self.donald.name}"
+        return self.engine.run(self.ask_donald_to_perform_script(action, **kwargs))
+    
+    async def ask_donald_to_perform_async(self, action: str, **kwargs) -> str:
+        """Ask Donald to perform a specific action without blocking the event loop."""
+        return await self.engine.run_async(self.ask_donald_to_perform_script(action, **kwargs))
+    
+    def ask_donald_to_perform_script(self, action: str, **kwargs) -> PerformanceScript:
+        """Performance script for ask_donald_to_perform(): yields pauses and events, returns the result."""
+        return self._individual_performance_script("donald", action, **kwargs)
     
     def perform_duet_song(self, song_name: Optional[str] = None) -> str:
         """Mickey and Donald perform a duet song together with visual audio!"""
-        if self.mickey.is_performing or self.donald.is_performing:
-            return f"🎭 One or both agents are already performing! Please wait."
-        
+        return self.engine.run(self.perform_duet_song_script(song_name))
+    
+    async def perform_duet_song_async(self, song_name: Optional[str] = None) -> str:
+        """Mickey and Donald perform a duet song together without blocking the event loop."""
+        return await self.engine.run_async(self.perform_duet_song_script(song_name))
+    
+    def perform_duet_song_script(self, song_name: Optional[str] = None) -> PerformanceScript:
+        """Performance script for perform_duet_song(): yields pauses and events, returns the result."""
+        reservation = self.reserve_performance("duet", "song")
+        if reservation is None:
+            result = f"🎭 One or both agents are already performing! Please wait."
+            yield PerformanceFinished(self.name, action="duet_song", result=result)
+            return result
+        return (yield from self.reserved_performance_script("duet", "song", reservation, song_name=song_name))
+    
+    def _duet_song_script(self, mickey, donald, song_name: Optional[str] = None) -> PerformanceScript:
+        """The duet song itself, performed by the given replicas."""
         if song_name is None:
             song_name = random.choice(self.duet_songs)
         
-        print(f"🎵 Mickey and Donald are performing duet '{song_name}' with visual audio!")
+        yield PerformanceStarted(self.name, action="duet_song", title=song_name,
+                                 message=f"🎵 Mickey and Donald are performing duet '{song_name}' with visual audio!")
         
-        self.is_coordinating = True
-        self.mickey.is_performing = True
-        self.donald.is_performing = True
+        self._set_coordinating(mickey, donald, True)
         
         # Musical introduction with visual audio
         intro_melody = self.disney_melodies["friendship"]
-        self._play_visual_melody(intro_melody, 0.4)
+        yield from self._play_visual_melody(intro_melody, 0.4)
         
         # Get duet lyrics
         lyrics = self._get_duet_lyrics(song_name)
@@ -271,203 +378,395 @@ class DisneyCoordinatorVisualAudio:
         for i in range(0, len(lyrics), 2):
             if i + 1 < len(lyrics):
                 # Duet harmony with visual audio
-                self._play_visual_duet_harmony(lyrics[i], lyrics[i+1])
+                yield from self._play_visual_duet_harmony(mickey, donald, lyrics[i], lyrics[i+1])
         
         # Grand finale with full orchestra
         finale_melody = self.disney_melodies["magic"] + self.disney_melodies["harmony"]
-        self._play_visual_melody(finale_melody, 0.2)
+        yield from self._play_visual_melody(finale_melody, 0.2)
         
-        self.mickey.is_performing = False
-        self.donald.is_performing = False
-        self.is_coordinating = False
+        self._set_coordinating(mickey, donald, False)
         
-        return f"🎵 {self.mickey.name} and {self.donald.name} finished their duet '{song_name}'! What a magical performance! ✨"
+        result = f"🎵 {mickey.name} and {donald.name} finished their duet '{song_name}'! What a magical performance! ✨"
+        yield PerformanceFinished(self.name, action="duet_song", result=result)
+        return result
     
     def perform_duet_dance(self, dance_name: Optional[str] = None) -> str:
         """Mickey and Donald perform a duet dance together with visual audio!"""
-        if self.mickey.is_performing or self.donald.is_performing:
-            return f"🎭 One or both agents are already performing! Please wait."
-        
+        return self.engine.run(self.perform_duet_dance_script(dance_name))
+    
+    async def perform_duet_dance_async(self, dance_name: Optional[str] = None) -> str:
+        """Mickey and Donald perform a duet dance together without blocking the event loop."""
+        return await self.engine.run_async(self.perform_duet_dance_script(dance_name))
+    
+    def perform_duet_dance_script(self, dance_name: Optional[str] = None) -> PerformanceScript:
+        """Performance script for perform_duet_dance(): yields pauses and events, returns the result."""
+        reservation = self.reserve_performance("duet", "dance")
+        if reservation is None:
+            result = f"🎭 One or both agents are already performing! Please wait."
+            yield PerformanceFinished(self.name, action="duet_dance", result=result)
+            return result
+        return (yield from self.reserved_performance_script("duet", "dance", reservation, dance_name=dance_name))
+    
+    def _duet_dance_script(self, mickey, donald, dance_name: Optional[str] = None) -> PerformanceScript:
+        """The duet dance itself, performed by the given replicas."""
         if dance_name is None:
             dance_name = random.choice(self.duet_dances)
         
-        print(f"💃 Mickey and Donald are performing duet dance '{dance_name}' with visual audio!")
+        yield PerformanceStarted(self.name, action="duet_dance", title=dance_name,
+                                 message=f"💃 Mickey and Donald are performing duet dance '{dance_name}' with visual audio!")
         
-        self.is_coordinating = True
-        self.mickey.is_performing = True
-        self.donald.is_performing = True
+        self._set_coordinating(mickey, donald, True)
         
         # Dance music introduction
         dance_melody = ["C", "E", "G", "C", "E", "G"]
-        self._play_visual_melody(dance_melody, 0.3)
+        yield from self._play_visual_melody(dance_melody, 0.3)
         
         # Get duet dance steps
         steps = self._get_duet_dance_steps(dance_name)
         
         # Perform the duet dance with synchronized moves and visual music
         for i, step in enumerate(steps):
-            print(f"💃 Step {i+1}: {step}")
+            yield DanceStep(self.name, step=step, prefix=f"💃 Step {i+1}:")
             # Dance rhythm
             rhythm_notes = random.sample(list(self.musical_notes.keys()), 2)
             for note in rhythm_notes:
-                self._play_visual_note(note, 0.2)
-            time.sleep(0.6)
+                yield from self._play_visual_note(note, 0.2)
+            yield 0.6
         
         # Dance finale
         finale_melody = ["G", "B", "D", "G", "B", "D"]
-        self._play_visual_melody(finale_melody, 0.2)
+        yield from self._play_visual_melody(finale_melody, 0.2)
         
-        self.mickey.is_performing = False
-        self.donald.is_performing = False
-        self.is_coordinating = False
+        self._set_coordinating(mickey, donald, False)
         
-        return f"💃 {self.mickey.name} and {self.donald.name} finished their duet dance '{dance_name}'! What a spectacular show! ✨"
+        result = f"💃 {mickey.name} and {donald.name} finished their duet dance '{dance_name}'! What a spectacular show! ✨"
+        yield PerformanceFinished(self.name, action="duet_dance", result=result)
+        return result
     
-    def perform_ensemble_show(self) -> str:
+    def perform_ensemble_show(self, mode: str = "serial") -> str:
         """Mickey and Donald put on a complete ensemble show together!"""
-        if self.mickey.is_performing or self.donald.is_performing:
-            return f"🎭 One or both agents are already performing! Please wait."
-        
-        print("🎭 Mickey and Donald are putting on an ensemble show with visual audio!")
-        
-        self.is_coordinating = True
+        return self.engine.run(self.perform_ensemble_show_script(mode))
+    
+    async def perform_ensemble_show_async(self, mode: str = "serial") -> str:
+        """Mickey and Donald put on a complete ensemble show together without blocking the event loop."""
+        return await self.engine.run_async(self.perform_ensemble_show_script(mode))
+    
+    def perform_ensemble_show_script(self, mode: str = "serial") -> PerformanceScript:
+        """Performance script for perform_ensemble_show(): yields pauses and events, returns the result."""
+        if mode not in ENSEMBLE_MODES:
+            raise ValueError(f"Unknown ensemble mode '{mode}', use one of: {', '.join(ENSEMBLE_MODES)}")
+        reservation = self.reserve_performance("ensemble", "show")
+        if reservation is None:
+            result = f"🎭 One or both agents are already performing! Please wait."
+            yield PerformanceFinished(self.name, action="ensemble_show", result=result)
+            return result
+        return (yield from self.reserved_performance_script("ensemble", "show", reservation, mode=mode))
+    
+    def _ensemble_show_script(self, mickey, donald, mode: str = "serial") -> PerformanceScript:
+        """
+        The ensemble show itself, performed by the given replicas.
+        
+        In "parallel" mode the segments where Mickey and Donald perform on
+        their own run at the same time and join before the next duet, so the
+        show takes as long as its longest track instead of the sum of them.
+        """
+        def together(*scripts) -> PerformanceScript:
+            if mode == "parallel":
+                return (yield from parallel(*scripts))
+            results = []
+            for script in scripts:
+                results.append((yield from script))
+            return results
+        
+        yield PerformanceStarted(self.name, action="ensemble_show",
+                                 message="🎭 Mickey and Donald are putting on an ensemble show with visual audio!")
+        
+        self._set_coordinating(mickey, donald, True)
         
         # Opening fanfare with visual audio
         fanfare_melody = ["C", "E", "G", "C", "E", "G", "A", "G"]
-        self._play_visual_melody(fanfare_melody, 0.3)
+        yield from self._play_visual_melody(fanfare_melody, 0.3)
         
         # Opening wave together
-        self.mickey.wave("excited")
-        self.donald.wave("excited")
-        time.sleep(0.5)
+        yield from together(mickey.wave_reserved_script("excited"), donald.wave_reserved_script("excited"))
+        yield 0.5
         
         # Duet song
-        self.perform_duet_song()
-        time.sleep(0.5)
+        yield from self._duet_song_script(mickey, donald)
+        yield 0.5
         
         # Individual performances
-        self.mickey.dance()
-        time.sleep(0.5)
-        self.donald.sing()
-        time.sleep(0.5)
+        yield from together(self._then_pause(mickey.dance_reserved_script(), 0.5),
+                            self._then_pause(donald.sing_reserved_script(), 0.5))
         
         # Duet dance finale
-        self.perform_duet_dance()
-        time.sleep(0.5)
+        yield from self._duet_dance_script(mickey, donald)
+        yield 0.5
         
         # Final bow together
-        self.mickey.wave("royal")
-        self.donald.wave("royal")
+        yield from together(mickey.wave_reserved_script("royal"), donald.wave_reserved_script("royal"))
         
         # Closing fanfare
         closing_melody = ["G", "B", "D", "G", "B", "D", "E", "D"]
-        self._play_visual_melody(closing_melody, 0.2)
+        yield from self._play_visual_melody(closing_melody, 0.2)
         
-        self.is_coordinating = False
+        self._set_coordinating(mickey, donald, False)
         
-        return f"🎭 {self.mickey.name} and {self.donald.name} completed their ensemble show! Thank you for watching this magical Disney performance! ✨🌟"
+        result = f"🎭 {mickey.name} and {donald.name} completed their ensemble show! Thank you for watching this magical Disney performance! ✨🌟"
+        yield PerformanceFinished(self.name, action="ensemble_show", result=result)
+        return result
+    
+    @property
+    def is_coordinating(self) -> bool:
+        """Whether any pair of replicas is performing a coordinated duet or ensemble."""
+        return any(replica.reservation.coordinating for pool in self.pools.values() for replica in pool)
+    
+    @staticmethod
+    def _set_coordinating(mickey, donald, coordinating: bool):
+        # Kept on the replicas' own reservations, so one pair never flags another
+        mickey.reservation.coordinating = donald.reservation.coordinating = coordinating
+    
+    def _then_pause(self, script: PerformanceScript, seconds: float) -> PerformanceScript:
+        """A script followed by a pause; returns the script's result."""
+        result = yield from script
+        yield seconds
+        return result
     
     def check_energy_levels(self) -> str:
         """Check and report energy levels of both agents."""
-        mickey_energy = self.mickey.energy
-        donald_energy = self.donald.energy
+        mickey_energy = self.pools["mickey"].energy
+        donald_energy = self.pools["donald"].energy
         
         if mickey_energy < 30 or donald_energy < 30:
             return f"🔋 Energy levels: {self.mickey.name} ({mickey_energy}%), {self.donald.name} ({donald_energy}%). Consider rest if low! ⚠️"
         else:
             return f"🔋 Energy levels: {self.mickey.name} ({mickey_energy}%), {self.donald.name} ({donald_energy}%). Both ready to perform! ✨"
     
+    def check_energy_levels_script(self) -> PerformanceScript:
+        """Performance script for check_energy_levels(); finishes without pausing."""
+        yield from ()
+        return self.check_energy_levels()
+    
     def rest_both_agents(self) -> str:
         """Both agents take a rest together."""
-        if self.mickey.is_performing or self.donald.is_performing:
-            return f"😴 One or both agents are performing and can't rest right now!"
+        return self.engine.run(self.rest_both_agents_script())
+    
+    async def rest_both_agents_async(self) -> str:
+        """Both agents take a rest together without blocking the event loop."""
+        return await self.engine.run_async(self.rest_both_agents_script())
+    
+    def rest_both_agents_script(self) -> PerformanceScript:
+        """Performance script for rest_both_agents(): yields pauses and events, returns the result."""
+        reservation = self.reserve_performance("rest", "both")
+        if reservation is None:
+            result = f"😴 One or both agents are performing and can't rest right now!"
+            yield PerformanceFinished(self.name, action="rest_both", result=result)
+            return result
+        return (yield from self.reserved_performance_script("rest", "both", reservation))
+    
+    def _rest_both_script(self, mickey, donald) -> PerformanceScript:
+        """Both given replicas rest."""
+        yield PerformanceStarted(self.name, action="rest_both")
         
         # Rest both agents
-        self.mickey.rest()
-        self.donald.rest()
+        yield from mickey.rest_reserved_script()
+        yield from donald.rest_reserved_script()
         
-        return f"😴 Both {self.mickey.name} and {self.donald.name} feel refreshed and ready for more Disney magic! ✨"
+        result = f"😴 Both {mickey.name} and {donald.name} feel refreshed and ready for more Disney magic! ✨"
+        yield PerformanceFinished(self.name, action="rest_both", result=result)
+        return result
+    
+    def _reserve_pair(self, holder: str) -> Optional[Reservation]:
+        """Reserve a free Mickey and a free Donald together, or neither; agents are (mickey, donald)."""
+        mickey = self.pools["mickey"].try_reserve(holder)
+        if mickey is None:
+            return None
+        donald = self.pools["donald"].try_reserve(holder)
+        if donald is None:
+            mickey.release()
+            return None
+        return mickey.join(donald)
+    
+    def performance_agents(self, agent: str, action: str) -> Tuple[str, ...]:
+        """The agents (pool names) a performance needs to reserve."""
+        if agent in self.pools:
+            return (agent,)
+        _, _, reserved = self.group_performances[f"{agent}_{action}"]
+        return () if reserved is None else ("mickey", "donald")
+    
+    def reserve_performance(self, agent: str, action: str) -> Optional[Reservation]:
+        """Reserve free replicas of every agent a performance needs, or none; never waits."""
+        holder = action if agent in self.pools else f"{agent}_{action}"
+        agents = self.performance_agents(agent, action)
+        if not agents:
+            return Reservation([], holder)
+        if len(agents) == 2:
+            return self._reserve_pair(holder)
+        return self.pools[agent].try_reserve(holder)
+    
+    def reserved_performance_script(self, agent: str, action: str, reservation: Reservation,
+                                    **params) -> PerformanceScript:
+        """Perform on agents already booked with reserve_performance(), releasing them when it ends."""
+        def performance() -> PerformanceScript:
+            if agent in self.pools:
+                return self._replica_performance_script(agent, reservation.agents[0], action, **params)
+            script, _, reserved = self.group_performances[f"{agent}_{action}"]
+            return script(**params) if reserved is None else reserved(*reservation.agents, **params)
+        return (yield from self._booked_script(agent, action, reservation, performance))
+    
+    def _booked_script(self, agent: str, action: str, reservation: Reservation,
+                       performance: Callable[[], PerformanceScript]) -> PerformanceScript:
+        """Run `performance()` on booked agents: rest them first if needed, count the show, release them."""
+        # Rests and energy checks don't count as shows, and rests need no rest first
+        is_show = bool(reservation.agents) and "rest" not in (agent, action)
+        try:
+            with reservation:
+                # The span of a show includes the rest it needed first
+                started = self.clock.now()
+                if is_show:
+                    yield from self.energy_policy.rest_script(reservation.agents, self.clock)
+                result = yield from performance()
+                if is_show:
+                    self.energy_policy.record_show(started, self.clock.now())
+                return result
+        finally:
+            # Queued performances may be waiting for these agents
+            self.scheduler.agents_released()
+    
+    def compile_show(self, agent: str, action: str, **params) -> Timeline:
+        """
+        Compile a performance into a timeline, or reuse the one compiled for
+        the same request. Random choices (e.g. the song when none is named)
+        are made once, at compile time.
+        """
+        params = self.validate_performance(agent, action, params)
+        if not self.performance_agents(agent, action):
+            raise ValueError(f"{agent} {action} has no performers to compile")
+        key = (agent, action, tuple(sorted(params.items())))
+        return self.timelines.get_or_compile(key, lambda: replace(
+            compile_timeline(self._stand_in_script(agent, action, params)), performance=(agent, action)))
+    
+    def _stand_in_script(self, agent: str, action: str, params: Dict) -> PerformanceScript:
+        """
+        The performance given by a detached stand-in coordinator, with fresh
+        agents and state of its own, so compiling never tires, books or flags
+        anything live.
+        """
+        stand_in = type(self)(clock=VirtualClock(), listeners=[], energy_policy=EnergyPolicy(rest_threshold=0))
+        if agent in stand_in.pools:
+            return stand_in._replica_performance_script(agent, stand_in.pools[agent].primary, action, **params)
+        _, _, reserved = stand_in.group_performances[f"{agent}_{action}"]
+        return reserved(*(stand_in.pools[name].primary for name in self.performance_agents(agent, action)), **params)
+    
+    def play_show(self, timeline: Timeline, speed: float = 1.0) -> str:
+        """Play a compiled show; use a TimelinePlayback directly to pause or seek while it plays."""
+        return self.engine.run(self.play_show_script(timeline, speed))
+    
+    async def play_show_async(self, timeline: Timeline, speed: float = 1.0) -> str:
+        """Play a compiled show without blocking the event loop."""
+        return await self.engine.run_async(self.play_show_script(timeline, speed))
+    
+    def play_show_script(self, timeline: Timeline, speed: float = 1.0) -> PerformanceScript:
+        """
+        Performance script for play_show(): books the agents the show was
+        compiled for and rests them if needed, like a live performance.
+        """
+        if timeline.performance is None:
+            return (yield from TimelinePlayback(timeline, speed).script())
+        agent, action = timeline.performance
+        reservation = self.reserve_performance(agent, action)
+        if reservation is None:
+            if agent in self.pools:
+                result = f"🎭 {self.pools[agent].name} is already performing! Please wait."
+                yield PerformanceFinished(self.pools[agent].name, action=action, result=result)
+            else:
+                result = f"🎭 One or both agents are already performing! Please wait."
+                yield PerformanceFinished(self.name, action=f"{agent}_{action}", result=result)
+            return result
+        return (yield from self._booked_script(agent, action, reservation,
+                                               lambda: TimelinePlayback(timeline, speed).script()))
+    
+    def set_output(self, output: OutputSink):
+        """Render performances to `output` from now on, closing the sink it replaces."""
+        previous, self.output = self.output, output
+        self.engine.subscribe(output)
+        if self._default_renderer is not None:
+            self.engine.unsubscribe(self._default_renderer)
+            self._default_renderer = None
+        if previous is not None:
+            self.engine.unsubscribe(previous)
+            previous.close()
+    
+    def get_output_stats(self) -> Dict:
+        """What the output sink has written (just the sink name for most sinks)."""
+        if self.output is None:
+            return {"sink": None}
+        return self.output.get_stats()
+    
+    def get_logs(self, since: Optional[int] = None, limit: int = DEFAULT_LOG_LIMIT) -> Dict:
+        """Logged events after sequence number `since` (the latest ones without it)."""
+        return self.event_log.read(since, limit)
+    
+    def search_catalog(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT,
+                       wait: bool = True) -> Optional[List[SearchResult]]:
+        """
+        Songs and dances whose titles, lyrics or steps match `query`, best
+        first. With wait=False, None while the index is still being built,
+        and SearchIndexError if building it failed.
+        """
+        index = default_search_index() if wait else default_search_index_if_ready()
+        return None if index is None else index.search(query, limit)
+    
+    def get_reservation_stats(self) -> Dict[str, Dict]:
+        """Reservation and contention counters for every replica of every agent."""
+        stats = {}
+        for pool in self.pools.values():
+            stats.update(pool.get_reservation_stats())
+        return stats
+    
+    def get_energy_report(self) -> Dict:
+        """Automatic rests and the sustained shows per hour under the energy policy."""
+        report = self.energy_policy.get_report()
+        report["energy"] = {replica.name: replica.energy for pool in self.pools.values() for replica in pool}
+        return report
     
     def get_available_performances(self) -> Dict[str, List[str]]:
         """Get list of available performance types."""
         return {
-            "individual": {
-                "mickey": ["sing", "dance", "wave", "show", "rest"],
-                "donald": ["sing", "dance", "wave", "show", "rest"]
-            },
+            "individual": {name: list(INDIVIDUAL_ACTIONS) for name in self.pools},
             "duet": ["duet_song", "duet_dance", "ensemble_show"],
             "management": ["status", "energy_check", "rest_both"]
         }
     
-    def _get_duet_lyrics(self, song_name: str) -> List[str]:
+    def _get_duet_lyrics(self, song_name: str) -> Lines:
         """Get lyrics for duet songs."""
-        lyrics_dict = {
-            "Mickey and Donald's Friendship Song": [
-                "Mickey: We're the best of friends, you and me!",
-                "Donald: Quack quack, that's how it should be!",
-                "Mickey: Through thick and thin, we'll always be!",
-                "Donald: Donald and Mickey, you'll see!",
-                "Both: Friendship forever, that's our song!",
-                "Both: Disney magic makes us strong!"
-            ],
-            "The Disney Duet": [
-                "Mickey: Disney magic in the air!",
-                "Donald: Quack quack, everywhere!",
-                "Mickey: Making dreams come true!",
-                "Donald: For me and you!",
-                "Both: Disney duet, pure delight!",
-                "Both: Making everything all right!"
-            ]
-        }
-        
-        return lyrics_dict.get(song_name, [
-            "Mickey: Singing in perfect harmony...",
-            "Donald: Quack quack, that's the key...",
-            "Mickey: Disney magic all around...",
-            "Donald: Making the sweetest sound...",
-            "Both: Together we're the best!",
-            "Both: Disney duet, pure success!"
-        ])
+        return self.duet_catalog.lyrics(song_name)
     
-    def _get_duet_dance_steps(self, dance_name: str) -> List[str]:
+    def _get_duet_dance_steps(self, dance_name: str) -> Lines:
         """Get dance steps for duet dances."""
-        steps_dict = {
-            "The Mickey-Donald Shuffle": [
-                "🦶 Both shuffle to the left",
-                "🦶 Both shuffle to the right",
-                "🦶 Spin around together",
-                "🦶 Perfect synchronization!"
-            ],
-            "Friendship Waltz": [
-                "💃 Waltz in perfect harmony",
-                "💃 Spin and twirl together",
-                "💃 Disney magic in motion",
-                "💃 Friendship dance complete!"
-            ]
-        }
-        
-        return steps_dict.get(dance_name, [
-            "💃 Dancing in perfect sync...",
-            "💃 Moving to the rhythm...",
-            "💃 Disney magic in motion...",
-            "💃 What a spectacular duet!"
-        ])
+        return self.duet_catalog.steps(dance_name)
     
     def get_coordinator_status(self) -> Dict[str, str]:
         """Get coordinator's current status."""
         return {
             "coordinator_name": self.name,
             "is_coordinating": str(self.is_coordinating),
-            "mickey_available": str(not self.mickey.is_performing),
-            "donald_available": str(not self.donald.is_performing),
+            "mickey_available": str(self.pools["mickey"].available > 0),
+            "donald_available": str(self.pools["donald"].available > 0),
+            "mickey_replicas": f"{self.pools['mickey'].available}/{len(self.pools['mickey'])} free",
+            "donald_replicas": f"{self.pools['donald'].available}/{len(self.pools['donald'])} free",
             "available_duet_songs": str(len(self.duet_songs)),
             "available_duet_dances": str(len(self.duet_dances)),
-            "audio_system": "visual_audio"
+            "audio_system": "visual_audio",
+            "clock_mode": self.clock.mode,
+            "simulated_time": f"{self.clock.now():.1f}s"
         }
 
 def main():
     """Main interactive CLI for the Disney Coordinator with Visual Audio."""
-    coordinator = DisneyCoordinatorVisualAudio()
+    coordinator = DisneyCoordinatorVisualAudio(clock=clock_from_environment(), replicas=replicas_from_environment())
+    print("🎵 Rich visual audio system initialized!")
+    print("✨ Using musical symbols and animations for audio simulation!")
     
     print("🎭🎵🦆🐭")
     print("=" * 60)
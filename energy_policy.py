@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Energy Policy for the Disney Coordinator
+Routes work to the most rested replicas and fits in rests before agents run dry
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+from performance_engine import PerformanceScript
+
+# Below this the coordinator already warns "Consider rest if low!"
+DEFAULT_REST_THRESHOLD = 30
+
+
+class EnergyPolicy:
+    """
+    Energy Policy - decides which replica performs and when agents rest.
+
+    Free replicas are offered most energy first, so work spreads across a
+    pool instead of wearing out the first replica. Before a performance the
+    coordinator lets every reserved agent below `rest_threshold` rest (while
+    it still holds the agent), so energy never has to be topped up by hand.
+    `rest_threshold=0` turns automatic rests off.
+
+    The policy also keeps score: performances completed, rests taken, and the
+    sustained shows per hour of performance time from the first show started
+    to the last one finished, rest breaks included.
+    """
+
+    def __init__(self, rest_threshold: int = DEFAULT_REST_THRESHOLD):
+        if not 0 <= rest_threshold <= 100:
+            raise ValueError(f"Rest threshold must be between 0 and 100, got {rest_threshold}")
+        self.rest_threshold = rest_threshold
+        # Shows finish on job workers and request threads at the same time
+        self._lock = threading.Lock()
+        self._shows = 0
+        self._rests = 0
+        self._rest_seconds = 0.0
+        self._first_started: Optional[float] = None
+        self._last_finished: Optional[float] = None
+
+    def order(self, replicas: Iterable) -> List:
+        """Replicas in the order to try them: most energy first, ties in pool order."""
+        return sorted(replicas, key=lambda replica: -replica.energy)
+
+    def needs_rest(self, agent) -> bool:
+        """Whether an agent is too tired to perform before resting."""
+        return agent.energy < self.rest_threshold
+
+    def rest_script(self, agents: Iterable, clock) -> PerformanceScript:
+        """Rest each reserved agent that needs it until it is back above the threshold."""
+        for agent in agents:
+            while self.needs_rest(agent):
+                started = clock.now()
+                before = agent.energy
+                yield from agent.rest_reserved_script()
+                with self._lock:
+                    self._rests += 1
+                    self._rest_seconds += clock.now() - started
+                if agent.energy <= before:
+                    # Already at full energy; resting again would never help
+                    break
+
+    def record_show(self, started_at: float, finished_at: float):
+        """Count a completed performance and the time it spanned."""
+        with self._lock:
+            self._shows += 1
+            if self._first_started is None or started_at < self._first_started:
+                self._first_started = started_at
+            if self._last_finished is None or finished_at > self._last_finished:
+                self._last_finished = finished_at
+
+    def get_report(self) -> Dict:
+        """Shows completed, rests taken and the sustained shows per hour."""
+        with self._lock:
+            shows, rests, rest_seconds = self._shows, self._rests, self._rest_seconds
+            span = 0.0
+            if self._first_started is not None:
+                span = self._last_finished - self._first_started
+        return {
+            "rest_threshold": self.rest_threshold,
+            "shows": shows,
+            "rests": rests,
+            "rest_seconds": round(rest_seconds, 3),
+            "performance_seconds": round(span, 3),
+            "shows_per_hour": round(shows / span * 3600, 1) if span > 0 else 0.0,
+        }
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Performance Event Broadcaster for the Disney Coordinator
+Fans live performance events out to any number of viewers with replay
+"""
+
+import json
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+from performance_events import PerformanceEvent
+
+# (sequence id, serialized JSON payload)
+BroadcastEntry = Tuple[int, str]
+
+
+class PerformanceEventBroadcaster:
+    """
+    Performance Event Broadcaster - an engine listener that keeps the most
+    recent events with increasing sequence ids and wakes waiting viewers.
+
+    Each event is serialized to JSON once, no matter how many viewers read it.
+    Viewers remember the last id they saw and ask for everything after it,
+    which is how Server-Sent Events clients resume with Last-Event-ID.
+
+    Called as a listener it numbers events itself; subscribed to an
+    EventLog with `publish`, it reuses the log's sequence numbers, so a
+    viewer can read the log and then stream from the log's cursor.
+    """
+
+    def __init__(self, history_size: int = 1000):
+        self.history_size = history_size
+        self._history = deque(maxlen=history_size)
+        self._last_id = 0
+        self._condition = threading.Condition()
+
+    def __call__(self, event: PerformanceEvent):
+        payload = json.dumps(event.to_dict())
+        with self._condition:
+            self._append(self._last_id + 1, payload)
+
+    def publish(self, event_id: int, event: PerformanceEvent):
+        """Add an event numbered elsewhere; ids must keep increasing."""
+        payload = json.dumps(event.to_dict())
+        with self._condition:
+            self._append(event_id, payload)
+
+    def _append(self, event_id: int, payload: str):
+        self._last_id = event_id
+        self._history.append((event_id, payload))
+        self._condition.notify_all()
+
+    @property
+    def last_id(self) -> int:
+        """Sequence id of the most recent event (0 before any event)."""
+        return self._last_id
+
+    def events_since(self, last_id: int) -> List[BroadcastEntry]:
+        """Events newer than `last_id` that are still in the history."""
+        with self._condition:
+            return self._events_since(last_id)
+
+    def wait_for_events(self, last_id: int, timeout: Optional[float] = None) -> List[BroadcastEntry]:
+        """
+        Block until there are events newer than `last_id` or the timeout
+        expires. An id beyond the latest event (e.g. from before a server
+        restart) is pulled back to the latest, so the viewer gets new events.
+        """
+        with self._condition:
+            last_id = min(last_id, self._last_id)
+            self._condition.wait_for(lambda: self._last_id > last_id, timeout)
+            return self._events_since(last_id)
+
+    def _events_since(self, last_id: int) -> List[BroadcastEntry]:
+        newer = []
+        for entry in reversed(self._history):
+            if entry[0] <= last_id:
+                break
+            newer.append(entry)
+        newer.reverse()
+        return newer
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Event Log for the Disney Coordinator
+A fixed-size ring buffer of performance events that clients read with a cursor
+"""
+
+import threading
+from collections import deque
+from itertools import islice
+from typing import Callable, Dict, List, Optional
+from performance_events import PerformanceEvent
+
+DEFAULT_EVENT_LOG_SIZE = 2000
+DEFAULT_LOG_LIMIT = 100
+MAX_LOG_LIMIT = 1000
+
+
+class EventLog:
+    """
+    Event Log - an engine listener that keeps the last `capacity` events.
+
+    Every event gets the next sequence number (1, 2, 3, ...). Readers pass
+    the last number they saw as `since` and get only newer entries, plus the
+    cursor to use next time, so tailing the log costs constant memory on
+    both ends. Events are stored as they are and only serialized when read.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_EVENT_LOG_SIZE):
+        if capacity < 1:
+            raise ValueError(f"An event log needs room for at least 1 event, got {capacity}")
+        self.capacity = capacity
+        self._events = deque(maxlen=capacity)
+        self._last_seq = 0
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[int, PerformanceEvent], None]] = []
+
+    def __call__(self, event: PerformanceEvent):
+        with self._lock:
+            self._events.append(event)
+            self._last_seq += 1
+            # Under the lock, so subscribers see sequence numbers in order
+            for subscriber in self._subscribers:
+                subscriber(self._last_seq, event)
+
+    def subscribe(self, subscriber: Callable[[int, PerformanceEvent], None]):
+        """Call `subscriber(seq, event)` for every event logged from now on."""
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recent event (0 before any event)."""
+        return self._last_seq
+
+    def read(self, since: Optional[int] = None, limit: int = DEFAULT_LOG_LIMIT) -> Dict:
+        """
+        Up to `limit` entries newer than sequence number `since`, oldest
+        first; without `since`, the most recent `limit` entries.
+
+        `next` is the cursor for the following call. `missed` counts entries
+        after `since` that were overwritten before they were read, and
+        `has_more` says whether another call would return entries right away.
+        """
+        limit = max(0, min(limit, MAX_LOG_LIMIT))
+        with self._lock:
+            last = self._last_seq
+            first = last - len(self._events) + 1
+            if since is None:
+                since = max(first, last - limit + 1) - 1
+            start = max(since + 1, first)
+            events = list(islice(self._events, start - first, start - first + limit))
+        entries = []
+        for seq, event in enumerate(events, start):
+            entry = event.to_dict()
+            entry["seq"] = seq
+            entries.append(entry)
+        # A cursor from before a restart (beyond the last event) is pulled back
+        cursor = min(start + len(events) - 1, last)
+        return {
+            "entries": entries,
+            "next": cursor,
+            "latest": last,
+            "missed": max(0, first - since - 1),
+            "has_more": cursor < last,
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._events), "capacity": self.capacity, "latest": self._last_seq}
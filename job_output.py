@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Job Output Capture for the Disney Coordinator
+Keeps each performance job's output in its own bounded buffer
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from output_sinks import OutputSink
+
+DEFAULT_JOB_OUTPUT_BYTES = 16 * 1024
+DEFAULT_JOB_OUTPUT_BUDGET = 4 * 1024 * 1024
+DEFAULT_JOB_OUTPUT_AGE = 15 * 60
+
+# Id of the job whose output is being produced; set by the job queue for the
+# job's coroutine and every task it starts
+current_job: ContextVar[Optional[str]] = ContextVar("current_job", default=None)
+
+
+@dataclass
+class JobOutputBuffer:
+    """Job Output Buffer - the captured lines of one job, up to a size cap."""
+    created_at: float
+    lines: List[str] = field(default_factory=list)
+    size: int = 0
+    dropped_lines: int = 0
+    dropped_bytes: int = 0
+
+
+class JobOutputCapture(OutputSink):
+    """
+    Job Output Capture - an output sink that files every line under the job
+    that produced it.
+
+    Lines rendered while `current_job` is set go to that job's buffer; other
+    output is ignored. A buffer keeps the first `max_bytes_per_job` bytes and
+    then only counts what it drops, so a runaway show can't crowd out the
+    rest. Buffers older than `max_age` seconds are evicted, and the oldest
+    buffers go first whenever all of them together exceed `max_total_bytes`.
+    """
+
+    def __init__(self, max_bytes_per_job: int = DEFAULT_JOB_OUTPUT_BYTES,
+                 max_total_bytes: int = DEFAULT_JOB_OUTPUT_BUDGET,
+                 max_age: float = DEFAULT_JOB_OUTPUT_AGE,
+                 clock: Callable[[], float] = time.time):
+        if not 0 < max_bytes_per_job <= max_total_bytes:
+            raise ValueError(f"Need 0 < max_bytes_per_job <= max_total_bytes, "
+                             f"got {max_bytes_per_job} and {max_total_bytes}")
+        self.max_bytes_per_job = max_bytes_per_job
+        self.max_total_bytes = max_total_bytes
+        self.max_age = max_age
+        self._clock = clock
+        # Oldest first, so eviction pops from the front
+        self._buffers: "OrderedDict[str, JobOutputBuffer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self._evicted = 0
+
+    def __call__(self, event):
+        # Skip rendering entirely for output that doesn't belong to a job
+        if current_job.get() is not None:
+            super().__call__(event)
+
+    def write_line(self, text: str, job_id: Optional[str] = None):
+        """Add a line to `job_id`'s buffer (the current job's by default)."""
+        job_id = job_id or current_job.get()
+        if job_id is None:
+            return
+        size = len(text.encode("utf-8")) + 1
+        with self._lock:
+            now = self._clock()
+            buffer = self._buffers.get(job_id)
+            if buffer is None:
+                buffer = self._buffers[job_id] = JobOutputBuffer(created_at=now)
+            if buffer.size + size > self.max_bytes_per_job:
+                buffer.dropped_lines += 1
+                buffer.dropped_bytes += size
+                return
+            buffer.lines.append(text)
+            buffer.size += size
+            self._total_bytes += size
+            self._evict(now)
+
+    def _evict(self, now: float):
+        # Called with self._lock held
+        while self._buffers:
+            job_id, buffer = next(iter(self._buffers.items()))
+            if now - buffer.created_at <= self.max_age and self._total_bytes <= self.max_total_bytes:
+                break
+            del self._buffers[job_id]
+            self._total_bytes -= buffer.size
+            self._evicted += 1
+
+    def get_output(self, job_id: str) -> Optional[Dict]:
+        """A job's captured lines, ending with a truncation marker if any were dropped; None if none are kept."""
+        with self._lock:
+            self._evict(self._clock())
+            buffer = self._buffers.get(job_id)
+            if buffer is None:
+                return None
+            lines = list(buffer.lines)
+            if buffer.dropped_lines:
+                lines.append(f"… output truncated: {buffer.dropped_lines} more lines "
+                             f"({buffer.dropped_bytes} bytes) not kept …")
+            return {
+                "job_id": job_id,
+                "lines": lines,
+                "bytes": buffer.size,
+                "truncated": buffer.dropped_lines > 0,
+            }
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        with self._lock:
+            stats.update({
+                "jobs": len(self._buffers),
+                "bytes": self._total_bytes,
+                "max_bytes_per_job": self.max_bytes_per_job,
+                "max_total_bytes": self.max_total_bytes,
+                "max_age": self.max_age,
+                "evicted": self._evicted,
+            })
+        return stats
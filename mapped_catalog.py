@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Catalog Storage for the Disney Coordinator
+A compact on-disk catalog format that is mapped into memory and decoded lazily
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"DCAT"
+FORMAT_VERSION = 1
+
+# magic, format version, reserved, directory offset, directory length
+HEADER = struct.Struct("<4sHHQQ")
+# Every record is its length followed by the title and lines joined by NUL
+RECORD_LENGTH = struct.Struct("<I")
+SEPARATOR = "\x00"
+
+# Entry offsets are 64-bit, hash slots are (title hash, entry index + 1) pairs
+# of 32-bit values; both are stored little-endian
+OFFSET_TYPE = "Q"
+SLOT_TYPE = "I"
+
+SECTIONS = ("songs", "dances")
+
+
+def title_hash(title: str) -> int:
+    """Hash of a title that is the same in every process (unlike hash())."""
+    return zlib.crc32(title.encode("utf-8"))
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class MappedCatalogWriter:
+    """
+    Mapped Catalog Writer - streams entries into a catalog file.
+
+    Records are written as they are added, so even a catalog with millions
+    of entries is never held in memory; only an 8-byte offset and a 4-byte
+    hash per entry are kept until `close` writes the offset index, the hash
+    tables and the directory. Raises ValueError for duplicate titles or text
+    containing NUL characters.
+
+    File layout: header, records, then for every performer and section an
+    array of record offsets (in insertion order) and an open-addressing hash
+    table from title to entry, then a small JSON directory describing where
+    each table starts and holding the fallback lines.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w+b")
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0, 0))
+        # (performer, section) -> (record offsets, title hashes)
+        self._sections: Dict[Tuple[str, str], Tuple[array, array]] = {}
+        self._performers: Dict[str, Dict] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def _performer(self, performer: str) -> Dict:
+        return self._performers.setdefault(performer, {})
+
+    def add(self, performer: str, section: str, title: str, lines: Sequence):
+        """Append a song or dance (`section` "songs" or "dances")."""
+        if section not in SECTIONS:
+            raise ValueError(f"Unknown catalog section '{section}'")
+        fields = [title, *lines]
+        if any(SEPARATOR in field for field in fields):
+            raise ValueError(f"{performer} {section} '{title}' contains a NUL character")
+        payload = SEPARATOR.join(fields).encode("utf-8")
+        self._performer(performer)
+        offsets, hashes = self._sections.setdefault((performer, section), (array(OFFSET_TYPE), array(SLOT_TYPE)))
+        offsets.append(self._file.tell())
+        hashes.append(title_hash(title))
+        self._file.write(RECORD_LENGTH.pack(len(payload)))
+        self._file.write(payload)
+
+    def set_fallback(self, performer: str, name: str, lines: Sequence):
+        """Store a performer's "fallback_song" or "fallback_dance" lines."""
+        self._performer(performer)[name] = list(lines)
+
+    def _title_at(self, offset: int) -> str:
+        self._file.seek(offset)
+        (length,) = RECORD_LENGTH.unpack(self._file.read(RECORD_LENGTH.size))
+        return self._file.read(length).decode("utf-8").split(SEPARATOR, 1)[0]
+
+    def _hash_table(self, performer: str, section: str, offsets: array, hashes: array) -> array:
+        slot_count = 1
+        while slot_count < 2 * len(offsets):
+            slot_count *= 2
+        mask = slot_count - 1
+        slots = array(SLOT_TYPE, bytes(8 * slot_count))
+        for index, hashed in enumerate(hashes):
+            position = hashed & mask
+            while slots[2 * position + 1]:
+                other = slots[2 * position + 1] - 1
+                if slots[2 * position] == hashed and \
+                        self._title_at(offsets[other]) == self._title_at(offsets[index]):
+                    raise ValueError(f"Duplicate {performer} {section} '{self._title_at(offsets[index])}'")
+                position = (position + 1) & mask
+            slots[2 * position] = hashed
+            slots[2 * position + 1] = index + 1
+        return slots
+
+    def _write_aligned(self, data: bytes) -> int:
+        self._file.seek(0, 2)
+        self._file.write(bytes(-self._file.tell() % 8))
+        offset = self._file.tell()
+        self._file.write(data)
+        return offset
+
+    def close(self):
+        """Write the index and directory and close the file."""
+        if self._file.closed:
+            return
+        try:
+            directory = {}
+            for performer, content in self._performers.items():
+                directory[performer] = dict(content)
+            for (performer, section), (offsets, hashes) in self._sections.items():
+                slots = self._hash_table(performer, section, offsets, hashes)
+                directory[performer][section] = {
+                    "count": len(offsets),
+                    "offsets": self._write_aligned(_little_endian(offsets)),
+                    "slots": self._write_aligned(_little_endian(slots)),
+                    "slot_count": len(slots) // 2,
+                }
+            data = json.dumps({"performers": directory}, ensure_ascii=False).encode("utf-8")
+            directory_offset = self._write_aligned(data)
+            self._file.seek(0)
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, directory_offset, len(data)))
+        finally:
+            self._file.close()
+
+
+def is_mapped_catalog(path: str) -> bool:
+    """Whether `path` is a catalog file in this format (rather than JSON)."""
+    try:
+        with open(path, "rb") as catalog_file:
+            return catalog_file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class MappedCatalogFile:
+    """
+    Mapped Catalog File - a catalog file mapped read-only into memory.
+
+    Opening reads only the header and directory; the operating system pages
+    records and index in as they are touched, and processes sharing the
+    file share those pages. Raises ValueError for files in another format.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder == "big":
+            raise ValueError("Mapped catalogs are little-endian and can't be read on this machine")
+        self.path = path
+        with open(path, "rb") as catalog_file:
+            self._map = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, directory_offset, directory_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} mapped catalog")
+        directory = json.loads(self._map[directory_offset:directory_offset + directory_length].decode("utf-8"))
+        self.performers: Dict[str, Dict] = directory["performers"]
+
+    def entries(self, performer: str, section: str) -> "MappedEntries":
+        """The songs or dances of a performer, as a lazily decoded mapping."""
+        return MappedEntries(self._map, self.performers[performer].get(section))
+
+
+class MappedEntries(Mapping):
+    """
+    Mapped Entries - title -> lines for one section of a mapped catalog.
+
+    A lookup hashes the title, probes the on-disk hash table and decodes the
+    one record it finds. Iteration yields titles in the original order.
+    """
+
+    def __init__(self, catalog_map: mmap.mmap, section: Optional[Dict]):
+        self._map = catalog_map
+        view = memoryview(catalog_map)
+        count = section["count"] if section else 0
+        slot_count = section["slot_count"] if section else 0
+        start = section["offsets"] if section else 0
+        self._offsets = view[start:start + 8 * count].cast(OFFSET_TYPE)
+        start = section["slots"] if section else 0
+        self._slots = view[start:start + 8 * slot_count].cast(SLOT_TYPE)
+        self._mask = slot_count - 1
+
+    def _record(self, index: int) -> List[str]:
+        offset = self._offsets[index]
+        (length,) = RECORD_LENGTH.unpack_from(self._map, offset)
+        start = offset + RECORD_LENGTH.size
+        return self._map[start:start + length].decode("utf-8").split(SEPARATOR)
+
+    def title(self, index: int) -> str:
+        """Title of the entry at `index` (insertion order)."""
+        return self._record(index)[0]
+
+    def item(self, index: int) -> Tuple[str, Tuple[str, ...]]:
+        """(title, lines) of the entry at `index`."""
+        title, *lines = self._record(index)
+        return title, tuple(lines)
+
+    def __getitem__(self, title: str) -> Tuple[str, ...]:
+        if self._mask < 0:
+            raise KeyError(title)
+        hashed = title_hash(title)
+        position = hashed & self._mask
+        while True:
+            entry = self._slots[2 * position + 1]
+            if not entry:
+                raise KeyError(title)
+            if self._slots[2 * position] == hashed:
+                record = self._record(entry - 1)
+                if record[0] == title:
+                    return tuple(record[1:])
+            position = (position + 1) & self._mask
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self._offsets)):
+            yield self.title(index)
+
+
+class MappedTitles(Sequence):
+    """Mapped Titles - the titles of a MappedEntries section, by position."""
+
+    def __init__(self, entries: MappedEntries):
+        self._entries = entries
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entries.title(position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("title index out of range")
+        return self._entries.title(index)
+
+    def __len__(self) -> int:
+        return len(self._entries)
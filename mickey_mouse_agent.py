@@ -1,69 +1,103 @@
-import time
 import random
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 import threading
 import os
+from performance_engine import PerformanceEngine, PerformanceScript
+from performance_catalog import Lines, default_catalog
+from agent_reservation import AgentReservation, reserved_script
+from performance_events import (
+    PerformanceStarted, PerformanceFinished, Narration, LyricLine, DanceStep, Gesture, EnergyChanged
+)
 
 class MickeyMouseAgent:
     """
     Mickey Mouse Agent - A delightful character that can sing, wave, and dance!
     """
     
-    def __init__(self):
+    # No per-agent __dict__; songs and dances are read from the shared catalog
+    __slots__ = ("name", "mood", "energy", "reservation", "engine", "clock", "catalog")
+    
+    def __init__(self, clock=None, engine=None, output=None):
         self.name = "Mickey Mouse"
         self.mood = "happy"
         self.energy = 100
-        self.is_performing = False
-        
-        self.songs = [
-            "It's a Small World",
-            "When You Wish Upon a Star", 
-            "Mickey Mouse Club March",
-            "Zip-a-Dee-Doo-Dah",
-            "Heigh-Ho",
-            "Whistle While You Work"
-        ]
-        
-        self.dance_moves = [
-            "The Mickey Shuffle",
-            "The Hot Dog Dance", 
-            "The Sorcerer's Apprentice Spin",
-            "The Steamboat Willie Jig",
-            "The Fantasia Waltz",
-            "The Clubhouse Bounce"
-        ]
-        
+        # Booked for the length of each performance, so overlapping requests can't double-book
+        self.reservation = AgentReservation(self)
+        # The engine paces every performance with its clock (real, scaled or virtual);
+        # `output` is the sink its performances are rendered to (terminal by default)
+        self.engine = engine or PerformanceEngine(clock, None if output is None else [output])
+        self.clock = self.engine.clock
+        
+        # Songs and dances come from the shared catalog (loaded once for every agent)
+        self.catalog = default_catalog().performer("mickey")
+        
+    @property
+    def songs(self):
+        """Titles of the songs Mickey knows (the catalog's, shared by every agent)."""
+        return self.catalog.song_titles
+    
+    @property
+    def dance_moves(self):
+        """Titles of the dances Mickey knows (the catalog's, shared by every agent)."""
+        return self.catalog.dance_titles
+    
+    @property
+    def is_performing(self) -> bool:
+        """Whether Mickey is booked for a performance."""
+        return self.reservation.is_reserved
+    
     def sing(self, song_name: Optional[str] = None) -> str:
         """Mickey sings a song!"""
-        if self.is_performing:
-            return f"🎵 {self.name} is already performing! Please wait."
-        
+        return self.engine.run(self.sing_script(song_name))
+    
+    async def sing_async(self, song_name: Optional[str] = None) -> str:
+        """Mickey sings a song without blocking the event loop."""
+        return await self.engine.run_async(self.sing_script(song_name))
+    
+    def sing_script(self, song_name: Optional[str] = None) -> PerformanceScript:
+        """Performance script for sing(): yields pauses and events, returns the result."""
+        return reserved_script(self.reservation, "sing", lambda: self.sing_reserved_script(song_name),
+                               f"🎵 {self.name} is already performing! Please wait.")
+    
+    def sing_reserved_script(self, song_name: Optional[str] = None) -> PerformanceScript:
+        """sing_script() for a caller that already holds Mickey's reservation."""
         if song_name is None:
             song_name = random.choice(self.songs)
         
-        self.is_performing = True
-        self.energy -= 10
+        old_energy = self.energy
+        self.energy = max(0, self.energy - 10)
+        yield EnergyChanged(self.name, old_energy=old_energy, new_energy=self.energy)
         
         lyrics = self._get_song_lyrics(song_name)
         
         # Simulate singing performance with visual feedback
-        print(f"🎤 {self.name} starts singing '{song_name}'...")
-        print(f"   🎭 Disney magic in the air! ✨")
+        yield PerformanceStarted(self.name, action="sing", title=song_name, message=f"🎤 {self.name} starts singing '{song_name}'...")
+        yield Narration(self.name, message=f"   🎭 Disney magic in the air! ✨")
         for i, line in enumerate(lyrics):
             # Add visual feedback with emojis
             visual_feedback = "🎵" if i % 2 == 0 else "🎤"
-            print(f"   {visual_feedback} {line}")
-            time.sleep(0.8)  # Slower for better visual effect
+            yield LyricLine(self.name, line=line, prefix=f"   {visual_feedback}")
+            yield 0.8  # Slower for better visual effect
         
-        print(f"   🌟 Encore! Encore! 👏")
-        self.is_performing = False
-        return f"🎵 {self.name} finished singing '{song_name}'! What a magical Disney performance! ✨"
+        result = f"🎵 {self.name} finished singing '{song_name}'! What a magical Disney performance! ✨"
+        yield PerformanceFinished(self.name, action="sing", result=result, message=f"   🌟 Encore! Encore! 👏")
+        return result
     
     def wave(self, style: str = "friendly") -> str:
         """Mickey waves hello!"""
-        if self.is_performing:
-            return f"👋 {self.name} is busy performing! Please wait."
-        
+        return self.engine.run(self.wave_script(style))
+    
+    async def wave_async(self, style: str = "friendly") -> str:
+        """Mickey waves hello without blocking the event loop."""
+        return await self.engine.run_async(self.wave_script(style))
+    
+    def wave_script(self, style: str = "friendly") -> PerformanceScript:
+        """Performance script for wave(): yields pauses and events, returns the result."""
+        return reserved_script(self.reservation, "wave", lambda: self.wave_reserved_script(style),
+                               f"👋 {self.name} is busy performing! Please wait.")
+    
+    def wave_reserved_script(self, style: str = "friendly") -> PerformanceScript:
+        """wave_script() for a caller that already holds Mickey's reservation."""
         wave_styles = {
             "friendly": ["👋", "👋", "👋", "👋", "👋"],
             "excited": ["👋✨", "👋✨", "👋✨", "👋✨", "👋✨"],
@@ -74,134 +108,103 @@ class MickeyMouseAgent:
         
         wave_sequence = wave_styles.get(style, wave_styles["friendly"])
         
-        print(f"👋 {self.name} waves {style}ly!")
-        print(f"   🎭 Disney charm at its finest! ✨")
+        yield PerformanceStarted(self.name, action="wave", title=style, message=f"👋 {self.name} waves {style}ly!")
+        yield Narration(self.name, message=f"   🎭 Disney charm at its finest! ✨")
         
         # Animated wave sequence
         for wave_emoji in wave_sequence:
-            print(f"   {wave_emoji}")
-            time.sleep(0.3)
+            yield Gesture(self.name, symbol=wave_emoji)
+            yield 0.3
         
-        return f"👋 Hi there! {self.name} says hello with a {style} wave! 🌟"
+        result = f"👋 Hi there! {self.name} says hello with a {style} wave! 🌟"
+        yield PerformanceFinished(self.name, action="wave", result=result)
+        return result
     
     def dance(self, dance_move: Optional[str] = None) -> str:
         """Mickey dances with style!"""
-        if self.is_performing:
-            return f"💃 {self.name} is already performing! Please wait."
-        
+        return self.engine.run(self.dance_script(dance_move))
+    
+    async def dance_async(self, dance_move: Optional[str] = None) -> str:
+        """Mickey dances with style without blocking the event loop."""
+        return await self.engine.run_async(self.dance_script(dance_move))
+    
+    def dance_script(self, dance_move: Optional[str] = None) -> PerformanceScript:
+        """Performance script for dance(): yields pauses and events, returns the result."""
+        return reserved_script(self.reservation, "dance", lambda: self.dance_reserved_script(dance_move),
+                               f"💃 {self.name} is already performing! Please wait.")
+    
+    def dance_reserved_script(self, dance_move: Optional[str] = None) -> PerformanceScript:
+        """dance_script() for a caller that already holds Mickey's reservation."""
         if dance_move is None:
             dance_move = random.choice(self.dance_moves)
         
-        self.is_performing = True
-        self.energy -= 15
+        old_energy = self.energy
+        self.energy = max(0, self.energy - 15)
+        yield EnergyChanged(self.name, old_energy=old_energy, new_energy=self.energy)
         
-        print(f"💃 {self.name} starts dancing the '{dance_move}'...")
-        print(f"   🎭 Disney rhythm in the air! ✨")
+        yield PerformanceStarted(self.name, action="dance", title=dance_move, message=f"💃 {self.name} starts dancing the '{dance_move}'...")
+        yield Narration(self.name, message=f"   🎭 Disney rhythm in the air! ✨")
         
         # Simulate dance performance with visual feedback
         dance_steps = self._get_dance_steps(dance_move)
         for i, step in enumerate(dance_steps):
             # Add visual feedback with emojis
             visual_feedback = "💃" if i % 2 == 0 else "🕺"
-            print(f"   {visual_feedback} {step}")
-            time.sleep(0.6)  # Slower for better visual effect
+            yield DanceStep(self.name, step=step, prefix=f"   {visual_feedback}")
+            yield 0.6  # Slower for better visual effect
         
-        print(f"   🌟 Bravo! What a performance! 👏")
-        self.is_performing = False
-        return f"💃 {self.name} finished the '{dance_move}'! What a magical Disney show! ✨"
+        result = f"💃 {self.name} finished the '{dance_move}'! What a magical Disney show! ✨"
+        yield PerformanceFinished(self.name, action="dance", result=result, message=f"   🌟 Bravo! What a performance! 👏")
+        return result
     
     def perform_show(self) -> str:
         """Mickey puts on a complete show with singing, waving, and dancing!"""
-        if self.is_performing:
-            return f"🎭 {self.name} is already performing! Please wait."
-        
-        self.is_performing = True
-        print(f"🎭 {self.name} is putting on a spectacular Disney show!")
-        print(f"   ✨ The magic begins... 🌟")
+        return self.engine.run(self.perform_show_script())
+    
+    async def perform_show_async(self) -> str:
+        """Mickey puts on a complete show without blocking the event loop."""
+        return await self.engine.run_async(self.perform_show_script())
+    
+    def perform_show_script(self) -> PerformanceScript:
+        """Performance script for perform_show(): yields pauses and events, returns the result."""
+        return reserved_script(self.reservation, "show", self.perform_show_reserved_script,
+                               f"🎭 {self.name} is already performing! Please wait.")
+    
+    def perform_show_reserved_script(self) -> PerformanceScript:
+        """perform_show_script() for a caller that already holds Mickey's reservation."""
+        yield PerformanceStarted(self.name, action="show", message=f"🎭 {self.name} is putting on a spectacular Disney show!")
+        yield Narration(self.name, message=f"   ✨ The magic begins... 🌟")
         
         # Wave to the audience
-        print("🎭 Opening with a wave to the audience...")
-        self.wave("excited")
-        time.sleep(0.5)
+        yield Narration(self.name, message="🎭 Opening with a wave to the audience...")
+        yield from self.wave_script("excited")
+        yield 0.5
         
         # Sing a song
-        print("🎭 Now for the musical performance...")
-        self.sing()
-        time.sleep(0.5)
+        yield Narration(self.name, message="🎭 Now for the musical performance...")
+        yield from self.sing_script()
+        yield 0.5
         
         # Dance
-        print("🎭 And now for the dance finale...")
-        self.dance()
-        time.sleep(0.5)
+        yield Narration(self.name, message="🎭 And now for the dance finale...")
+        yield from self.dance_script()
+        yield 0.5
         
         # Final wave
-        print("🎭 Final bow and wave...")
-        self.wave("royal")
+        yield Narration(self.name, message="🎭 Final bow and wave...")
+        yield from self.wave_script("royal")
         
-        print(f"   🌟 Standing ovation! 👏✨")
-        self.is_performing = False
-        return f"🎭 {self.name} completed the show! Thank you for watching this magical Disney performance! ✨🌟"
+        result = f"🎭 {self.name} completed the show! Thank you for watching this magical Disney performance! ✨🌟"
+        yield PerformanceFinished(self.name, action="show", result=result, message=f"   🌟 Standing ovation! 👏✨")
+        return result
     
-    def _get_song_lyrics(self, song_name: str) -> List[str]:
+    def _get_song_lyrics(self, song_name: str) -> Lines:
         """Get lyrics for a specific song."""
-        lyrics_dict = {
-            "It's a Small World": [
-                "It's a world of laughter, a world of tears",
-                "It's a world of hopes and a world of fears",
-                "There's so much that we share",
-                "That it's time we're aware",
-                "It's a small world after all!"
-            ],
-            "When You Wish Upon a Star": [
-                "When you wish upon a star",
-                "Makes no difference who you are",
-                "Anything your heart desires",
-                "Will come to you!"
-            ],
-            "Mickey Mouse Club March": [
-                "M-I-C-K-E-Y M-O-U-S-E",
-                "Mickey Mouse! Mickey Mouse!",
-                "Forever let us hold our banner high!",
-                "High! High! High!"
-            ]
-        }
-        
-        return lyrics_dict.get(song_name, [
-            "🎵 La la la...",
-            "🎵 Singing a beautiful melody...",
-            "🎵 Making everyone smile...",
-            "🎵 That's the magic of music!"
-        ])
+        return self.catalog.lyrics(song_name)
     
-    def _get_dance_steps(self, dance_move: str) -> List[str]:
+    def _get_dance_steps(self, dance_move: str) -> Lines:
         """Get dance steps for a specific move."""
-        steps_dict = {
-            "The Mickey Shuffle": [
-                "🦶 Step to the left",
-                "🦶 Step to the right",
-                "🦶 Shuffle your feet",
-                "🦶 Spin around twice!"
-            ],
-            "The Hot Dog Dance": [
-                "🌭 Arms up high",
-                "🌭 Wiggle those hips",
-                "🌭 Jump and spin",
-                "🌭 Hot dog dance complete!"
-            ],
-            "The Sorcerer's Apprentice Spin": [
-                "🧙‍♂️ Raise the magic wand",
-                "🧙‍♂️ Start the slow spin",
-                "🧙‍♂️ Faster and faster",
-                "🧙‍♂️ Magical dance complete!"
-            ]
-        }
-        
-        return steps_dict.get(dance_move, [
-            "💃 Dancing with style...",
-            "💃 Moving to the rhythm...",
-            "💃 Spinning and twirling...",
-            "💃 What a fantastic dance!"
-        ])
+        return self.catalog.steps(dance_move)
     
     def get_status(self) -> Dict[str, str]:
         """Get Mickey's current status."""
@@ -216,19 +219,32 @@ class MickeyMouseAgent:
     
     def rest(self) -> str:
         """Mickey takes a rest to regain energy."""
-        if self.is_performing:
-            return f"😴 {self.name} is performing and can't rest right now!"
-        
+        return self.engine.run(self.rest_script())
+    
+    async def rest_async(self) -> str:
+        """Mickey takes a rest to regain energy without blocking the event loop."""
+        return await self.engine.run_async(self.rest_script())
+    
+    def rest_script(self) -> PerformanceScript:
+        """Performance script for rest(): yields pauses and events, returns the result."""
+        return reserved_script(self.reservation, "rest", self.rest_reserved_script,
+                               f"😴 {self.name} is performing and can't rest right now!")
+    
+    def rest_reserved_script(self) -> PerformanceScript:
+        """rest_script() for a caller that already holds Mickey's reservation."""
         old_energy = self.energy
         self.energy = min(100, self.energy + 30)
+        yield EnergyChanged(self.name, old_energy=old_energy, new_energy=self.energy)
         
-        print(f"😴 {self.name} takes a nice Disney rest...")
-        print(f"   ✨ Sweet dreams and magic... 🌟")
+        yield PerformanceStarted(self.name, action="rest", message=f"😴 {self.name} takes a nice Disney rest...")
+        yield Narration(self.name, message=f"   ✨ Sweet dreams and magic... 🌟")
         
         # Visual rest sequence
         rest_emojis = ["😴", "😴", "😴", "😴", "😴"]
         for emoji in rest_emojis:
-            print(f"   {emoji}")
-            time.sleep(0.5)
+            yield Gesture(self.name, symbol=emoji)
+            yield 0.5
         
-        return f"😴 {self.name} feels refreshed and ready for more Disney magic! Energy: {old_energy}% → {self.energy}% ✨"
\ No newline at end of file
+        result = f"😴 {self.name} feels refreshed and ready for more Disney magic! Energy: {old_energy}% → {self.energy}% ✨"
+        yield PerformanceFinished(self.name, action="rest", result=result)
+        return result
\ No newline at end of file
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Output Sinks for the Disney Coordinator
+Pluggable destinations for the rendered visual audio output
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Optional
+from performance_events import PerformanceEvent
+from terminal_renderer import FrameBufferedRenderer, DEFAULT_FPS
+
+DEFAULT_RING_LINES = 1000
+DEFAULT_LOG_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_BACKUPS = 5
+
+
+class OutputSink(ABC):
+    """
+    Output Sink - where rendered performance output goes.
+
+    A sink is an event listener: pass it to PerformanceEngine or
+    DisneyCoordinatorVisualAudio as one of `listeners` and every visible
+    event is rendered and handed to `write_line`. Subclasses decide what
+    happens to the line.
+    """
+
+    def __call__(self, event: PerformanceEvent):
+        text = event.render()
+        if text is not None:
+            self.write_line(text)
+
+    @abstractmethod
+    def write_line(self, text: str):
+        """Take one rendered line of output."""
+
+    def flush(self):
+        """Push out anything buffered."""
+
+    def close(self):
+        """Flush and release any resources."""
+        self.flush()
+
+    def get_stats(self) -> Dict:
+        return {"sink": type(self).__name__}
+
+
+class NullSink(OutputSink):
+    """Null Sink - discards everything without even rendering it (headless)."""
+
+    def __call__(self, event: PerformanceEvent):
+        pass
+
+    def write_line(self, text: str):
+        pass
+
+
+class StdoutSink(OutputSink):
+    """Stdout Sink - standard output, written in frames at most `fps` times a second."""
+
+    def __init__(self, fps: float = DEFAULT_FPS, stream=None):
+        self.renderer = FrameBufferedRenderer(stream, fps=fps)
+
+    def write_line(self, text: str):
+        self.renderer.writer.write_line(text)
+
+    def flush(self):
+        self.renderer.flush()
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats.update(self.renderer.writer.get_stats())
+        return stats
+
+
+class RotatingFileSink(OutputSink):
+    """
+    Rotating File Sink - appends to a log file that never grows past `max_bytes`.
+
+    When the next line would overflow the file, it is renamed to `path.1`
+    (shifting older files up to `path.<backup_count>`, dropping the oldest)
+    and a fresh file is started.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_LOG_BYTES, backup_count: int = DEFAULT_LOG_BACKUPS):
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+        self._rotations = 0
+
+    def write_line(self, text: str):
+        data = (text + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                return
+            if self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._size += len(data)
+
+    def _rotate(self):
+        # Called with self._lock held
+        self._file.close()
+        if self.backup_count > 0:
+            for number in range(self.backup_count - 1, 0, -1):
+                older = f"{self.path}.{number}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.path}.{number + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "wb")
+        self._size = 0
+        self._rotations += 1
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        with self._lock:
+            stats.update({"path": self.path, "bytes": self._size, "rotations": self._rotations})
+        return stats
+
+
+class RingBufferSink(OutputSink):
+    """Ring Buffer Sink - keeps only the last `max_lines` lines in memory."""
+
+    def __init__(self, max_lines: int = DEFAULT_RING_LINES):
+        self._lines = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._written = 0
+
+    def write_line(self, text: str):
+        with self._lock:
+            self._lines.append(text)
+            self._written += 1
+
+    def lines(self, limit: Optional[int] = None) -> List[str]:
+        """The buffered lines, oldest first; with `limit`, only the most recent ones."""
+        with self._lock:
+            lines = list(self._lines)
+        return lines if limit is None else lines[-limit:] if limit > 0 else []
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        with self._lock:
+            stats.update({"lines": len(self._lines), "max_lines": self._lines.maxlen, "written": self._written})
+        return stats
+
+
+def sink_from_spec(spec: str, fps: float = DEFAULT_FPS) -> OutputSink:
+    """
+    Create a sink from a short description, e.g. from the command line:
+    "null", "stdout", "file:/var/log/disney.log" or "ring:500".
+    """
+    kind, _, argument = spec.partition(":")
+    kind = kind.strip().lower()
+    if kind == "null":
+        return NullSink()
+    if kind == "stdout":
+        return StdoutSink(fps=fps)
+    if kind == "file" and argument:
+        return RotatingFileSink(argument)
+    if kind == "ring":
+        try:
+            return RingBufferSink(int(argument) if argument else DEFAULT_RING_LINES)
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid output '{spec}': use null, stdout, file:<path> or ring[:<lines>]")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Performance Catalog for the Disney Coordinator
+Songs, lyrics and dance routines, loaded once from a data file and shared by every agent
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from mapped_catalog import MappedCatalogFile, MappedCatalogWriter, MappedTitles, SECTIONS, is_mapped_catalog
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "disney_catalog.json")
+CATALOG_VERSION = 1
+
+# Lyric lines or dance steps, in performance order
+Lines = Tuple[str, ...]
+
+
+class CatalogError(ValueError):
+    """Raised when a catalog file is missing content or malformed."""
+
+
+@dataclass(frozen=True)
+class PerformerCatalog:
+    """
+    Performer Catalog - one performer's songs and dances.
+
+    Titles keep the order of the data file. Lookups are a single dict access
+    and return the shared, immutable tuple of lines; titles that aren't in
+    the catalog get the performer's fallback song or dance. For a mapped
+    catalog the mappings and title sequences are lazy views of the file.
+    """
+    performer: str
+    songs: Mapping[str, Lines]
+    dances: Mapping[str, Lines]
+    fallback_song: Lines
+    fallback_dance: Lines
+    song_titles: Sequence[str]
+    dance_titles: Sequence[str]
+
+    def lyrics(self, song_name: str) -> Lines:
+        """Lyric lines of a song (the fallback song for unknown titles)."""
+        return self.songs.get(song_name, self.fallback_song)
+
+    def steps(self, dance_name: str) -> Lines:
+        """Steps of a dance (the fallback dance for unknown titles)."""
+        return self.dances.get(dance_name, self.fallback_dance)
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Catalog - every performer's songs and dances, by performer name."""
+    performers: Mapping[str, PerformerCatalog]
+
+    def performer(self, name: str) -> PerformerCatalog:
+        try:
+            return self.performers[name]
+        except KeyError:
+            raise CatalogError(f"The catalog has nothing for '{name}'") from None
+
+    def __len__(self) -> int:
+        """Songs and dances across all performers."""
+        return sum(len(performer.songs) + len(performer.dances) for performer in self.performers.values())
+
+
+def _lines(value, where: str) -> Lines:
+    if not isinstance(value, list) or not value:
+        raise CatalogError(f"{where} needs a non-empty list of lines")
+    for line in value:
+        if not isinstance(line, str) or not line.strip():
+            raise CatalogError(f"{where} has an empty or non-text line")
+    return tuple(value)
+
+
+def validate_entry(performer: str, kind: str, title: str, lines) -> Lines:
+    """Check one song or dance (`kind` "songs" or "dances"); returns its lines as a tuple."""
+    where = f"{performer} {kind}"
+    if not isinstance(title, str) or not title.strip():
+        raise CatalogError(f"{where} has an entry without a title")
+    entry = _lines(lines, f"{where} '{title}'")
+    if performer == "duet" and kind == "songs" and len(entry) % 2:
+        # Duet lyrics are sung two lines at a time
+        raise CatalogError(f"{where} '{title}' needs an even number of lines")
+    return entry
+
+
+def _entries(value, performer: str, kind: str) -> Mapping[str, Lines]:
+    if not isinstance(value, dict) or not value:
+        raise CatalogError(f"{performer} {kind} needs at least one entry")
+    return MappingProxyType({title: validate_entry(performer, kind, title, lines) for title, lines in value.items()})
+
+
+def _reject_duplicates(pairs: List[Tuple[str, object]]) -> Dict:
+    data = {}
+    for key, value in pairs:
+        if key in data:
+            raise CatalogError(f"Duplicate catalog entry '{key}'")
+        data[key] = value
+    return data
+
+
+def parse_catalog(data: Dict) -> Catalog:
+    """Validate catalog data (as read from JSON) and build the immutable catalog."""
+    if not isinstance(data, dict) or data.get("version") != CATALOG_VERSION:
+        raise CatalogError(f"Expected a catalog with version {CATALOG_VERSION}")
+    performers = data.get("performers")
+    if not isinstance(performers, dict) or not performers:
+        raise CatalogError("The catalog lists no performers")
+    catalogs = {}
+    for name, content in performers.items():
+        if not isinstance(content, dict):
+            raise CatalogError(f"Catalog entry for '{name}' must be an object")
+        songs = _entries(content.get("songs"), name, "songs")
+        dances = _entries(content.get("dances"), name, "dances")
+        catalogs[name] = PerformerCatalog(
+            performer=name,
+            songs=songs,
+            dances=dances,
+            fallback_song=_lines(content.get("fallback_song"), f"{name} fallback song"),
+            fallback_dance=_lines(content.get("fallback_dance"), f"{name} fallback dance"),
+            song_titles=tuple(songs),
+            dance_titles=tuple(dances),
+        )
+    return Catalog(MappingProxyType(catalogs))
+
+
+def load_catalog(path: str = DEFAULT_CATALOG_PATH) -> Catalog:
+    """Read and validate a catalog file; raises CatalogError if anything is missing."""
+    try:
+        with open(path, encoding="utf-8") as catalog_file:
+            data = json.load(catalog_file, object_pairs_hook=_reject_duplicates)
+    except (OSError, json.JSONDecodeError) as e:
+        raise CatalogError(f"Can't read catalog {path}: {e}") from e
+    return parse_catalog(data)
+
+
+def open_mapped_catalog(path: str) -> Catalog:
+    """Open a catalog converted with `convert_catalog`; entries are decoded only when looked up."""
+    try:
+        catalog_file = MappedCatalogFile(path)
+    except (OSError, ValueError) as e:
+        raise CatalogError(f"Can't open mapped catalog {path}: {e}") from e
+    performers = {}
+    for name, content in catalog_file.performers.items():
+        songs = catalog_file.entries(name, "songs")
+        dances = catalog_file.entries(name, "dances")
+        performers[name] = PerformerCatalog(
+            performer=name,
+            songs=songs,
+            dances=dances,
+            fallback_song=tuple(content["fallback_song"]),
+            fallback_dance=tuple(content["fallback_dance"]),
+            song_titles=MappedTitles(songs),
+            dance_titles=MappedTitles(dances),
+        )
+    return Catalog(MappingProxyType(performers))
+
+
+def open_catalog(path: str = DEFAULT_CATALOG_PATH) -> Catalog:
+    """A JSON catalog (read and validated now) or a mapped catalog (read lazily), by file contents."""
+    if is_mapped_catalog(path):
+        return open_mapped_catalog(path)
+    return load_catalog(path)
+
+
+# A JSON Lines source has one object per line:
+# {"performer": "mickey", "kind": "song" | "dance" | "fallback_song" | "fallback_dance",
+#  "title": "...", "lines": ["...", ...]}  (no title for fallbacks)
+SOURCE_KINDS = {"song": "songs", "dance": "dances", "fallback_song": None, "fallback_dance": None}
+
+
+def _source_entries(source_path: str) -> Iterator[Tuple[str, str, Optional[str], object]]:
+    """(performer, kind, title, lines) for every entry of a JSON or JSON Lines catalog."""
+    with open(source_path, encoding="utf-8") as source:
+        if not source_path.endswith(".jsonl"):
+            data = json.load(source, object_pairs_hook=_reject_duplicates)
+            if not isinstance(data, dict) or data.get("version") != CATALOG_VERSION \
+                    or not isinstance(data.get("performers"), dict):
+                raise CatalogError(f"Expected a catalog with version {CATALOG_VERSION}")
+            for performer, content in data["performers"].items():
+                if not isinstance(content, dict):
+                    raise CatalogError(f"Catalog entry for '{performer}' must be an object")
+                for kind, section in (("song", "songs"), ("dance", "dances")):
+                    if not isinstance(content.get(section), dict):
+                        raise CatalogError(f"{performer} {section} needs at least one entry")
+                    for title, lines in content[section].items():
+                        yield performer, kind, title, lines
+                for kind in ("fallback_song", "fallback_dance"):
+                    yield performer, kind, None, content.get(kind)
+            return
+        for number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise CatalogError(f"{source_path}:{number}: {e}") from e
+            if not isinstance(entry, dict) or entry.get("kind") not in SOURCE_KINDS \
+                    or not isinstance(entry.get("performer"), str):
+                raise CatalogError(f"{source_path}:{number}: needs a performer and a kind "
+                                   f"({', '.join(SOURCE_KINDS)})")
+            yield entry["performer"], entry["kind"], entry.get("title"), entry.get("lines")
+
+
+def convert_catalog(source_path: str, target_path: str) -> int:
+    """
+    Convert a JSON catalog (like disney_catalog.json) or a JSON Lines source
+    into a mapped catalog file, validating every entry on the way. A JSON
+    Lines source is read one line at a time, so it can be far larger than
+    memory would allow as dicts; a JSON catalog is parsed whole first.
+    Returns the number of songs and dances written.
+    """
+    count = 0
+    seen: Dict[str, set] = {}
+    try:
+        with MappedCatalogWriter(target_path) as writer:
+            for performer, kind, title, lines in _source_entries(source_path):
+                section = SOURCE_KINDS[kind]
+                if section is None:
+                    writer.set_fallback(performer, kind, _lines(lines, f"{performer} {kind.replace('_', ' ')}"))
+                else:
+                    writer.add(performer, section, title, validate_entry(performer, section, title, lines))
+                    count += 1
+                seen.setdefault(performer, set()).add(section or kind)
+            for performer, parts in seen.items():
+                missing = set(SECTIONS + ("fallback_song", "fallback_dance")) - parts
+                if missing:
+                    raise CatalogError(f"{performer} has no {', '.join(sorted(missing))}")
+            if not seen:
+                raise CatalogError("The catalog lists no performers")
+    except (OSError, ValueError) as e:
+        if os.path.exists(target_path):
+            os.remove(target_path)
+        if isinstance(e, CatalogError):
+            raise
+        raise CatalogError(f"Can't convert {source_path}: {e}") from e
+    return count
+
+
+_default_catalog: Optional[Catalog] = None
+_default_catalog_lock = threading.Lock()
+
+
+def default_catalog() -> Catalog:
+    """
+    The catalog every agent shares, loaded on first use from DISNEY_CATALOG
+    (a JSON or mapped catalog) or the bundled disney_catalog.json.
+    """
+    global _default_catalog
+    with _default_catalog_lock:
+        if _default_catalog is None:
+            _default_catalog = open_catalog(os.environ.get("DISNEY_CATALOG", DEFAULT_CATALOG_PATH))
+        return _default_catalog
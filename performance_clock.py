@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Performance Clocks for the Disney Coordinator
+Pluggable pacing so performances can run in real time, faster, or instantly
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class RealTimeClock:
+    """
+    Real-time clock - performances are paced exactly as written.
+    """
+
+    def __init__(self):
+        self.mode = "real"
+        self.time_scale = 1.0
+        self._start = time.monotonic()
+
+    def now(self) -> float:
+        """Simulated seconds since the clock was created."""
+        return time.monotonic() - self._start
+
+    def sleep(self, seconds: float):
+        """Pause the performance for the given number of simulated seconds."""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def sleep_async(self, seconds: float):
+        """Pause without blocking the event loop."""
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    async def wait_until(self, when: float):
+        """Wait until simulated time reaches `when`."""
+        await self.sleep_async(when - self.now())
+
+
+class ScaledClock:
+    """
+    Scaled clock - performances run `time_scale` times faster than real time.
+
+    Simulated time still advances by the full written duration, so recorded
+    timings are identical to a real-time run.
+    """
+
+    def __init__(self, time_scale: float = 10.0):
+        if time_scale <= 0:
+            raise ValueError(f"time_scale must be positive, got {time_scale}")
+        self.mode = "scaled"
+        self.time_scale = float(time_scale)
+        self._start = time.monotonic()
+
+    def now(self) -> float:
+        """Simulated seconds since the clock was created."""
+        return (time.monotonic() - self._start) * self.time_scale
+
+    def sleep(self, seconds: float):
+        """Pause for `seconds` of simulated time (seconds / time_scale of real time)."""
+        if seconds > 0:
+            time.sleep(seconds / self.time_scale)
+
+    async def sleep_async(self, seconds: float):
+        """Pause without blocking the event loop."""
+        if seconds > 0:
+            await asyncio.sleep(seconds / self.time_scale)
+
+    async def wait_until(self, when: float):
+        """Wait until simulated time reaches `when`."""
+        await self.sleep_async(when - self.now())
+
+
+class VirtualClock:
+    """
+    Virtual clock - simulated time advances instantly without sleeping.
+
+    Ideal for tests and capacity runs: a full ensemble show completes in
+    microseconds while `now()` still reports the time it would have taken.
+
+    A blocking `sleep` moves time forward directly. Asyncio sleepers are
+    scheduled by wake-up time instead: once every task on the event loop is
+    waiting, the clock moves to the earliest wake-up time and wakes whoever
+    is due, so concurrent performances overlap in simulated time exactly as
+    they would in real time.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.mode = "virtual"
+        self.time_scale = float("inf")
+        self._now = start
+        self._lock = threading.Lock()
+        # Event loop -> heap of (wake-up time, order, future) for its sleepers,
+        # and for its waiters, which wait for a time without moving the clock
+        self._sleepers: Dict[asyncio.AbstractEventLoop, List[Tuple[float, int, asyncio.Future]]] = {}
+        self._waiters: Dict[asyncio.AbstractEventLoop, List[Tuple[float, int, asyncio.Future]]] = {}
+        self._order = itertools.count()
+        self._advancing = set()
+
+    def now(self) -> float:
+        """Current simulated time in seconds."""
+        with self._lock:
+            return self._now
+
+    def sleep(self, seconds: float):
+        """Advance simulated time without blocking."""
+        if seconds > 0:
+            with self._lock:
+                self._now += seconds
+                loops = list(self._waiters)
+            for loop in loops:
+                try:
+                    loop.call_soon_threadsafe(self._schedule_advance, loop)
+                except RuntimeError:
+                    # The loop has been closed
+                    with self._lock:
+                        self._waiters.pop(loop, None)
+
+    async def sleep_async(self, seconds: float):
+        """Wait until simulated time reaches now + seconds, without blocking the loop."""
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            heapq.heappush(self._sleepers.setdefault(loop, []), (self._now + seconds, next(self._order), future))
+        self._schedule_advance(loop)
+        await future
+
+    async def wait_until(self, when: float):
+        """
+        Wait until simulated time reaches `when`. Unlike sleep_async this
+        never moves the clock: the waiter wakes once the performances (or
+        `advance`) have brought time that far.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self._now >= when:
+                return
+            heapq.heappush(self._waiters.setdefault(loop, []), (when, next(self._order), future))
+        await future
+
+    def advance(self, seconds: float):
+        """Manually move simulated time forward."""
+        self.sleep(seconds)
+
+    def _schedule_advance(self, loop: asyncio.AbstractEventLoop):
+        with self._lock:
+            if loop in self._advancing:
+                return
+            self._advancing.add(loop)
+        loop.call_soon(self._advance, loop)
+
+    def _advance(self, loop: asyncio.AbstractEventLoop):
+        # Callbacks still queued can run at the current time (and may sleep
+        # until earlier than anyone waiting now), so go last until none are
+        if getattr(loop, "_ready", None):
+            loop.call_soon(self._advance, loop)
+            return
+        with self._lock:
+            self._advancing.discard(loop)
+            sleepers = self._sleepers.get(loop, [])
+            while sleepers and sleepers[0][2].done():
+                heapq.heappop(sleepers)
+            if sleepers:
+                self._now = max(self._now, sleepers[0][0])
+            due = self._pop_due(self._sleepers, loop) + self._pop_due(self._waiters, loop)
+            others = [other for other in self._waiters if other is not loop]
+        for future in due:
+            if not future.done():
+                future.set_result(None)
+        if sleepers:
+            self._schedule_advance(loop)
+        for other in others:
+            try:
+                other.call_soon_threadsafe(self._schedule_advance, other)
+            except RuntimeError:
+                with self._lock:
+                    self._waiters.pop(other, None)
+
+    def _pop_due(self, queues: Dict, loop: asyncio.AbstractEventLoop) -> List[asyncio.Future]:
+        """Remove and return a loop's futures due by now (called with the lock held)."""
+        queue = queues.get(loop, [])
+        due = []
+        while queue and queue[0][0] <= self._now:
+            due.append(heapq.heappop(queue)[2])
+        if not queue:
+            queues.pop(loop, None)
+        return due
+
+
+def create_clock(time_scale: Optional[float] = 1.0):
+    """
+    Create a clock for the given time scale.
+
+    1.0 (default) gives a real-time clock, any other positive value gives a
+    scaled clock, and None, 0 or infinity gives an instant virtual clock.
+    """
+    if time_scale is None or time_scale == 0 or time_scale == float("inf"):
+        return VirtualClock()
+    if time_scale == 1.0:
+        return RealTimeClock()
+    return ScaledClock(time_scale)
+
+
+def clock_from_environment(variable: str = "DISNEY_TIME_SCALE"):
+    """
+    Create a clock from an environment variable.
+
+    Accepts a number (e.g. "10", "100") or "virtual"/"instant"; unset means real time.
+    """
+    value = os.environ.get(variable, "").strip().lower()
+    if not value:
+        return RealTimeClock()
+    if value in ("virtual", "instant"):
+        return VirtualClock()
+    try:
+        return create_clock(float(value))
+    except ValueError:
+        raise ValueError(f"Invalid {variable} value '{value}': use a number or 'virtual'")
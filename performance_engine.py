@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Performance Engine for the Disney Coordinator
+Runs performance scripts in blocking mode or on an asyncio event loop
+"""
+
+import heapq
+from dataclasses import replace
+from typing import Any, AsyncIterator, Callable, Generator, Iterable, Iterator, List, Optional, Union
+from performance_clock import RealTimeClock
+from performance_events import PerformanceEvent
+from terminal_renderer import TerminalRenderer
+
+# A performance script is a generator that yields pauses (in simulated
+# seconds) and performance events, and returns the performance result.
+PerformanceScript = Generator[Union[float, PerformanceEvent], None, Any]
+
+EventListener = Callable[[PerformanceEvent], None]
+
+
+def parallel(*scripts: PerformanceScript) -> Generator[Union[float, PerformanceEvent], None, List[Any]]:
+    """
+    Run several performance scripts side by side as one script.
+
+    Each script keeps its own time cursor; the merged script always advances
+    whichever is furthest behind, so events come out in timeline order and
+    the whole takes as long as the longest script rather than their sum.
+    Returns every script's result, in the order given, once all have finished.
+    """
+    results = [None] * len(scripts)
+    now = 0.0
+    # (time the script is next due, position): ties go to the earlier script
+    due = [(0.0, index) for index in range(len(scripts))]
+    try:
+        while due:
+            at, index = heapq.heappop(due)
+            if at > now:
+                yield at - now
+                now = at
+            try:
+                step = next(scripts[index])
+                while isinstance(step, PerformanceEvent):
+                    yield step
+                    step = next(scripts[index])
+                heapq.heappush(due, (now + step, index))
+            except StopIteration as finished:
+                results[index] = finished.value
+    finally:
+        # If one script fails or the whole is abandoned, close the others too
+        for script in scripts:
+            script.close()
+    return results
+
+
+class PerformanceEngine:
+    """
+    Performance Engine - drives performance scripts with a clock.
+
+    The same script can be run blocking (`run`) or as a coroutine
+    (`run_async`), so one event loop can drive thousands of concurrent
+    performances without a thread per show. Events are timestamped with the
+    clock and delivered to every listener; by default that is a terminal
+    renderer, and an engine created with `listeners=[]` runs headless.
+    Use `stream`/`stream_async` to consume a performance's events directly.
+    """
+
+    def __init__(self, clock=None, listeners: Optional[Iterable[EventListener]] = None):
+        self.clock = clock or RealTimeClock()
+        if listeners is None:
+            listeners = [TerminalRenderer()]
+        self._listeners = tuple(listeners)
+
+    @property
+    def listeners(self) -> tuple:
+        """Currently subscribed event listeners."""
+        return self._listeners
+
+    def subscribe(self, listener: EventListener):
+        """Deliver every future event to `listener`."""
+        self._listeners = self._listeners + (listener,)
+
+    def unsubscribe(self, listener: EventListener):
+        """Stop delivering events to `listener`."""
+        self._listeners = tuple(item for item in self._listeners if item is not listener)
+
+    def _stamp(self, event: PerformanceEvent) -> PerformanceEvent:
+        return replace(event, timestamp=self.clock.now())
+
+    def _emit(self, event: PerformanceEvent):
+        event = self._stamp(event)
+        for listener in self._listeners:
+            listener(event)
+
+    def run(self, script: PerformanceScript) -> Any:
+        """Run a script to completion, blocking the calling thread on pauses."""
+        try:
+            step = next(script)
+            while True:
+                if isinstance(step, PerformanceEvent):
+                    self._emit(step)
+                else:
+                    self.clock.sleep(step)
+                step = next(script)
+        except StopIteration as finished:
+            return finished.value
+
+    async def run_async(self, script: PerformanceScript) -> Any:
+        """Run a script to completion, awaiting pauses on the event loop."""
+        try:
+            step = next(script)
+            while True:
+                if isinstance(step, PerformanceEvent):
+                    self._emit(step)
+                else:
+                    await self.clock.sleep_async(step)
+                step = next(script)
+        except StopIteration as finished:
+            return finished.value
+
+    def stream(self, script: PerformanceScript) -> Iterator[PerformanceEvent]:
+        """
+        Run a script paced by the clock, yielding its timestamped events.
+
+        Listeners are not notified; the caller consumes the events. The
+        generator returns the performance result when it finishes.
+        """
+        try:
+            step = next(script)
+            while True:
+                if isinstance(step, PerformanceEvent):
+                    yield self._stamp(step)
+                else:
+                    self.clock.sleep(step)
+                step = next(script)
+        except StopIteration as finished:
+            return finished.value
+
+    async def stream_async(self, script: PerformanceScript) -> AsyncIterator[PerformanceEvent]:
+        """Async version of `stream` for use on an event loop."""
+        for step in script:
+            if isinstance(step, PerformanceEvent):
+                yield self._stamp(step)
+            else:
+                await self.clock.sleep_async(step)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Performance Events for the Disney Coordinator
+Typed, timestamped events produced by every performance script
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PerformanceEvent:
+    """Base class for everything that happens during a performance."""
+    performer: str
+    timestamp: float = field(default=0.0, compare=False)
+
+    @property
+    def kind(self) -> str:
+        """Short event type name, e.g. 'lyric_line'."""
+        return EVENT_KINDS[type(self)]
+
+    def render(self) -> Optional[str]:
+        """Terminal text for this event, or None if it has no visible output."""
+        return None
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly representation of the event."""
+        data = asdict(self)
+        data["kind"] = self.kind
+        data["text"] = self.render()
+        return data
+
+
+@dataclass(frozen=True)
+class PerformanceStarted(PerformanceEvent):
+    """A performer starts an action (sing, dance, duet_song, ...)."""
+    action: str = ""
+    title: str = ""
+    message: str = ""
+
+    def render(self) -> Optional[str]:
+        return self.message or None
+
+
+@dataclass(frozen=True)
+class PerformanceFinished(PerformanceEvent):
+    """A performer finishes an action; `result` is the action's return value."""
+    action: str = ""
+    result: str = ""
+    message: str = ""
+
+    def render(self) -> Optional[str]:
+        return self.message or None
+
+
+@dataclass(frozen=True)
+class Narration(PerformanceEvent):
+    """A line of stage narration."""
+    message: str = ""
+
+    def render(self) -> Optional[str]:
+        return self.message
+
+
+@dataclass(frozen=True)
+class LyricLine(PerformanceEvent):
+    """A sung lyric line."""
+    line: str = ""
+    prefix: str = ""
+
+    def render(self) -> Optional[str]:
+        return f"{self.prefix} {self.line}"
+
+
+@dataclass(frozen=True)
+class DanceStep(PerformanceEvent):
+    """A single dance step."""
+    step: str = ""
+    prefix: str = ""
+
+    def render(self) -> Optional[str]:
+        return f"{self.prefix} {self.step}"
+
+
+@dataclass(frozen=True)
+class Gesture(PerformanceEvent):
+    """A wave or rest animation frame."""
+    symbol: str = ""
+
+    def render(self) -> Optional[str]:
+        return f"   {self.symbol}"
+
+
+@dataclass(frozen=True)
+class NotePlayed(PerformanceEvent):
+    """A visual note held for `ticks` tenths of a second."""
+    note: str = ""
+    symbol: str = ""
+    ticks: int = 0
+
+    def render(self) -> Optional[str]:
+        return f"🎵 {self.symbol} Playing note {self.note} {self.symbol}" + "." * self.ticks
+
+
+@dataclass(frozen=True)
+class MelodyPlayed(PerformanceEvent):
+    """A sequence of notes shown together."""
+    notes: Tuple[str, ...] = ()
+    symbols: Tuple[str, ...] = ()
+    label: str = "🎼 Playing melody:"
+
+    def render(self) -> Optional[str]:
+        return f"{self.label} " + "".join(f"{symbol} " for symbol in self.symbols)
+
+
+@dataclass(frozen=True)
+class HarmonyPlayed(PerformanceEvent):
+    """Harmony symbols played together."""
+    symbols: Tuple[str, ...] = ()
+    label: str = "🎶 Harmony:"
+    # Printed before each symbol (the animated harmony spaces them out)
+    symbol_prefix: str = ""
+
+    def render(self) -> Optional[str]:
+        label = f"{self.label} " if self.label else ""
+        return label + "".join(f"{self.symbol_prefix}{symbol} " for symbol in self.symbols)
+
+
+@dataclass(frozen=True)
+class EnergyChanged(PerformanceEvent):
+    """A performer's energy level changed."""
+    old_energy: int = 0
+    new_energy: int = 0
+
+
+EVENT_KINDS = {
+    PerformanceEvent: "event",
+    PerformanceStarted: "started",
+    PerformanceFinished: "finished",
+    Narration: "narration",
+    LyricLine: "lyric_line",
+    DanceStep: "dance_step",
+    Gesture: "gesture",
+    NotePlayed: "note_played",
+    MelodyPlayed: "melody_played",
+    HarmonyPlayed: "harmony_played",
+    EnergyChanged: "energy_changed",
+}
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Performance Job Queue for the Disney Coordinator
+Runs requested performances on a bounded pool of asyncio workers
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from job_output import current_job
+
+JobFactory = Callable[[], Awaitable]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_WORKERS = 16
+DEFAULT_QUEUE_DEPTH = 32
+DEFAULT_RETRY_AFTER = 5
+DEFAULT_JOB_HISTORY = 500
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+@dataclass
+class PerformanceJob:
+    """Performance Job - one requested performance and its outcome."""
+    id: str
+    name: str
+    state: str = QUEUED
+    submitted_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly view including queue and run durations."""
+        data = asdict(self)
+        data["wait_seconds"] = None
+        data["run_seconds"] = None
+        if self.started_at is not None:
+            data["wait_seconds"] = round(self.started_at - self.submitted_at, 3)
+            if self.finished_at is not None:
+                data["run_seconds"] = round(self.finished_at - self.started_at, 3)
+        return data
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PerformanceJobQueue:
+    """
+    Performance Job Queue - a bounded executor for performances.
+
+    Jobs are coroutine factories run by `max_workers` worker tasks on one
+    event loop in a background thread, so a burst of requests never creates
+    more than a fixed amount of concurrency. At most `max_queue_depth` jobs
+    may wait for a worker; beyond that `submit` raises `JobQueueFull`.
+
+    Every job gets an id. The last `history_size` jobs are kept so clients can
+    look up their state and result; older finished jobs are evicted first.
+    While a job runs its id is the `current_job`, so output sinks such as
+    JobOutputCapture can tell whose output they are given.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS,
+                 max_queue_depth: int = DEFAULT_QUEUE_DEPTH,
+                 retry_after: int = DEFAULT_RETRY_AFTER,
+                 history_size: int = DEFAULT_JOB_HISTORY):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.retry_after = retry_after
+        self.history_size = history_size
+
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+        self._loop = None
+        self._queue = None
+        self._thread = None
+
+    def _ensure_started(self):
+        # Called with self._lock held
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,),
+                                        name="performance-jobs", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run_loop(self, ready: threading.Event):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        for _ in range(self.max_workers):
+            self._loop.create_task(self._worker())
+        ready.set()
+        self._loop.run_forever()
+
+    def submit(self, name: str, job_factory: JobFactory) -> PerformanceJob:
+        """Queue a job; raises JobQueueFull when `max_queue_depth` jobs are already waiting."""
+        return self.submit_batch([(name, job_factory)])[0]
+
+    def submit_batch(self, items: List[Tuple[str, JobFactory]], sequential: bool = False) -> List[PerformanceJob]:
+        """
+        Queue several jobs at once: either all of them fit in the queue or
+        none is queued and JobQueueFull is raised.
+
+        Parallel jobs are picked up by free workers independently; sequential
+        jobs run one after another, in order, on a single worker. Raises
+        ValueError for an empty batch or one larger than the whole queue.
+        """
+        if not items:
+            raise ValueError("A batch needs at least one job")
+        if len(items) > self.max_queue_depth:
+            raise ValueError(f"A batch may hold at most {self.max_queue_depth} jobs, got {len(items)}")
+        now = time.time()
+        jobs = [PerformanceJob(id=uuid.uuid4().hex, name=name, submitted_at=now) for name, _ in items]
+        with self._lock:
+            if self._queued + len(jobs) > self.max_queue_depth:
+                self._rejected += len(jobs)
+                raise JobQueueFull(self.retry_after)
+            self._ensure_started()
+            self._queued += len(jobs)
+            self._submitted += len(jobs)
+            for job in jobs:
+                self._jobs[job.id] = job
+            self._evict()
+        entries = [(job, job_factory) for job, (_, job_factory) in zip(jobs, items)]
+        if sequential:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, entries)
+        else:
+            for entry in entries:
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, [entry])
+        return jobs
+
+    async def _worker(self):
+        while True:
+            # A list of jobs to run in order: one job, or a sequential batch
+            entries = await self._queue.get()
+            for job, job_factory in entries:
+                await self._run_job(job, job_factory)
+
+    async def _run_job(self, job: PerformanceJob, job_factory: JobFactory):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            job.state = RUNNING
+            job.started_at = time.time()
+        token = current_job.set(job.id)
+        try:
+            result = await job_factory()
+        except Exception as e:
+            with self._lock:
+                self._failed += 1
+                job.state = FAILED
+                job.error = f"{type(e).__name__}: {e}"
+            logger.exception("Job '%s' failed", job.name)
+        else:
+            with self._lock:
+                job.state = SUCCEEDED
+                job.result = result
+        finally:
+            current_job.reset(token)
+            with self._lock:
+                job.finished_at = time.time()
+                self._active -= 1
+                self._completed += 1
+                self._evict()
+
+    def _evict(self):
+        # Called with self._lock held; unfinished jobs are never evicted
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for job_id, job in list(self._jobs.items()):
+            if excess <= 0:
+                break
+            if job.finished:
+                del self._jobs[job_id]
+                excess -= 1
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """A job's state, timings and result, or None if unknown or evicted."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job is not None else None
+
+    def list_jobs(self, limit: int = 50) -> List[Dict]:
+        """The most recently submitted jobs, newest first."""
+        with self._lock:
+            recent = list(self._jobs.values())[-limit:] if limit > 0 else []
+            return [job.to_dict() for job in reversed(recent)]
+
+    def get_stats(self) -> Dict:
+        """Queue depth, worker utilisation and lifetime counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._queued,
+                "max_queue_depth": self.max_queue_depth,
+                "active_workers": self._active,
+                "max_workers": self.max_workers,
+                "worker_utilisation": round(self._active / self.max_workers, 3),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "jobs_stored": len(self._jobs),
+            }
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Performance Scheduler for the Disney Coordinator
+Queues performances for busy agents and starts them as soon as the agents are free
+"""
+
+import asyncio
+import contextvars
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Priority levels, highest first: an ensemble needs every agent for longest,
+# so it goes ahead of duets, and duets go ahead of solo performances
+PRIORITIES: Dict[str, int] = {"ensemble": 2, "duet": 1, "solo": 0}
+
+
+@dataclass
+class ScheduledPerformance:
+    """Scheduled Performance - one queued request and who is waiting for it."""
+    agent: str
+    action: str
+    params: Dict
+    priority: str
+    sequence: int
+    agents: Tuple[str, ...]
+    submitted_at: float
+    deadline_at: Optional[float]
+    future: asyncio.Future = field(repr=False)
+    # The caller's context (e.g. its current job), which the performance runs in
+    context: contextvars.Context = field(repr=False, default_factory=contextvars.copy_context)
+    # Wakes the scheduler at the deadline, if there is one
+    timer: Optional[asyncio.Task] = field(repr=False, default=None)
+
+    @property
+    def order(self) -> Tuple[int, int]:
+        """Queue order: higher priority first, then first come, first served."""
+        return (-PRIORITIES[self.priority], self.sequence)
+
+
+class PerformanceScheduler:
+    """
+    Performance Scheduler - waits for busy agents instead of rejecting requests.
+
+    Every request waits in the queue of each agent it needs, ordered by
+    priority (ensemble > duet > solo) and then by arrival. Whenever an agent
+    is released the queue is scanned in that order and every request whose
+    agents can all be reserved is started. A request that cannot start holds
+    its place: later requests for the same agents wait behind it even if a
+    replica happens to be free, so a waiting duet is never starved by a
+    stream of solos.
+
+    A request may carry a deadline in seconds of performance time; if its
+    agents are not free by then it never starts, and finishes with an
+    "expired" result at the deadline (a timer on the coordinator's clock
+    scans the queue then; it never moves a virtual clock). The scheduler works
+    on the event loop it was first used from; `agents_released` may be called
+    from any thread.
+    """
+
+    def __init__(self, coordinator):
+        self.coordinator = coordinator
+        self._pending: List[ScheduledPerformance] = []
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._submitted = 0
+        self._started = 0
+        self._expired = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def default_priority(self, agent: str, action: str) -> str:
+        """Priority level of a performance: "ensemble", "duet" (both agents) or "solo"."""
+        if agent == "ensemble":
+            return "ensemble"
+        if len(self.coordinator.performance_agents(agent, action)) > 1:
+            return "duet"
+        return "solo"
+
+    def validate_options(self, agent: str, action: str, priority: Optional[str] = None,
+                         deadline: Optional[float] = None) -> str:
+        """Check a request's priority and deadline; returns the priority to use."""
+        if priority is None:
+            priority = self.default_priority(agent, action)
+        if not isinstance(priority, str) or priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}', use one of: {', '.join(PRIORITIES)}")
+        if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+                                     or deadline <= 0):
+            raise ValueError("Deadline must be a positive number of seconds")
+        return priority
+
+    async def perform(self, agent: str, action: str, priority: Optional[str] = None,
+                      deadline: Optional[float] = None, **params) -> str:
+        """
+        Queue a performance and return its result once it has run.
+
+        Raises ValueError for unknown performances, parameters or priorities,
+        or a deadline that is not a positive number of seconds.
+        """
+        params = self.coordinator.validate_performance(agent, action, params)
+        priority = self.validate_options(agent, action, priority, deadline)
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._pending:
+                raise RuntimeError("The performance scheduler is in use on another event loop")
+            self._loop = loop
+
+        now = self.coordinator.clock.now()
+        request = ScheduledPerformance(
+            agent=agent, action=action, params=params, priority=priority,
+            sequence=next(self._sequence), agents=self.coordinator.performance_agents(agent, action),
+            submitted_at=now, deadline_at=None if deadline is None else now + deadline,
+            future=loop.create_future()
+        )
+        self._pending.append(request)
+        self._pending.sort(key=lambda pending: pending.order)
+        self._submitted += 1
+        self._dispatch()
+        if deadline is not None and request in self._pending:
+            request.timer = loop.create_task(self._expire_at_deadline(request))
+        try:
+            return await request.future
+        finally:
+            self._stop_timer(request)
+
+    async def _expire_at_deadline(self, request: ScheduledPerformance):
+        """Scan the queue once the request's deadline has passed, so it expires on time."""
+        clock = self.coordinator.clock
+        while request in self._pending and clock.now() < request.deadline_at:
+            # Waits for time to pass without moving a virtual clock itself
+            await clock.wait_until(request.deadline_at)
+        self._dispatch()
+
+    @staticmethod
+    def _stop_timer(request: ScheduledPerformance):
+        if request.timer is not None and request.timer is not asyncio.current_task():
+            request.timer.cancel()
+
+    def agents_released(self):
+        """Called whenever a performance releases its agents; safe from any thread."""
+        loop = self._loop
+        if loop is None or not self._pending:
+            return
+        try:
+            loop.call_soon_threadsafe(self._dispatch)
+        except RuntimeError:
+            # The loop has been closed
+            pass
+
+    def _dispatch(self):
+        """Start every queued request whose agents are free, in queue order."""
+        now = self.coordinator.clock.now()
+        blocked = set()
+        for request in list(self._pending):
+            if request.future.done():
+                # The caller stopped waiting
+                self._pending.remove(request)
+                continue
+            if request.deadline_at is not None and now >= request.deadline_at:
+                self._pending.remove(request)
+                self._expired += 1
+                request.future.set_result(
+                    f"⏰ {request.agent.title()} {request.action} expired after waiting "
+                    f"{now - request.submitted_at:.1f}s for busy agents")
+                continue
+            if blocked.intersection(request.agents):
+                # Keep each agent's queue in order behind an earlier request
+                blocked.update(request.agents)
+                continue
+            reservation = self.coordinator.reserve_performance(request.agent, request.action)
+            if reservation is None:
+                blocked.update(request.agents)
+                continue
+            self._pending.remove(request)
+            self._stop_timer(request)
+            wait = now - request.submitted_at
+            self._started += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            # The task copies the caller's context rather than whichever one released the agents
+            request.context.run(self._loop.create_task, self._run(request, reservation))
+
+    async def _run(self, request: ScheduledPerformance, reservation):
+        """Run a started request on its reserved agents and hand the result to its caller."""
+        try:
+            script = self.coordinator.reserved_performance_script(
+                request.agent, request.action, reservation, **request.params)
+            result = await self.coordinator.engine.run_async(script)
+        except Exception as e:
+            if not request.future.done():
+                request.future.set_exception(e)
+        else:
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            # Does nothing if the script already released its agents
+            reservation.release()
+            self.agents_released()
+
+    def get_stats(self) -> Dict:
+        """Queue lengths per agent and priority, and how long requests waited."""
+        # May be called from another thread while the loop edits the queue
+        waiting = [request for request in list(self._pending) if not request.future.done()]
+        by_agent = {name: 0 for name in self.coordinator.pools}
+        by_priority = {name: 0 for name in PRIORITIES}
+        for request in waiting:
+            by_priority[request.priority] += 1
+            for agent in request.agents:
+                by_agent[agent] += 1
+        return {
+            "waiting": len(waiting),
+            "waiting_by_agent": by_agent,
+            "waiting_by_priority": by_priority,
+            "submitted": self._submitted,
+            "started": self._started,
+            "expired": self._expired,
+            "average_wait_seconds": round(self._total_wait / self._started, 3) if self._started else 0.0,
+            "max_wait_seconds": round(self._max_wait, 3),
+        }
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Render Cache for the Disney Coordinator
+A bounded, thread-safe LRU cache for things that are rendered again and again
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+DEFAULT_RENDER_CACHE = 256
+
+
+class RenderCache:
+    """
+    Render Cache - keeps the most recently used rendered values.
+
+    `get_or_render` returns the cached value for a key or renders and stores
+    it; once `max_size` values are cached the least recently used one is
+    dropped. Values must be immutable, since every caller shares them.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_RENDER_CACHE):
+        if max_size < 1:
+            raise ValueError(f"A render cache needs room for at least 1 value, got {max_size}")
+        self.max_size = max_size
+        self._values: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get_or_render(self, key: Hashable, render: Callable[[], Any]) -> Any:
+        """The cached value for `key`, calling `render` to create it on a miss."""
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                self._hits += 1
+                return self._values[key]
+            self._misses += 1
+        # Rendered outside the lock; two threads missing at once both render
+        value = render()
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def clear(self):
+        """Drop every cached value (counters are kept)."""
+        with self._lock:
+            self._values.clear()
+
+    def get_stats(self) -> Dict:
+        """Size and hit, miss and eviction counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._values),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Rendered Page for the Disney Coordinator Web Server
+Keeps a page encoded once, with a gzip variant and cache validators
+"""
+
+import gzip
+import hashlib
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+
+class RenderedPage:
+    """
+    Rendered Page - the encoded bytes of a page that never changes while the
+    server runs, plus everything needed to serve it cheaply.
+
+    The gzip variant, ETag and Last-Modified are computed once, so each hit
+    only has to compare request headers and write prebuilt bytes.
+    """
+
+    def __init__(self, html: str, content_type: str = "text/html; charset=utf-8"):
+        self.content_type = content_type
+        self.body = html.encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:16]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self.last_modified = int(time.time())
+        self.last_modified_header = formatdate(self.last_modified, usegmt=True)
+
+    def is_not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """Whether a conditional GET can be answered with 304 Not Modified."""
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since
+            tags = {tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags or self.gzip_etag in tags
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified <= since
+        return False
+
+    def variant(self, accept_encoding: Optional[str]) -> Tuple[bytes, str, Optional[str]]:
+        """(body, etag, content encoding) for a client's Accept-Encoding header."""
+        if accept_encoding and accepts_encoding(accept_encoding, "gzip"):
+            return self.gzip_body, self.gzip_etag, "gzip"
+        return self.body, self.etag, None
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows `coding`: it must be listed (or
+    matched by "*") with a q-value above 0, so "gzip;q=0" refuses gzip.
+    """
+    qualities = {}
+    for item in accept_encoding.lower().split(","):
+        name, *parameters = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            key, _, value = parameter.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name] = quality
+    quality = qualities.get(coding, qualities.get("*", 0.0))
+    return quality > 0
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Search Index for the Disney Coordinator
+A full-text inverted index over song titles, lyrics and dance steps
+"""
+
+import bisect
+import heapq
+import itertools
+import logging
+import math
+import operator
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from performance_catalog import Catalog, default_catalog
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+# A word in a title counts as much as this many occurrences in the lines
+TITLE_WEIGHT = 3
+# A multi-term query expected to match up to this many documents scores them
+# all; with more, its terms' lists are read best-first until the top is known
+DIRECT_SCAN_DOCUMENTS = 5000
+# Prefix terms with more expansions than this are matched against a document's own terms
+SCAN_EXPANSIONS = 8
+
+# Words, keeping inner apostrophes ("it's", "donald's"); emoji and symbols are skipped
+TOKEN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case search terms of a piece of text."""
+    return TOKEN.findall(text.lower())
+
+
+class SearchResult(NamedTuple):
+    """One matching song or dance, best matches first."""
+    performer: str
+    kind: str
+    title: str
+    score: float
+
+
+class SearchIndex:
+    """
+    Search Index - finds songs and dances by the words in their titles and lines.
+
+    Every document (a performer's song or dance) is split into terms; the
+    index maps each term to the documents containing it, with a weight that
+    favours terms in the title and repeated terms, scaled at query time by
+    how rare the term is. A query matches documents containing all of its
+    terms; a term ending in `*` matches every term with that prefix.
+
+    Queries only read as much as the top results need: posting lists are
+    also kept in weight order (built on first use, then updated in place),
+    so a single-term or prefix query reads its best documents first and
+    stops at `limit`. A query of several terms scores only the documents
+    in the intersection of its terms' postings or, when that would be most
+    of the catalog, walks all terms' lists best-first until nothing unread
+    can make the top results.
+    `add` can be called at any time; adding a title again replaces it.
+    Documents with equal scores come back in no particular order.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Document id -> (performer, kind, title) and its term ids
+        self._documents: List[Tuple[str, str, str]] = []
+        self._document_terms: List[Tuple[int, ...]] = []
+        self._document_ids: Dict[Tuple[str, str, str], int] = {}
+        # Term id -> term; terms in sorted order for prefix queries (new terms are sorted in on the next one)
+        self._term_ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._sorted_terms: List[str] = []
+        self._unsorted_terms: List[str] = []
+        # Term id -> {document id: weight}, and an upper bound of those weights
+        self._postings: List[Dict[int, float]] = []
+        self._max_weights: List[float] = []
+        # Term id -> (-weight, document id), best first, for terms that have been queried
+        self._ranked: Dict[int, List[Tuple[float, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, performer: str, kind: str, title: str, lines: Iterable[str]):
+        """Index a song or dance, or re-index it if the title is already known."""
+        counts = Counter()
+        for term in tokenize(title):
+            counts[term] += TITLE_WEIGHT
+        for line in lines:
+            counts.update(tokenize(line))
+        key = (performer, kind, title)
+        with self._lock:
+            document = self._document_ids.get(key)
+            if document is None:
+                document = self._document_ids[key] = len(self._documents)
+                self._documents.append(key)
+                self._document_terms.append(())
+            else:
+                for term_id in self._document_terms[document]:
+                    weight = self._postings[term_id].pop(document)
+                    ranked = self._ranked.get(term_id)
+                    if ranked is not None:
+                        del ranked[bisect.bisect_left(ranked, (-weight, document))]
+            term_ids = []
+            for term, count in counts.items():
+                term_id = self._term_ids.get(term)
+                if term_id is None:
+                    term_id = self._term_ids[term] = len(self._terms)
+                    self._terms.append(term)
+                    self._unsorted_terms.append(term)
+                    self._postings.append({})
+                    self._max_weights.append(0.0)
+                weight = 1 + math.log(count)
+                self._postings[term_id][document] = weight
+                if weight > self._max_weights[term_id]:
+                    self._max_weights[term_id] = weight
+                ranked = self._ranked.get(term_id)
+                if ranked is not None:
+                    bisect.insort(ranked, (-weight, document))
+                term_ids.append(term_id)
+            self._document_terms[document] = tuple(term_ids)
+
+    def _idf(self, term_id: int) -> float:
+        return math.log(1 + len(self._documents) / len(self._postings[term_id]))
+
+    def _expand(self, term: str, prefix: bool) -> List[int]:
+        """Ids of the indexed terms a query term matches (those with documents)."""
+        if not prefix:
+            term_id = self._term_ids.get(term)
+            matches = [] if term_id is None else [term_id]
+        else:
+            if self._unsorted_terms:
+                self._sorted_terms.extend(self._unsorted_terms)
+                self._sorted_terms.sort()
+                self._unsorted_terms.clear()
+            matches = []
+            start = bisect.bisect_left(self._sorted_terms, term)
+            for index in range(start, len(self._sorted_terms)):
+                if not self._sorted_terms[index].startswith(term):
+                    break
+                matches.append(self._term_ids[self._sorted_terms[index]])
+        return [term_id for term_id in matches if self._postings[term_id]]
+
+    def _ranked_documents(self, term_id: int) -> List[Tuple[float, int]]:
+        ranked = self._ranked.get(term_id)
+        if ranked is None:
+            ranked = self._ranked[term_id] = sorted(
+                (-weight, document) for document, weight in self._postings[term_id].items())
+        return ranked
+
+    def _bound(self, term_ids: List[int], idfs: Dict[int, float]) -> float:
+        """The highest score any document can get for a query term."""
+        return max(self._max_weights[term_id] * idfs[term_id] for term_id in term_ids)
+
+    def _stream(self, term_ids: List[int], idfs: Dict[int, float]) -> Iterator[Tuple[float, int]]:
+        """
+        (score, document) for every document matching a query term, best
+        first. A term's list is only opened once its best weight could beat
+        what the open lists have left, so a prefix matching thousands of
+        terms opens few of them.
+        """
+        closed = [(-self._max_weights[term_id] * idfs[term_id], term_id) for term_id in term_ids]
+        heapq.heapify(closed)
+        # (-score, document, term id, position in the term's ranked list)
+        heads: List[Tuple[float, int, int, int]] = []
+        seen: Set[int] = set()
+        while True:
+            while closed and (not heads or closed[0][0] <= heads[0][0]):
+                _, term_id = heapq.heappop(closed)
+                negative_weight, document = self._ranked_documents(term_id)[0]
+                heapq.heappush(heads, (negative_weight * idfs[term_id], document, term_id, 0))
+            if not heads:
+                return
+            negative_score, document, term_id, position = heads[0]
+            ranked = self._ranked[term_id]
+            if position + 1 < len(ranked):
+                negative_weight, following = ranked[position + 1]
+                heapq.heapreplace(heads, (negative_weight * idfs[term_id], following, term_id, position + 1))
+            else:
+                heapq.heappop(heads)
+            # A document matching several expansions scores by the best one, which comes first
+            if document not in seen:
+                seen.add(document)
+                yield -negative_score, document
+
+    def _score(self, term_ids: List[int], document: int, idfs: Dict[int, float]) -> Optional[float]:
+        """A document's score for one query term, or None if it doesn't contain it."""
+        if len(term_ids) <= SCAN_EXPANSIONS:
+            weights = [(self._postings[term_id].get(document), term_id) for term_id in term_ids]
+        else:
+            wanted = set(term_ids)
+            weights = [(self._postings[term_id][document], term_id)
+                       for term_id in self._document_terms[document] if term_id in wanted]
+        return max((weight * idfs[term_id] for weight, term_id in weights if weight is not None), default=None)
+
+    def _top_all(self, matchers: List[List[int]], idfs: Dict[int, float],
+                 limit: int) -> List[Tuple[float, int]]:
+        """Best documents containing every query term."""
+        sizes = sorted((sum(len(self._postings[term_id]) for term_id in term_ids), index)
+                       for index, term_ids in enumerate(matchers))
+        matchers = [matchers[index] for _, index in sizes]
+        # How many documents would contain every term if terms occurred independently
+        expected = sizes[0][0]
+        for size, _ in sizes[1:]:
+            expected *= size / len(self._documents)
+        if expected > DIRECT_SCAN_DOCUMENTS:
+            return self._top_all_best_first(matchers, idfs, limit)
+
+        # Documents containing every plain term (and a prefix's expansions when it's the rarest)
+        exact = [self._postings[term_ids[0]].keys() for term_ids in matchers if len(term_ids) == 1]
+        if len(matchers[0]) > 1:
+            exact.insert(0, set().union(*(self._postings[term_id] for term_id in matchers[0])))
+        candidates = exact[0]
+        for keys in exact[1:]:
+            candidates = candidates & keys
+
+        # Score them a term at a time; a plain term is a weight lookup per document
+        documents = list(candidates)
+        scores = [0.0] * len(documents)
+        for term_ids in matchers:
+            if len(term_ids) == 1:
+                postings, idf = self._postings[term_ids[0]], idfs[term_ids[0]]
+                weights = map(postings.__getitem__, documents)
+                scores = [score + idf * weight for score, weight in zip(scores, weights)]
+            else:
+                best = [self._score(term_ids, document, idfs) for document in documents]
+                kept = [index for index, value in enumerate(best) if value is not None]
+                documents = [documents[index] for index in kept]
+                scores = [scores[index] + best[index] for index in kept]
+        top = heapq.nlargest(limit, zip(scores, map(operator.neg, documents)))
+        return [(score, -negative) for score, negative in top]
+
+    def _top_all_best_first(self, matchers: List[List[int]], idfs: Dict[int, float],
+                            limit: int) -> List[Tuple[float, int]]:
+        """
+        Best documents containing every query term when many do: read every
+        term's documents best-first, in turn, and stop once the best score an
+        unread document could have can't make the top.
+        """
+        top: List[Tuple[float, int]] = []
+        streams = [self._stream(term_ids, idfs) for term_ids in matchers]
+        frontier = [self._bound(term_ids, idfs) for term_ids in matchers]
+        seen: Set[int] = set()
+        while not (len(top) == limit and top[0][0] >= sum(frontier)):
+            for position, stream in enumerate(streams):
+                item = next(stream, None)
+                if item is None:
+                    # Every document containing all terms is in this stream, and has been seen
+                    return [(score, -negative) for score, negative in sorted(top, reverse=True)]
+                frontier[position], document = item
+                if document in seen:
+                    continue
+                seen.add(document)
+                score = item[0]
+                for term_ids in matchers[:position] + matchers[position + 1:]:
+                    other = self._score(term_ids, document, idfs)
+                    if other is None:
+                        break
+                    score += other
+                else:
+                    if len(top) < limit:
+                        heapq.heappush(top, (score, -document))
+                    elif (score, -document) > top[0]:
+                        heapq.heapreplace(top, (score, -document))
+        return [(score, -negative) for score, negative in sorted(top, reverse=True)]
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[SearchResult]:
+        """
+        Songs and dances matching every term of `query`, best first. A term
+        ending in `*` (e.g. "quack*") is a prefix query.
+        """
+        limit = max(0, min(limit, MAX_SEARCH_LIMIT))
+        query_terms = []
+        for word in query.split():
+            terms = tokenize(word)
+            for index, term in enumerate(terms):
+                query_terms.append((term, word.endswith("*") and index == len(terms) - 1))
+        if not query_terms or not limit:
+            return []
+        with self._lock:
+            matchers = [self._expand(term, prefix) for term, prefix in dict.fromkeys(query_terms)]
+            if not all(matchers):
+                return []
+            idfs = {term_id: self._idf(term_id) for term_ids in matchers for term_id in term_ids}
+            if len(matchers) == 1:
+                top = list(itertools.islice(self._stream(matchers[0], idfs), limit))
+            else:
+                top = self._top_all(matchers, idfs, limit)
+            return [SearchResult(*self._documents[document], round(score, 3)) for score, document in top]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "terms": len(self._terms),
+                "postings": sum(len(postings) for postings in self._postings),
+                "ranked_terms": len(self._ranked),
+            }
+
+
+def index_catalog(catalog: Catalog, index: Optional[SearchIndex] = None) -> SearchIndex:
+    """Add every song and dance of a catalog to `index` (a new one by default)."""
+    index = index if index is not None else SearchIndex()
+    for name, performer in catalog.performers.items():
+        for title, lines in performer.songs.items():
+            index.add(name, "song", title, lines)
+        for title, lines in performer.dances.items():
+            index.add(name, "dance", title, lines)
+    return index
+
+
+class SearchIndexError(RuntimeError):
+    """Building the index of the shared catalog failed."""
+
+
+logger = logging.getLogger(__name__)
+
+_default_index: Optional[SearchIndex] = None
+_default_index_lock = threading.Lock()
+_default_index_builder: Optional[threading.Thread] = None
+_default_index_builder_lock = threading.Lock()
+_default_index_error: Optional[Exception] = None
+
+
+def default_search_index() -> SearchIndex:
+    """An index of the shared catalog, built the first time anyone searches."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = index_catalog(default_catalog())
+        return _default_index
+
+
+def _build_default_index():
+    global _default_index_builder, _default_index_error
+    try:
+        default_search_index()
+    except Exception as error:
+        logger.exception("Building the search index failed")
+        with _default_index_builder_lock:
+            _default_index_error = error
+            _default_index_builder = None
+
+
+def default_search_index_if_ready() -> Optional[SearchIndex]:
+    """
+    The index of the shared catalog, or None while it is being built. The
+    first call starts building it in a background thread, so a large
+    catalog never holds up the caller (a server starts it at startup).
+
+    If a build failed, the next call raises SearchIndexError with the
+    reason, and the call after that starts building it again.
+    """
+    global _default_index_builder, _default_index_error
+    if _default_index is None:
+        with _default_index_builder_lock:
+            if _default_index_error is not None:
+                error, _default_index_error = _default_index_error, None
+                raise SearchIndexError(f"Building the search index failed: {error}") from error
+            if _default_index_builder is None:
+                _default_index_builder = threading.Thread(target=_build_default_index,
+                                                          name="search-index", daemon=True)
+                _default_index_builder.start()
+    return _default_index
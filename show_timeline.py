@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Show Timelines for the Disney Coordinator
+Compiles performances ahead of time into flat timelines and plays them back
+"""
+
+import bisect
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional, Tuple
+from performance_engine import PerformanceScript
+from performance_events import PerformanceEvent
+from render_cache import RenderCache
+
+DEFAULT_TIMELINE_CACHE = 64
+
+# Longest pause a playback takes without checking for pause, seek or speed changes
+PLAYBACK_TICK = 0.1
+
+
+class TimelineEntry(NamedTuple):
+    """One event of a compiled show: when it happens, on which track, and what."""
+    offset: float
+    track: str
+    event: PerformanceEvent
+
+
+@dataclass(frozen=True)
+class Timeline:
+    """
+    Timeline - a performance compiled into a flat, immutable list of events.
+
+    Lyrics, random choices and strings are all settled at compile time, and
+    the exact length of the show is known before it starts. A timeline can
+    be played any number of times, at any speed, from any point.
+    """
+    entries: Tuple[TimelineEntry, ...]
+    duration: float
+    result: Any = None
+    # The (agent, action) compiled, so playing the show books the same agents
+    performance: Optional[Tuple[str, str]] = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def tracks(self) -> Tuple[str, ...]:
+        """Performers with events in the show, in order of first appearance."""
+        return tuple(dict.fromkeys(entry.track for entry in self.entries))
+
+    @cached_property
+    def offsets(self) -> Tuple[float, ...]:
+        """Offset of every entry, in order."""
+        return tuple(entry.offset for entry in self.entries)
+
+    def index_at(self, offset: float) -> int:
+        """Index of the first entry at or after `offset` seconds."""
+        return bisect.bisect_left(self.offsets, offset)
+
+
+def compile_timeline(script: PerformanceScript) -> Timeline:
+    """Run a performance script without pausing and record where each event falls."""
+    entries: List[TimelineEntry] = []
+    offset = 0.0
+    try:
+        step = next(script)
+        while True:
+            if isinstance(step, PerformanceEvent):
+                entries.append(TimelineEntry(offset, step.performer, step))
+            else:
+                offset += step
+            step = next(script)
+    except StopIteration as finished:
+        return Timeline(tuple(entries), offset, finished.value)
+
+
+class TimelineCache(RenderCache):
+    """
+    Timeline Cache - keeps the most recently used compiled shows.
+
+    Compiling is cheap but not free; shows that are requested again and again
+    are compiled once. The least recently used timeline is dropped when the
+    cache is full.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TIMELINE_CACHE):
+        super().__init__(max_size)
+
+    def get_or_compile(self, key: Hashable, compile_show: Callable[[], Timeline]) -> Timeline:
+        """The cached timeline for `key`, compiling it with `compile_show` on a miss."""
+        return self.get_or_render(key, compile_show)
+
+
+class TimelinePlayback:
+    """
+    Timeline Playback - plays a compiled timeline and can be steered while it runs.
+
+    `script()` is an ordinary performance script, so a playback runs on a
+    PerformanceEngine like any live performance (blocking, asyncio or
+    streamed). From any thread, `pause`/`resume` hold and continue the show,
+    `seek` jumps to an offset (events before it are skipped, seeking back
+    replays them) and `set_speed` plays faster or slower. Controls take
+    effect within PLAYBACK_TICK seconds of show time.
+    """
+
+    def __init__(self, timeline: Timeline, speed: float = 1.0):
+        self.timeline = timeline
+        self._lock = threading.Lock()
+        self._position = 0.0
+        self._index = 0
+        self._speed = 1.0
+        self._paused = False
+        # Bumped by seek(), so a pause that was in progress can't undo the jump
+        self._generation = 0
+        self.set_speed(speed)
+
+    @property
+    def position(self) -> float:
+        """Current offset into the show, in seconds."""
+        with self._lock:
+            return self._position
+
+    @property
+    def speed(self) -> float:
+        with self._lock:
+            return self._speed
+
+    @property
+    def is_paused(self) -> bool:
+        with self._lock:
+            return self._paused
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return self._index >= len(self.timeline) and self._position >= self.timeline.duration
+
+    def pause(self):
+        """Hold the show at its current position."""
+        with self._lock:
+            self._paused = True
+
+    def resume(self):
+        """Continue a paused show."""
+        with self._lock:
+            self._paused = False
+
+    def seek(self, offset: float):
+        """Jump to `offset` seconds into the show (clamped to its length)."""
+        offset = min(max(0.0, offset), self.timeline.duration)
+        with self._lock:
+            self._position = offset
+            self._index = self.timeline.index_at(offset)
+            self._generation += 1
+
+    def set_speed(self, speed: float):
+        """Play at `speed` times normal pace (e.g. 2.0 for double speed)."""
+        if speed <= 0:
+            raise ValueError(f"Playback speed must be positive, got {speed}")
+        with self._lock:
+            self._speed = speed
+
+    def script(self) -> PerformanceScript:
+        """Performance script that plays the timeline; returns the compiled result."""
+        entries = self.timeline.entries
+        while True:
+            with self._lock:
+                if self._paused:
+                    due, gap = [], None
+                else:
+                    # Everything scheduled up to the current position is due now
+                    start = self._index
+                    while self._index < len(entries) and entries[self._index].offset <= self._position:
+                        self._index += 1
+                    due = entries[start:self._index]
+                    if self._index < len(entries):
+                        next_offset = entries[self._index].offset
+                    else:
+                        next_offset = self.timeline.duration
+                    gap = min(PLAYBACK_TICK, next_offset - self._position)
+                    if not due and gap <= 0:
+                        return self.timeline.result
+                speed, generation = self._speed, self._generation
+            for entry in due:
+                yield entry.event
+            if gap is None:
+                # Paused: wait in real pacing, not scaled by speed
+                yield PLAYBACK_TICK
+            elif gap > 0:
+                yield gap / speed
+                with self._lock:
+                    if self._generation == generation:
+                        self._position += gap
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Terminal Renderer for the Disney Coordinator
+Turns performance events into the familiar visual audio output
+"""
+
+import atexit
+import sys
+import threading
+import time
+import weakref
+from typing import Dict
+from performance_events import PerformanceEvent
+
+DEFAULT_FPS = 30
+# Characters buffered before a frame is written early
+DEFAULT_FRAME_BUFFER = 64 * 1024
+# Seconds a frame writer's thread waits for lines before it exits
+WRITER_IDLE_SECONDS = 1.0
+
+
+class TerminalRenderer:
+    """
+    Terminal Renderer - writes one line per visible event.
+
+    Writes go to `stream`, or to whatever `sys.stdout` is at the time of the
+    event when no stream is given.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, event: PerformanceEvent):
+        text = event.render()
+        if text is not None:
+            stream = self.stream or sys.stdout
+            stream.write(text + "\n")
+
+
+class FrameWriter:
+    """
+    Frame Writer - the single writer for one output stream.
+
+    Lines are collected into a frame and written with one `write` and one
+    `flush`, at most `fps` times a second, or straight away once the frame
+    holds `max_buffer` characters. Lines are never split, so performances
+    rendering to the same stream from different threads can't interleave
+    mid-line. A background thread writes frames that nothing else flushes,
+    and exits once no lines have arrived for WRITER_IDLE_SECONDS.
+    """
+
+    def __init__(self, stream, fps: float = DEFAULT_FPS, max_buffer: int = DEFAULT_FRAME_BUFFER):
+        if fps <= 0:
+            raise ValueError(f"Frame rate must be positive, got {fps}")
+        self.stream = stream
+        self.fps = fps
+        self.max_buffer = max_buffer
+        self._lines = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._frames = 0
+        self._lines_written = 0
+        self._chars_written = 0
+
+    def write_line(self, text: str):
+        """Add a line to the current frame."""
+        with self._condition:
+            self._lines.append(text + "\n")
+            self._size += len(text) + 1
+            if self._size >= self.max_buffer:
+                self._write_frame()
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self):
+        """Write the current frame now."""
+        with self._condition:
+            self._write_frame()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(lambda: self._lines, timeout=WRITER_IDLE_SECONDS):
+                    # Idle: stop, so the thread doesn't keep the writer alive
+                    self._thread = None
+                    return
+            # Let the rest of the frame arrive before writing it
+            time.sleep(1 / self.fps)
+            with self._condition:
+                self._write_frame()
+
+    def _write_frame(self):
+        # Called with the condition held, so frames go out whole and in order
+        if not self._lines:
+            return
+        frame = "".join(self._lines)
+        self._lines_written += len(self._lines)
+        self._lines.clear()
+        self._size = 0
+        try:
+            self.stream.write(frame)
+            self.stream.flush()
+        except (OSError, ValueError, ReferenceError):
+            # The stream was closed, collected or the reader went away; drop the frame
+            return
+        self._frames += 1
+        self._chars_written += len(frame)
+
+    def get_stats(self) -> Dict:
+        """Frames written, and the lines and characters they carried."""
+        with self._condition:
+            return {
+                "fps": self.fps,
+                "frames": self._frames,
+                "lines": self._lines_written,
+                "chars": self._chars_written,
+                "buffered_lines": len(self._lines),
+            }
+
+
+# Keyed on the stream itself and holding it only weakly, so a writer goes
+# away with its stream instead of living for the rest of the process
+_frame_writers: "weakref.WeakKeyDictionary[object, FrameWriter]" = weakref.WeakKeyDictionary()
+_frame_writers_lock = threading.Lock()
+
+
+def frame_writer_for(stream, fps: float = DEFAULT_FPS, max_buffer: int = DEFAULT_FRAME_BUFFER) -> FrameWriter:
+    """The one FrameWriter for `stream`, created with these settings the first time it is asked for."""
+    with _frame_writers_lock:
+        writer = _frame_writers.get(stream)
+        if writer is None:
+            writer = _frame_writers[stream] = FrameWriter(weakref.proxy(stream), fps, max_buffer)
+        return writer
+
+
+@atexit.register
+def flush_frame_writers():
+    """Write out every buffered frame (also run at interpreter exit)."""
+    with _frame_writers_lock:
+        writers = list(_frame_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+class FrameBufferedRenderer:
+    """
+    Frame-Buffered Renderer - the TerminalRenderer's output, written in frames.
+
+    Renders the same lines as TerminalRenderer but hands them to the shared
+    FrameWriter of the output stream, so a busy server makes a few writes a
+    second instead of one per note. Like TerminalRenderer it writes to
+    `sys.stdout` as it is at the time of the event when no stream is given.
+    """
+
+    def __init__(self, stream=None, fps: float = DEFAULT_FPS, max_buffer: int = DEFAULT_FRAME_BUFFER):
+        self.stream = stream
+        self.fps = fps
+        self.max_buffer = max_buffer
+
+    @property
+    def writer(self) -> FrameWriter:
+        """The frame writer for the current output stream."""
+        return frame_writer_for(self.stream or sys.stdout, self.fps, self.max_buffer)
+
+    def __call__(self, event: PerformanceEvent):
+        text = event.render()
+        if text is not None:
+            self.writer.write_line(text)
+
+    def flush(self):
+        """Write any buffered lines now."""
+        self.writer.flush()
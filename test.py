@@ -59,6 +59,1362 @@ def test_coordinator():
         print(f"❌ Coordinator test failed: {e}")
         return False
 
+def test_virtual_clock():
+    """Test that a virtual clock runs shows instantly with unchanged timings."""
+    print("\n🧪 Testing virtual clock pacing...")
+    
+    try:
+        import asyncio
+        import io
+        import time
+        from contextlib import redirect_stdout
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from mickey_mouse_agent import MickeyMouseAgent
+        from performance_clock import VirtualClock
+        
+        clock = VirtualClock()
+        coordinator = DisneyCoordinatorVisualAudio(clock=clock)
+        
+        started = time.monotonic()
+        result = coordinator.ask_mickey_to_perform("sing", song_name="It's a Small World")
+        elapsed = time.monotonic() - started
+        
+        if "finished singing" not in result:
+            print(f"❌ Unexpected result: {result}")
+            return False
+        if elapsed > 1.0:
+            print(f"❌ Virtual clock slept for real: {elapsed:.2f}s")
+            return False
+        # Intro + 5 lyric lines at 0.8s + outro, exactly as in real time
+        if abs(clock.now() - 5.8) > 1e-6:
+            print(f"❌ Unexpected simulated duration: {clock.now():.2f}s")
+            return False
+        
+        # Concurrent performances overlap in simulated time: a wave and three
+        # 4.0s songs end with the songs, not at the sum of all of them
+        concurrent = VirtualClock()
+        agents = [MickeyMouseAgent(clock=concurrent) for _ in range(4)]
+        
+        async def sing_all():
+            await asyncio.gather(agents[0].wave_async(),
+                                 *(agent.sing_async("It's a Small World") for agent in agents[1:]))
+        
+        with redirect_stdout(io.StringIO()):
+            asyncio.run(sing_all())
+        if abs(concurrent.now() - 4.0) > 1e-6:
+            print(f"❌ 4 concurrent performances took {concurrent.now():.2f}s of simulated time, expected 4.0s")
+            return False
+        
+        print(f"✅ Simulated {clock.now():.1f}s of singing in {elapsed * 1000:.1f}ms")
+        return True
+    except Exception as e:
+        print(f"❌ Virtual clock test failed: {e}")
+        return False
+
+def test_async_performances():
+    """Test that one event loop drives many concurrent performances."""
+    print("\n🧪 Testing asyncio performances...")
+    
+    try:
+        import asyncio
+        import io
+        import time
+        from contextlib import redirect_stdout
+        from mickey_mouse_agent import MickeyMouseAgent
+        from performance_clock import ScaledClock
+        
+        clock = ScaledClock(100)
+        agents = [MickeyMouseAgent(clock=clock) for _ in range(200)]
+        
+        async def perform_all():
+            return await asyncio.gather(*(agent.sing_async("Heigh-Ho") for agent in agents))
+        
+        started = time.monotonic()
+        with redirect_stdout(io.StringIO()):
+            results = asyncio.run(perform_all())
+        elapsed = time.monotonic() - started
+        
+        if not all("finished singing" in result for result in results):
+            print("❌ Not every agent finished singing")
+            return False
+        # 200 serial songs would take 200 * 3.2s / 100 = 6.4s of real time
+        if elapsed > 2.0:
+            print(f"❌ Performances did not run concurrently: {elapsed:.2f}s")
+            return False
+        
+        print(f"✅ {len(results)} concurrent songs on one event loop in {elapsed:.2f}s")
+        return True
+    except Exception as e:
+        print(f"❌ Async performance test failed: {e}")
+        return False
+
+def test_event_stream():
+    """Test that performances produce a typed, timestamped event stream."""
+    print("\n🧪 Testing performance event stream...")
+    
+    try:
+        import io
+        from contextlib import redirect_stdout
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            events = list(coordinator.engine.stream(coordinator.perform_duet_song_script("The Disney Duet")))
+        
+        kinds = {event.kind for event in events}
+        for expected in ("started", "finished", "note_played", "lyric_line", "harmony_played"):
+            if expected not in kinds:
+                print(f"❌ Missing '{expected}' events")
+                return False
+        timestamps = [event.timestamp for event in events]
+        if timestamps != sorted(timestamps):
+            print("❌ Event timestamps are not in order")
+            return False
+        if output.getvalue():
+            print("❌ Headless stream wrote to stdout")
+            return False
+        if "finished their duet" not in events[-1].result:
+            print(f"❌ Unexpected final event: {events[-1]}")
+            return False
+        
+        # The animated harmony spaces its symbols out as "  🎵 " each
+        harmony = [event for event in coordinator.engine.stream(coordinator._play_visual_harmony(["C", "E"]))
+                   if event.kind == "harmony_played"][0]
+        if harmony.render() != "".join(f"  {symbol} " for symbol in harmony.symbols):
+            print(f"❌ Harmony rendered as {harmony.render()!r}")
+            return False
+        
+        print(f"✅ {len(events)} events over {timestamps[-1]:.1f}s of simulated time")
+        return True
+    except Exception as e:
+        print(f"❌ Event stream test failed: {e}")
+        return False
+
+def test_event_broadcaster():
+    """Test event replay after an id, the bounded history and waiting for new events."""
+    print("\n🧪 Testing event broadcaster...")
+    
+    try:
+        import json
+        import threading
+        import time
+        from event_broadcaster import PerformanceEventBroadcaster
+        from event_log import EventLog
+        from performance_events import Narration
+        
+        broadcaster = PerformanceEventBroadcaster(history_size=5)
+        for number in range(3):
+            broadcaster(Narration("Mickey Mouse", message=f"line {number}"))
+        newer = broadcaster.events_since(1)
+        if [entry_id for entry_id, _ in newer] != [2, 3] or json.loads(newer[0][1])["message"] != "line 1":
+            print(f"❌ events_since(1) returned {newer}")
+            return False
+        if broadcaster.events_since(broadcaster.last_id):
+            print("❌ Events returned for an up-to-date viewer")
+            return False
+        
+        # Only the newest history_size events are kept for resuming viewers
+        for number in range(3, 8):
+            broadcaster(Narration("Mickey Mouse", message=f"line {number}"))
+        kept = [entry_id for entry_id, _ in broadcaster.events_since(0)]
+        if kept != [4, 5, 6, 7, 8]:
+            print(f"❌ Bounded history kept {kept}")
+            return False
+        
+        started = time.perf_counter()
+        if broadcaster.wait_for_events(broadcaster.last_id, timeout=0.1) or time.perf_counter() - started < 0.09:
+            print("❌ wait_for_events didn't time out without new events")
+            return False
+        
+        publisher = threading.Timer(0.05, broadcaster, [Narration("Donald Duck", message="quack")])
+        publisher.start()
+        started = time.perf_counter()
+        woken = broadcaster.wait_for_events(8, timeout=5)
+        publisher.join()
+        if [entry_id for entry_id, _ in woken] != [9] or time.perf_counter() - started > 2:
+            print(f"❌ wait_for_events didn't wake on publish: {woken}")
+            return False
+        
+        # A viewer with an id from before a restart gets the new events
+        publisher = threading.Timer(0.05, broadcaster, [Narration("Donald Duck", message="quack")])
+        publisher.start()
+        resumed = broadcaster.wait_for_events(999999, timeout=2)
+        publisher.join()
+        if [entry_id for entry_id, _ in resumed] != [10]:
+            print(f"❌ Unknown Last-Event-ID got {resumed}")
+            return False
+        
+        # Fed by an event log, stream ids are the log's sequence numbers
+        log, shared = EventLog(), PerformanceEventBroadcaster()
+        log(Narration("Mickey Mouse", message="before the viewer"))
+        log.subscribe(shared.publish)
+        for number in range(3):
+            log(Narration("Mickey Mouse", message=f"line {number}"))
+        cursor = log.read(limit=2)["next"]
+        if [entry_id for entry_id, _ in shared.events_since(cursor - 1)] != [cursor] or shared.last_id != log.last_seq:
+            print(f"❌ Stream ids don't follow the log: {shared.events_since(0)}")
+            return False
+        
+        print("✅ Broadcaster replays, bounds its history and wakes viewers")
+        return True
+    except Exception as e:
+        print(f"❌ Event broadcaster test failed: {e}")
+        return False
+
+def test_performance_routing():
+    """Test the generic perform() entry point and its parameter validation."""
+    print("\n🧪 Testing generic performances...")
+    
+    try:
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+        result = coordinator.perform("donald", "wave", style="big")
+        if "Donald Duck" not in result:
+            print(f"❌ Unexpected wave result: {result}")
+            return False
+        result = coordinator.perform("duet", "song", song_name="The Disney Duet")
+        if "finished their duet 'The Disney Duet'" not in result:
+            print(f"❌ Unexpected duet result: {result}")
+            return False
+        for agent, action, params in (("goofy", "sing", {}), ("mickey", "fly", {}),
+                                      ("mickey", "sing", {"tempo": "fast"}), ("duet", "song", {"song_name": 3})):
+            try:
+                coordinator.validate_performance(agent, action, params)
+                print(f"❌ {agent} {action} {params} was accepted")
+                return False
+            except ValueError:
+                pass
+        
+        print("✅ Generic performances and validation work")
+        return True
+    except Exception as e:
+        print(f"❌ Generic performance test failed: {e}")
+        return False
+
+def test_agent_pools():
+    """Test that replica pools run performances of one character side by side."""
+    print("\n🧪 Testing agent replica pools...")
+    
+    try:
+        import asyncio
+        import io
+        from contextlib import redirect_stdout
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import ScaledClock, VirtualClock
+        
+        with redirect_stdout(io.StringIO()):
+            coordinator = DisneyCoordinatorVisualAudio(clock=ScaledClock(100), listeners=[], replicas={"mickey": 3})
+        
+        async def perform_all():
+            return await asyncio.gather(*(coordinator.perform_async("mickey", "sing") for _ in range(4)))
+        
+        results = asyncio.run(perform_all())
+        finished = [result for result in results if "finished singing" in result]
+        singers = {result.split(" finished")[0] for result in finished}
+        if len(finished) != 3 or len(singers) != 3 or "already performing" not in results[3]:
+            print(f"❌ Unexpected pool results: {results}")
+            return False
+        status = coordinator.get_agent_status()
+        if status["mickey"]["replicas"] != "3" or status["donald"]["replicas"] != "1":
+            print(f"❌ Unexpected pool status: {status}")
+            return False
+        if status["mickey"]["busy_rejections"] != "1":
+            print(f"❌ Busy rejection not counted: {status}")
+            return False
+        
+        # A duet on one pair of replicas flags only that pair
+        pairs = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[], replicas=2)
+        first = pairs.engine.stream(pairs.perform_duet_song_script())
+        while not pairs.is_coordinating:
+            next(first)
+        flagged = [replica.name for pool in pairs.pools.values() for replica in pool if replica.reservation.coordinating]
+        second = pairs.perform("duet", "song")
+        if flagged != ["Mickey Mouse", "Donald Duck"] or "#2" not in second \
+                or not pairs.mickey.reservation.coordinating:
+            print(f"❌ Coordination flags crossed pairs: {flagged}, {second}")
+            return False
+        for _ in first:
+            pass
+        if pairs.is_coordinating:
+            print("❌ Coordination flag left set after the duet")
+            return False
+        
+        print(f"✅ {len(finished)} Mickeys sang at once: {', '.join(sorted(singers))}")
+        return True
+    except Exception as e:
+        print(f"❌ Agent pool test failed: {e}")
+        return False
+
+def test_agent_reservations():
+    """Test that agents are booked atomically and always released."""
+    print("\n🧪 Testing agent reservations...")
+    
+    try:
+        import threading
+        from mickey_mouse_agent import MickeyMouseAgent
+        from donald_duck_agent import DonaldDuckAgent
+        from agent_reservation import try_reserve_all
+        from performance_clock import VirtualClock
+        from performance_engine import PerformanceEngine
+        
+        engine = PerformanceEngine(VirtualClock(), listeners=[])
+        mickey = MickeyMouseAgent(engine=engine)
+        donald = DonaldDuckAgent(engine=engine)
+        
+        # Many threads race for the same agent; exactly one may win
+        winners = []
+        start = threading.Barrier(16)
+        def race():
+            start.wait()
+            reservation = mickey.reservation.try_reserve("sing")
+            if reservation is not None:
+                winners.append(reservation)
+        threads = [threading.Thread(target=race) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if len(winners) != 1:
+            print(f"❌ {len(winners)} threads reserved Mickey at once")
+            return False
+        
+        # A duet can't book Donald while Mickey is taken, and holds nothing afterwards
+        if try_reserve_all([mickey.reservation, donald.reservation], "duet_song") is not None or donald.is_performing:
+            print("❌ Partial multi-agent reservation")
+            return False
+        winners[0].release()
+        
+        # A performance that fails half way still releases the agent
+        script = mickey.sing_script("It's a Small World")
+        next(script)
+        try:
+            script.throw(RuntimeError("stage lights failed"))
+        except RuntimeError:
+            pass
+        if mickey.is_performing:
+            print("❌ Failed performance left Mickey reserved")
+            return False
+        
+        print(f"✅ Reservations are atomic and released: {mickey.reservation.get_stats()}")
+        return True
+    except Exception as e:
+        print(f"❌ Agent reservation test failed: {e}")
+        return False
+
+def test_energy_policy():
+    """Test that work goes to rested replicas and tired agents rest automatically."""
+    print("\n🧪 Testing energy policy...")
+    
+    try:
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[], replicas=2)
+        first = coordinator.perform("mickey", "dance")
+        second = coordinator.perform("mickey", "dance")
+        if "Mickey Mouse #2" in first or "Mickey Mouse #2" not in second:
+            print(f"❌ Second dance didn't go to the more rested replica: {second}")
+            return False
+        
+        # Both Mickeys are tired: one rests before dancing instead of running dry
+        for replica in coordinator.pools["mickey"]:
+            replica.energy = 10
+        coordinator.perform("mickey", "dance")
+        report = coordinator.get_energy_report()
+        if report["rests"] != 1 or min(report["energy"].values()) < 0:
+            print(f"❌ Tired agent didn't rest first: {report}")
+            return False
+        if report["shows"] != 3 or report["shows_per_hour"] <= 0:
+            print(f"❌ Shows not reported: {report}")
+            return False
+        
+        # A show's span includes the rest it needed first
+        rested = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+        rested.mickey.energy = 10
+        rested.perform("mickey", "dance")
+        spanned = rested.get_energy_report()
+        if spanned["rest_seconds"] <= 0 or abs(spanned["performance_seconds"] - rested.clock.now()) > 1e-3:
+            print(f"❌ Rest before the first show left out of its span: {spanned}")
+            return False
+        
+        print(f"✅ Energy policy rested tired agents: {report['shows_per_hour']} shows/hour")
+        return True
+    except Exception as e:
+        print(f"❌ Energy policy test failed: {e}")
+        return False
+
+def test_performance_scheduler():
+    """Test that busy agents queue requests by priority instead of rejecting them."""
+    print("\n🧪 Testing performance scheduler...")
+    
+    try:
+        import asyncio
+        import threading
+        import time
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+        finished = []
+        
+        async def request(agent, action, **options):
+            result = await coordinator.perform_queued_async(agent, action, **options)
+            finished.append(f"{agent} {action}")
+            return result
+        
+        async def scenario():
+            # Mickey is busy singing while the other requests arrive
+            singing = asyncio.ensure_future(request("mickey", "sing"))
+            await asyncio.sleep(0)
+            waiting = [
+                asyncio.ensure_future(request("mickey", "wave")),
+                asyncio.ensure_future(request("duet", "song")),
+                asyncio.ensure_future(request("ensemble", "show")),
+                asyncio.ensure_future(request("mickey", "dance", deadline=1.0)),
+            ]
+            return await asyncio.gather(singing, *waiting)
+        
+        results = asyncio.run(scenario())
+        if any("already performing" in result for result in results):
+            print("❌ A queued request was rejected")
+            return False
+        # The dance expires at its deadline, while Mickey is still singing
+        if finished != ["mickey dance", "mickey sing", "ensemble show", "duet song", "mickey wave"]:
+            print(f"❌ Requests ran out of priority order: {finished}")
+            return False
+        if "expired" not in results[4]:
+            print(f"❌ Request ran after its deadline: {results[4]}")
+            return False
+        
+        # Waiting for a deadline never moves the virtual clock: Mickey is
+        # booked by a blocking performance that takes 2s of simulated time
+        clock = coordinator.clock
+        booked = coordinator.reserve_performance("mickey", "sing")
+        
+        def blocking_performance():
+            time.sleep(0.1)
+            clock.sleep(2.0)
+            booked.release()
+            coordinator.scheduler.agents_released()
+        
+        async def wave_with_deadline():
+            thread = threading.Thread(target=blocking_performance)
+            thread.start()
+            result = await coordinator.perform_queued_async("mickey", "wave", deadline=5.0)
+            thread.join()
+            return result
+        
+        started = clock.now()
+        result = asyncio.run(wave_with_deadline())
+        # 2s booked, then the 3s wave
+        if "expired" in result or abs(clock.now() - started - 5.0) > 1e-6:
+            print(f"❌ Deadline timer moved the clock: {result} after {clock.now() - started:.1f}s")
+            return False
+        
+        try:
+            coordinator.scheduler.validate_options("mickey", "sing", priority="urgent")
+            print("❌ Unknown priority accepted")
+            return False
+        except ValueError:
+            pass
+        
+        print(f"✅ Scheduler ran requests in priority order: {coordinator.scheduler.get_stats()}")
+        return True
+    except Exception as e:
+        print(f"❌ Performance scheduler test failed: {e}")
+        return False
+
+def test_parallel_ensemble():
+    """Test that parallel scripts take as long as the longest one and the ensemble gets shorter."""
+    print("\n🧪 Testing parallel ensemble...")
+    
+    try:
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        from performance_engine import PerformanceEngine, parallel
+        from performance_events import Narration
+        
+        def track(name, pauses):
+            for pause in pauses:
+                yield Narration(name, message=name)
+                yield pause
+            return name
+        
+        events = []
+        engine = PerformanceEngine(VirtualClock(), listeners=[events.append])
+        results = engine.run(parallel(track("a", [1.0, 1.0, 1.0]), track("b", [1.5, 0.5])))
+        if results != ["a", "b"] or engine.clock.now() != 3.0:
+            print(f"❌ Parallel tracks took {engine.clock.now()}s: {results}")
+            return False
+        if [event.timestamp for event in events] != sorted(event.timestamp for event in events):
+            print("❌ Parallel events out of timeline order")
+            return False
+        
+        durations = {}
+        for mode in ("serial", "parallel"):
+            coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+            result = coordinator.perform_ensemble_show(mode)
+            if "completed their ensemble show" not in result:
+                print(f"❌ {mode} ensemble failed: {result}")
+                return False
+            durations[mode] = coordinator.clock.now()
+        if durations["parallel"] >= durations["serial"]:
+            print(f"❌ Parallel ensemble was not shorter: {durations}")
+            return False
+        
+        print(f"✅ Ensemble show: {durations['serial']:.1f}s serial, {durations['parallel']:.1f}s parallel")
+        return True
+    except Exception as e:
+        print(f"❌ Parallel ensemble test failed: {e}")
+        return False
+
+def test_show_timeline():
+    """Test that compiled shows match live ones and play back with speed and seek."""
+    print("\n🧪 Testing show timelines...")
+    
+    try:
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        from show_timeline import TimelinePlayback
+        
+        live = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+        live_result = live.perform("duet", "song", song_name="The Disney Duet")
+        
+        events = []
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[events.append])
+        timeline = coordinator.compile_show("duet", "song", song_name="The Disney Duet")
+        if abs(timeline.duration - live.clock.now()) > 1e-9 or timeline.result != live_result:
+            print(f"❌ Compiled show differs from live: {timeline.duration}s vs {live.clock.now()}s")
+            return False
+        if events or coordinator.mickey.is_performing:
+            print("❌ Compiling performed the show")
+            return False
+        if coordinator.compile_show("duet", "song", song_name="The Disney Duet") is not timeline:
+            print("❌ Compiled show was not cached")
+            return False
+        
+        # Double speed halves the running time and plays every event
+        if coordinator.play_show(timeline, speed=2.0) != live_result or len(events) != len(timeline):
+            print("❌ Playback lost events")
+            return False
+        if abs(coordinator.clock.now() - timeline.duration / 2) > 1e-6:
+            print(f"❌ Double speed took {coordinator.clock.now()}s")
+            return False
+        
+        # Compiling leaves the live coordinator's state alone, even mid-duet
+        duet = coordinator.engine.stream(coordinator.perform_duet_dance_script())
+        while not coordinator.is_coordinating:
+            next(duet)
+        coordinator.compile_show("duet", "song")
+        if not coordinator.is_coordinating:
+            print("❌ Compiling a show changed the live coordinator's state")
+            return False
+        for _ in duet:
+            pass
+        
+        # Playing books the show's agents, and waits its turn like a live show
+        booked = []
+        coordinator.engine.subscribe(lambda event: booked.append(coordinator.mickey.is_performing))
+        coordinator.play_show(timeline, speed=4.0)
+        held = coordinator.reserve_performance("mickey", "wave")
+        busy = coordinator.play_show(timeline)
+        held.release()
+        if not all(booked[:len(timeline)]) or "already performing" not in busy:
+            print(f"❌ Playback didn't book its agents: {busy}")
+            return False
+        
+        # Seeking past the middle skips the first half of the events
+        playback = TimelinePlayback(timeline)
+        playback.seek(timeline.duration / 2)
+        events.clear()
+        coordinator.engine.run(playback.script())
+        if not playback.finished or len(events) != len(timeline) - timeline.index_at(timeline.duration / 2):
+            print(f"❌ Seek played {len(events)} events")
+            return False
+        
+        print(f"✅ Compiled {len(timeline)} events, {timeline.duration:.1f}s: {coordinator.timelines.get_stats()}")
+        return True
+    except Exception as e:
+        print(f"❌ Show timeline test failed: {e}")
+        return False
+
+def test_render_cache():
+    """Test that melody frames are cached, bounded and identical to fresh renders."""
+    print("\n🧪 Testing render cache...")
+    
+    try:
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        from render_cache import RenderCache
+        
+        cache = RenderCache(max_size=2)
+        for key in ("a", "b", "a", "c"):
+            cache.get_or_render(key, lambda: key.upper())
+        stats = cache.get_stats()
+        if (stats["hits"], stats["misses"], stats["evictions"]) != (1, 3, 1) or len(cache) != 2:
+            print(f"❌ Unexpected cache counters: {stats}")
+            return False
+        if cache.get_or_render("a", lambda: "fresh") != "A":
+            print("❌ Recently used entry was evicted")
+            return False
+        
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+        melody = coordinator.disney_melodies["friendship"]
+        first = list(coordinator._play_visual_melody(melody, 0.4))
+        second = list(coordinator._play_visual_melody(melody, 0.4))
+        if first != second or first != list(coordinator._render_melody(melody, 0.4)):
+            print("❌ Cached melody differs from a fresh render")
+            return False
+        if coordinator.frames.get_stats()["hits"] < 1:
+            print("❌ Replayed melody was not served from the cache")
+            return False
+        
+        print(f"✅ Render cache stats: {coordinator.frames.get_stats()}")
+        return True
+    except Exception as e:
+        print(f"❌ Render cache test failed: {e}")
+        return False
+
+def test_frame_renderer():
+    """Test that buffered output matches line-by-line output in far fewer writes."""
+    print("\n🧪 Testing frame-buffered renderer...")
+    
+    try:
+        import io
+        import random
+        import time
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        from terminal_renderer import TerminalRenderer, FrameBufferedRenderer
+        
+        class CountingStream(io.StringIO):
+            writes = 0
+            def write(self, text):
+                self.writes += 1
+                return super().write(text)
+        
+        outputs = []
+        for renderer_class in (TerminalRenderer, FrameBufferedRenderer):
+            random.seed(7)
+            stream = CountingStream()
+            renderer = renderer_class(stream)
+            coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[renderer])
+            coordinator.perform("duet", "song")
+            outputs.append(stream)
+        
+        # The frame writer's own thread writes the frame shortly afterwards
+        deadline = time.time() + 2
+        while outputs[1].writes == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        line_by_line, buffered = outputs
+        if buffered.getvalue() != line_by_line.getvalue():
+            print("❌ Buffered output differs from line-by-line output")
+            return False
+        if buffered.writes >= line_by_line.writes:
+            print(f"❌ Buffering didn't save writes: {buffered.writes} vs {line_by_line.writes}")
+            return False
+        
+        # A writer goes away with its stream, and its thread once it is idle
+        import gc
+        import weakref
+        import terminal_renderer
+        stream = io.StringIO()
+        writer = terminal_renderer.frame_writer_for(stream)
+        writer.write_line("🎵 la la la")
+        writer.flush()
+        writer_ref = weakref.ref(writer)
+        del stream, writer
+        gc.collect()
+        deadline = time.time() + terminal_renderer.WRITER_IDLE_SECONDS + 2
+        while writer_ref() is not None and time.time() < deadline:
+            time.sleep(0.05)
+        if writer_ref() is not None or len(terminal_renderer._frame_writers) > 1:
+            print(f"❌ Frame writers outlived their streams: {len(terminal_renderer._frame_writers)} cached")
+            return False
+        
+        print(f"✅ Same output in {buffered.writes} write(s) instead of {line_by_line.writes}")
+        return True
+    except Exception as e:
+        print(f"❌ Frame renderer test failed: {e}")
+        return False
+
+def test_output_sinks():
+    """Test the null, ring buffer and rotating file output sinks."""
+    print("\n🧪 Testing output sinks...")
+    
+    try:
+        import io
+        import os
+        import random
+        import tempfile
+        from contextlib import redirect_stdout
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from mickey_mouse_agent import MickeyMouseAgent
+        from performance_clock import VirtualClock
+        from output_sinks import NullSink, OutputSink, RingBufferSink, RotatingFileSink, sink_from_spec
+        from terminal_renderer import TerminalRenderer
+        
+        random.seed(3)
+        ring = RingBufferSink(5)
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), output=ring)
+        coordinator.perform("duet", "song")
+        if len(ring.lines()) != 5 or ring.get_stats()["written"] <= 5:
+            print(f"❌ Ring buffer kept the wrong lines: {ring.get_stats()}")
+            return False
+        
+        solo = RingBufferSink()
+        agent = MickeyMouseAgent(clock=VirtualClock(), output=solo)
+        agent.wave()
+        if not any("Mickey" in line for line in solo.lines()):
+            print("❌ Agent output didn't reach its sink")
+            return False
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "show.log")
+            coordinator.set_output(RotatingFileSink(path, max_bytes=400, backup_count=2))
+            coordinator.perform("duet", "song")
+            rotations = coordinator.get_output_stats()["rotations"]
+            coordinator.set_output(NullSink())
+            sizes = [os.path.getsize(p) for p in (path, path + ".1", path + ".2")]
+            if rotations < 2 or os.path.exists(path + ".3") or max(sizes) > 400:
+                print(f"❌ Log file didn't rotate as expected: {rotations} rotations, sizes {sizes}")
+                return False
+        
+        # A coordinator that started with the terminal renderer goes fully
+        # headless, and creating one prints nothing
+        output = io.StringIO()
+        with redirect_stdout(output):
+            default = DisneyCoordinatorVisualAudio(clock=VirtualClock())
+        if output.getvalue():
+            print(f"❌ Creating a coordinator printed {output.getvalue()!r}")
+            return False
+        default.set_output(NullSink())
+        if any(isinstance(listener, TerminalRenderer) for listener in default.engine.listeners):
+            print(f"❌ Terminal renderer still subscribed: {default.engine.listeners}")
+            return False
+        
+        try:
+            sink_from_spec("speakers")
+            print("❌ Unknown output accepted")
+            return False
+        except ValueError:
+            pass
+        
+        # A sink must say where its lines go
+        class Incomplete(OutputSink):
+            pass
+        try:
+            Incomplete()
+            print("❌ Sink without write_line accepted")
+            return False
+        except TypeError:
+            pass
+        
+        print(f"✅ Sinks working (ring kept {len(ring.lines())} lines, log rotated {rotations} times)")
+        return True
+    except Exception as e:
+        print(f"❌ Output sink test failed: {e}")
+        return False
+
+def test_job_queue():
+    """Test that the job queue records results and sheds load when full."""
+    print("\n🧪 Testing performance job queue...")
+    
+    try:
+        import asyncio
+        import io
+        import logging
+        import time
+        from contextlib import redirect_stdout
+        from performance_jobs import PerformanceJobQueue, JobQueueFull
+        
+        release = asyncio.Event()
+        
+        async def blocked():
+            await release.wait()
+            return "released"
+        
+        async def quick():
+            return "done"
+        
+        jobs = PerformanceJobQueue(max_workers=1, max_queue_depth=1, history_size=2)
+        first = jobs.submit("blocked", blocked)
+        time.sleep(0.1)
+        jobs.submit("quick", quick)
+        try:
+            jobs.submit("rejected", quick)
+            print("❌ Full queue accepted a job")
+            return False
+        except JobQueueFull:
+            pass
+        
+        jobs._loop.call_soon_threadsafe(release.set)
+        deadline = time.time() + 2
+        while jobs.get_stats()["completed"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        
+        job = jobs.get_job(first.id)
+        if job is None or job["state"] != "succeeded" or job["result"] != "released":
+            print(f"❌ Unexpected job record: {job}")
+            return False
+        jobs.submit("quick", quick)
+        time.sleep(0.1)
+        if jobs.get_job(first.id) is not None or len(jobs.list_jobs()) != 2:
+            print("❌ Finished jobs were not evicted")
+            return False
+        
+        # A failing job is recorded and logged, not printed
+        async def broken():
+            raise RuntimeError("tripped over a cable")
+        
+        logger = logging.getLogger("performance_jobs")
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            output = io.StringIO()
+            with redirect_stdout(output):
+                failed = jobs.submit("broken", broken)
+                deadline = time.time() + 2
+                while jobs.get_job(failed.id)["state"] != "failed" and time.time() < deadline:
+                    time.sleep(0.01)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+        if output.getvalue() or len(records) != 1 or records[0].exc_info is None \
+                or "tripped over a cable" not in jobs.get_job(failed.id)["error"]:
+            print(f"❌ Failed job was not logged: {output.getvalue()!r}, {records}")
+            return False
+        
+        print(f"✅ Job queue stats: {jobs.get_stats()}")
+        return True
+    except Exception as e:
+        print(f"❌ Job queue test failed: {e}")
+        return False
+
+def test_job_batches():
+    """Test that batches are queued all or nothing and sequential batches keep their order."""
+    print("\n🧪 Testing job batches...")
+    
+    try:
+        import asyncio
+        import io
+        import logging
+        import time
+        from contextlib import redirect_stdout
+        from performance_jobs import PerformanceJobQueue, JobQueueFull
+        
+        order = []
+        
+        def step(name, pause):
+            async def run():
+                await asyncio.sleep(pause)
+                order.append(name)
+                return name
+            return run
+        
+        jobs = PerformanceJobQueue(max_workers=4, max_queue_depth=3)
+        try:
+            jobs.submit_batch([(f"job {i}", step(i, 0)) for i in range(4)])
+            print("❌ Oversized batch accepted")
+            return False
+        except ValueError:
+            pass
+        
+        # Later items are quicker, so only a sequential batch finishes in order
+        batch = jobs.submit_batch([("slow", step("slow", 0.1)), ("quick", step("quick", 0))], sequential=True)
+        try:
+            # "quick" is still waiting behind "slow", so three more don't fit
+            jobs.submit_batch([(name, step(name, 0)) for name in ("a", "b", "c")])
+            print("❌ Batch overflowing the queue was partly accepted")
+            return False
+        except JobQueueFull:
+            pass
+        
+        deadline = time.time() + 2
+        while jobs.get_stats()["completed"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        if order != ["slow", "quick"] or [jobs.get_job(job.id)["state"] for job in batch] != ["succeeded"] * 2:
+            print(f"❌ Sequential batch ran out of order: {order}")
+            return False
+        if jobs.get_stats()["submitted"] != 2:
+            print(f"❌ Rejected batch left jobs behind: {jobs.get_stats()}")
+            return False
+        
+        print(f"✅ Batches queued atomically: {jobs.get_stats()}")
+        return True
+    except Exception as e:
+        print(f"❌ Job batch test failed: {e}")
+        return False
+
+def test_job_output():
+    """Test that each job's output is captured on its own, capped and evicted."""
+    print("\n🧪 Testing per-job output capture...")
+    
+    try:
+        import time
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        from performance_jobs import PerformanceJobQueue
+        from job_output import JobOutputCapture
+        
+        capture = JobOutputCapture()
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), output=capture)
+        jobs = PerformanceJobQueue(max_workers=4)
+        # The second Mickey job waits for the first and is started when Mickey is released
+        submitted = [
+            ("Mickey", jobs.submit("mickey wave", lambda: coordinator.perform_queued_async("mickey", "wave"))),
+            ("Donald", jobs.submit("donald wave", lambda: coordinator.perform_queued_async("donald", "wave"))),
+            ("Mickey", jobs.submit("mickey again", lambda: coordinator.perform_queued_async("mickey", "wave"))),
+        ]
+        deadline = time.time() + 5
+        while jobs.get_stats()["completed"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        for performer, job in submitted:
+            output = capture.get_output(job.id)
+            other = "Donald" if performer == "Mickey" else "Mickey"
+            if output is None or not any(performer in line for line in output["lines"]) \
+                    or any(other in line for line in output["lines"]):
+                print(f"❌ {job.name} output mixed up or missing: {output}")
+                return False
+        
+        now = [0.0]
+        small = JobOutputCapture(max_bytes_per_job=50, max_total_bytes=100, max_age=60, clock=lambda: now[0])
+        for line in range(10):
+            small.write_line(f"line {line}", job_id="a")
+        output = small.get_output("a")
+        if not output["truncated"] or "truncated" not in output["lines"][-1] or output["bytes"] > 50:
+            print(f"❌ Job output not capped: {output}")
+            return False
+        small.write_line("x" * 40, job_id="b")
+        small.write_line("y" * 40, job_id="c")
+        if small.get_output("a") is not None or small.get_output("c") is None:
+            print("❌ Memory budget didn't evict the oldest job")
+            return False
+        now[0] = 61
+        if small.get_output("b") is not None:
+            print("❌ Old job output not evicted")
+            return False
+        
+        print(f"✅ Job output captured per job: {capture.get_stats()}")
+        return True
+    except Exception as e:
+        print(f"❌ Job output test failed: {e}")
+        return False
+
+def test_event_log():
+    """Test that the event log keeps numbered events and reads from a cursor."""
+    print("\n🧪 Testing event log...")
+    
+    try:
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        from event_log import EventLog
+        
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+        coordinator.perform("mickey", "wave")
+        latest = coordinator.event_log.last_seq
+        page = coordinator.get_logs(since=0, limit=5)
+        if [entry["seq"] for entry in page["entries"]] != [1, 2, 3, 4, 5] or page["next"] != 5 \
+                or not page["has_more"]:
+            print(f"❌ First page wrong: {page}")
+            return False
+        rest = coordinator.get_logs(since=page["next"], limit=1000)
+        if rest["next"] != latest or rest["has_more"] or len(rest["entries"]) != latest - 5:
+            print(f"❌ Tail read wrong: next {rest['next']}, latest {latest}")
+            return False
+        if coordinator.get_logs(since=latest)["entries"]:
+            print("❌ Caught-up reader got old entries")
+            return False
+        
+        log = EventLog(capacity=3)
+        small = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[])
+        small.engine.subscribe(log)
+        small.perform("donald", "wave")
+        behind = log.read(since=0)
+        if len(behind["entries"]) != 3 or behind["missed"] != log.last_seq - 3 \
+                or behind["entries"][-1]["seq"] != log.last_seq:
+            print(f"❌ Ring buffer didn't keep the newest events: {behind}")
+            return False
+        if log.read(since=10 ** 6)["next"] != log.last_seq:
+            print("❌ Cursor beyond the log wasn't pulled back")
+            return False
+        
+        print(f"✅ Event log working ({latest} events, read in pages by cursor)")
+        return True
+    except Exception as e:
+        print(f"❌ Event log test failed: {e}")
+        return False
+
+def test_catalog():
+    """Test that the catalog is validated, loaded once and shared by every agent."""
+    print("\n🧪 Testing performance catalog...")
+    
+    try:
+        import os
+        import tempfile
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        from performance_catalog import CatalogError, default_catalog, load_catalog, parse_catalog
+        
+        catalog = default_catalog()
+        for name, performer in catalog.performers.items():
+            for title in performer.song_titles:
+                if performer.lyrics(title) is performer.fallback_song:
+                    print(f"❌ {name} song '{title}' has no lyrics")
+                    return False
+            for title in performer.dance_titles:
+                if performer.steps(title) is performer.fallback_dance:
+                    print(f"❌ {name} dance '{title}' has no steps")
+                    return False
+        
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock(), listeners=[], replicas=3)
+        replicas = list(coordinator.pools["mickey"])
+        if not all(replica.songs is replicas[0].songs for replica in replicas) \
+                or replicas[0]._get_song_lyrics("Heigh-Ho") is not catalog.performer("mickey").lyrics("Heigh-Ho"):
+            print("❌ Agents don't share the catalog")
+            return False
+        
+        song = {"Song": ["A line"]}
+        broken = [
+            {"version": 1, "performers": {"mickey": {"songs": {"Empty": []}, "dances": song,
+                                                     "fallback_song": ["x"], "fallback_dance": ["x"]}}},
+            {"version": 1, "performers": {"duet": {"songs": song, "dances": song,
+                                                   "fallback_song": ["x", "y"], "fallback_dance": ["x"]}}},
+            {"version": 1, "performers": {"mickey": {"songs": song, "dances": song}}},
+        ]
+        for data in broken:
+            try:
+                parse_catalog(data)
+                print(f"❌ Invalid catalog accepted: {data}")
+                return False
+            except CatalogError:
+                pass
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.json")
+            with open(path, "w") as catalog_file:
+                catalog_file.write('{"version": 1, "performers": {"mickey": {"songs": {"A": ["x"], "A": ["y"]}}}}')
+            try:
+                load_catalog(path)
+                print("❌ Duplicate titles accepted")
+                return False
+            except CatalogError:
+                pass
+        
+        print(f"✅ Catalog loaded once with {len(catalog)} songs and dances, all with content")
+        return True
+    except Exception as e:
+        print(f"❌ Catalog test failed: {e}")
+        return False
+
+def test_mapped_catalog():
+    """Test converting the catalog to the mapped format and reading it lazily."""
+    print("\n🧪 Testing mapped catalog...")
+    
+    try:
+        import gc
+        import json
+        import os
+        import tempfile
+        import warnings
+        from performance_catalog import CatalogError, convert_catalog, default_catalog, open_catalog, DEFAULT_CATALOG_PATH
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.dcat")
+            count = convert_catalog(DEFAULT_CATALOG_PATH, path)
+            mapped, loaded = open_catalog(path), default_catalog()
+            for name, performer in loaded.performers.items():
+                other = mapped.performer(name)
+                if list(other.song_titles) != list(performer.song_titles) \
+                        or any(other.lyrics(title) != performer.lyrics(title) for title in performer.song_titles) \
+                        or any(other.steps(title) != performer.steps(title) for title in performer.dance_titles) \
+                        or other.lyrics("No Such Song") != performer.fallback_song:
+                    print(f"❌ Mapped catalog differs for {name}")
+                    return False
+            if count != len(loaded) or len(mapped) != len(loaded):
+                print(f"❌ Converted {count} entries, expected {len(loaded)}")
+                return False
+            
+            # JSON Lines sources: a duplicate title and a missing fallback are both rejected
+            source = os.path.join(directory, "catalog.jsonl")
+            entries = [{"performer": "mickey", "kind": kind, "title": "Song", "lines": ["la"]}
+                       for kind in ("song", "dance", "song")]
+            entries += [{"performer": "mickey", "kind": kind, "lines": ["la"]}
+                        for kind in ("fallback_song", "fallback_dance")]
+            for broken in (entries, entries[1:-1]):
+                with open(source, "w") as source_file:
+                    source_file.write("\n".join(json.dumps(entry) for entry in broken))
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter("always", ResourceWarning)
+                    try:
+                        convert_catalog(source, path)
+                        print(f"❌ Invalid source converted: {broken}")
+                        return False
+                    except CatalogError:
+                        pass
+                    gc.collect()
+                if any(issubclass(warning.category, ResourceWarning) for warning in caught):
+                    print("❌ A rejected conversion left the target file open")
+                    return False
+        
+        print(f"✅ Mapped catalog matches the JSON catalog ({count} entries)")
+        return True
+    except Exception as e:
+        print(f"❌ Mapped catalog test failed: {e}")
+        return False
+
+def test_search_index():
+    """Test ranking, prefix and multi-term queries and incremental updates of the search index."""
+    print("\n🧪 Testing search index...")
+    
+    try:
+        from disney_coordinator import DisneyCoordinatorVisualAudio
+        from performance_clock import VirtualClock
+        from search_index import SearchIndex, default_search_index, default_search_index_if_ready
+        
+        # The first non-blocking call starts the build; it is ready once built
+        default_search_index_if_ready()
+        index = default_search_index()
+        coordinator = DisneyCoordinatorVisualAudio(clock=VirtualClock())
+        if default_search_index_if_ready() is not index \
+                or coordinator.search_catalog("quack*", 3, wait=False) != index.search("quack*", 3):
+            print("❌ Built index is not served without waiting")
+            return False
+        top = index.search("quack*", 3)
+        if [result.title for result in top][:1] != ["Quack Quack Quack"] or len(top) != 3:
+            print(f"❌ Unexpected prefix results: {top}")
+            return False
+        both = index.search("mickey donald")
+        if not both or any(result.performer != "duet" for result in both) \
+                or both[0].title != "Mickey and Donald's Friendship Song":
+            print(f"❌ Unexpected results for every term: {both}")
+            return False
+        if index.search("quack nosuchword") or index.search("") or index.search("quack", 0):
+            print("❌ Queries that can't match returned results")
+            return False
+        
+        # Enough documents sharing both words to take the best-first path
+        index = SearchIndex()
+        for number in range(6000):
+            index.add("mickey", "song", f"Song {number}", ["la la", "hey"] + ["hey"] * (number % 5))
+        index.add("mickey", "song", "La Hey", ["la hey", "la hey"])
+        scores = [result.score for result in index.search("la hey")]
+        if index.search("la hey")[0].title != "La Hey" or scores != sorted(scores, reverse=True) or len(scores) != 10:
+            print(f"❌ Unexpected best-first results: {index.search('la hey')}")
+            return False
+        
+        # Adding a title again replaces what was indexed for it
+        index.add("mickey", "song", "La Hey", ["brand new words"])
+        if index.search("brand")[0].title != "La Hey" or index.search("la hey")[0].title == "La Hey" \
+                or len(index) != 6001:
+            print("❌ Re-indexed entry was not replaced")
+            return False
+        
+        # A failed background build is logged, reported once, then retried
+        import logging
+        import search_index
+        from unittest import mock
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        search_index.logger.addHandler(handler)
+        saved = search_index._default_index, search_index._default_index_builder
+        search_index._default_index = search_index._default_index_builder = None
+        try:
+            with mock.patch.object(search_index, "default_catalog", side_effect=OSError("catalog unreadable")):
+                default_search_index_if_ready()
+                search_index._default_index_builder.join()
+            try:
+                default_search_index_if_ready()
+                print("❌ Failed index build was not reported")
+                return False
+            except search_index.SearchIndexError as error:
+                if "catalog unreadable" not in str(error) or not any(record.exc_info for record in records):
+                    print(f"❌ Index build failure not logged or reported: {error}")
+                    return False
+            default_search_index_if_ready()
+            search_index._default_index_builder.join()
+            if default_search_index_if_ready() is None:
+                print("❌ Index build was not retried after a failure")
+                return False
+        finally:
+            search_index.logger.removeHandler(handler)
+            search_index._default_index, search_index._default_index_builder = saved
+        
+        print(f"✅ Search index ranks and updates ({index.get_stats()['terms']} terms)")
+        return True
+    except Exception as e:
+        print(f"❌ Search index test failed: {e}")
+        return False
+
+def test_agent_population():
+    """Test the array-backed population and the slotted agents."""
+    print("\n🧪 Testing agent population...")
+    
+    try:
+        import random
+        from agent_population import AgentPopulation
+        from donald_duck_agent import DonaldDuckAgent
+        from mickey_mouse_agent import MickeyMouseAgent
+        from output_sinks import NullSink
+        from performance_clock import VirtualClock
+        
+        population = AgentPopulation()
+        mickeys, donalds = population.add("mickey", 600), population.add("donald", 400)
+        member = population.member(mickeys[5])
+        if len(population) != 1000 or population.nbytes() != 5000 or member.mood != "happy" \
+                or population.member(donalds[0]).name != "Donald Duck #601" \
+                or member.songs is not MickeyMouseAgent().songs:
+            print("❌ Population does not hold its characters compactly")
+            return False
+        
+        # Booking works like a reservation, and energy changes like the agents'
+        if not population.try_start(mickeys[5], "dance") or population.try_start(mickeys[5], "sing") \
+                or member.energy != 85 or member.action != "dance" or population.conflicts != 1:
+            print(f"❌ Unexpected booking state: {member.get_status()}")
+            return False
+        population.finish(mickeys[5])
+        member.energy = 10
+        started = population.tick(random.Random(1))
+        stats = population.get_stats()
+        if started != 1000 or member.action != "rest" or member.energy != 40 or stats["busy"] != 1000:
+            print(f"❌ Unexpected tick result: {stats}")
+            return False
+        if population.tick() != 0 or population.get_stats()["busy"]:
+            print("❌ Busy characters did not finish on the next tick")
+            return False
+        
+        # The same actions leave a character and a full agent with the same energy
+        calls = {"sing": "sing", "wave": "wave", "dance": "dance", "show": "perform_show", "rest": "rest"}
+        sequence = ["show", "dance", "dance", "sing", "show", "rest", "rest", "rest"] + ["dance"] * 8 + ["show"]
+        for performer, agent_class in (("mickey", MickeyMouseAgent), ("donald", DonaldDuckAgent)):
+            agent = agent_class(clock=VirtualClock(), output=NullSink())
+            twin = population.member(population.add(performer, energy=agent.energy)[0])
+            for action in sequence:
+                getattr(agent, calls[action])()
+                population.try_start(twin.index, action)
+                population.finish(twin.index)
+                if twin.energy != agent.energy:
+                    print(f"❌ {performer} {action}: population energy {twin.energy}, agent {agent.energy}")
+                    return False
+        
+        try:
+            MickeyMouseAgent().favourite = "Heigh-Ho"
+            print("❌ Agents still have a per-instance __dict__")
+            return False
+        except AttributeError:
+            pass
+        
+        print(f"✅ Agent population holds {len(population)} characters in {population.nbytes()} bytes")
+        return True
+    except Exception as e:
+        print(f"❌ Agent population test failed: {e}")
+        return False
+
+def test_http_server():
+    """Test that stalled connections don't block others and event streams are capped."""
+    print("\n🧪 Testing bounded HTTP server...")
+    
+    try:
+        import http.client
+        import socket
+        import threading
+        import time
+        from concurrent_http_server import BoundedThreadPoolHTTPServer
+        from performance_events import Narration
+        from web_server import DisneyVisualAudioHandler, broadcaster
+        
+        server = BoundedThreadPoolHTTPServer(("127.0.0.1", 0), DisneyVisualAudioHandler,
+                                             max_workers=4, connection_timeout=1)
+        port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        clients = []
+        try:
+            # A client that connects and never sends its request holds one worker
+            clients.append(socket.create_connection(("127.0.0.1", port)))
+            time.sleep(0.1)
+            
+            started = time.perf_counter()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/api/status")
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            if response.status != 200 or time.perf_counter() - started > 0.9:
+                print(f"❌ Status request waited behind a stalled connection ({response.status})")
+                return False
+            
+            # Event streams are capped at workers/2; the next viewer gets 503
+            statuses = []
+            for _ in range(server.max_event_streams + 1):
+                viewer = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                viewer.request("GET", "/api/events")
+                response = viewer.getresponse()
+                if response.status != 200:
+                    response.read()
+                statuses.append(response.status)
+                clients.append(viewer)
+            if server.max_event_streams != 2 or statuses != [200, 200, 503]:
+                print(f"❌ Unexpected event stream statuses: {statuses}")
+                return False
+        finally:
+            for client in clients:
+                client.close()
+            # Streams notice their viewer left on the next write
+            for _ in range(2):
+                broadcaster(Narration("Mickey Mouse", message="👋"))
+                time.sleep(0.1)
+            server.shutdown()
+            server.server_close()
+        
+        print(f"✅ Stalled client didn't block others; event streams capped at {server.max_event_streams}")
+        return True
+    except Exception as e:
+        print(f"❌ HTTP server test failed: {e}")
+        return False
+
+def test_rendered_page():
+    """Test conditional GET and gzip handling for the cached page."""
+    print("\n🧪 Testing rendered page cache...")
+    
+    try:
+        import gzip
+        from rendered_page import RenderedPage
+        
+        page = RenderedPage("<html>🎭 Disney</html>")
+        body, etag, encoding = page.variant("gzip, deflate")
+        if encoding != "gzip" or gzip.decompress(body) != page.body:
+            print("❌ Gzip variant does not match the page")
+            return False
+        # q=0 refuses an encoding, even when "*" would allow it
+        for header, expected in (("gzip;q=0", None), ("GZIP; q=0.5", "gzip"), ("*", "gzip"),
+                                 ("*;q=0.5, gzip;q=0", None), ("deflate, br", None), ("gzip;q=0.000", None)):
+            if page.variant(header)[2] != expected:
+                print(f"❌ Accept-Encoding {header!r} gave {page.variant(header)[2]}")
+                return False
+        if not page.is_not_modified(etag, None) or not page.is_not_modified(f"W/{page.etag}", None):
+            print("❌ Matching ETag was not treated as not modified")
+            return False
+        if page.is_not_modified('"stale"', page.last_modified_header):
+            print("❌ Stale ETag was treated as not modified")
+            return False
+        if not page.is_not_modified(None, page.last_modified_header):
+            print("❌ If-Modified-Since was ignored")
+            return False
+        
+        print(f"✅ Page {len(page.body)} bytes, {len(page.gzip_body)} bytes gzipped")
+        return True
+    except Exception as e:
+        print(f"❌ Rendered page test failed: {e}")
+        return False
+
 def main():
     """Run all tests."""
     print("🎭 Disney Coordinator Test Suite")
@@ -74,6 +1430,126 @@ def main():
         print("\n❌ Coordinator tests failed!")
         return
     
+    # Test clock pacing
+    if not test_virtual_clock():
+        print("\n❌ Virtual clock tests failed!")
+        return
+    
+    # Test asyncio engine
+    if not test_async_performances():
+        print("\n❌ Async performance tests failed!")
+        return
+    
+    # Test event stream
+    if not test_event_stream():
+        print("\n❌ Event stream tests failed!")
+        return
+    
+    # Test event broadcaster
+    if not test_event_broadcaster():
+        print("\n❌ Event broadcaster tests failed!")
+        return
+    
+    # Test generic performances
+    if not test_performance_routing():
+        print("\n❌ Generic performance tests failed!")
+        return
+    
+    # Test agent replica pools
+    if not test_agent_pools():
+        print("\n❌ Agent pool tests failed!")
+        return
+    
+    # Test agent reservations
+    if not test_agent_reservations():
+        print("\n❌ Agent reservation tests failed!")
+        return
+    
+    # Test energy policy
+    if not test_energy_policy():
+        print("\n❌ Energy policy tests failed!")
+        return
+    
+    # Test performance scheduler
+    if not test_performance_scheduler():
+        print("\n❌ Performance scheduler tests failed!")
+        return
+    
+    # Test parallel ensemble
+    if not test_parallel_ensemble():
+        print("\n❌ Parallel ensemble tests failed!")
+        return
+    
+    # Test show timelines
+    if not test_show_timeline():
+        print("\n❌ Show timeline tests failed!")
+        return
+    
+    # Test render cache
+    if not test_render_cache():
+        print("\n❌ Render cache tests failed!")
+        return
+    
+    # Test frame-buffered renderer
+    if not test_frame_renderer():
+        print("\n❌ Frame renderer tests failed!")
+        return
+    
+    # Test output sinks
+    if not test_output_sinks():
+        print("\n❌ Output sink tests failed!")
+        return
+    
+    # Test job queue
+    if not test_job_queue():
+        print("\n❌ Job queue tests failed!")
+        return
+    
+    # Test job batches
+    if not test_job_batches():
+        print("\n❌ Job batch tests failed!")
+        return
+    
+    # Test per-job output capture
+    if not test_job_output():
+        print("\n❌ Job output tests failed!")
+        return
+    
+    # Test event log
+    if not test_event_log():
+        print("\n❌ Event log tests failed!")
+        return
+    
+    # Test performance catalog
+    if not test_catalog():
+        print("\n❌ Catalog tests failed!")
+        return
+    
+    # Test mapped catalog
+    if not test_mapped_catalog():
+        print("\n❌ Mapped catalog tests failed!")
+        return
+    
+    # Test search index
+    if not test_search_index():
+        print("\n❌ Search index tests failed!")
+        return
+    
+    # Test agent population
+    if not test_agent_population():
+        print("\n❌ Agent population tests failed!")
+        return
+    
+    # Test bounded HTTP server
+    if not test_http_server():
+        print("\n❌ HTTP server tests failed!")
+        return
+    
+    # Test rendered page cache
+    if not test_rendered_page():
+        print("\n❌ Rendered page tests failed!")
+        return
+    
     print("\n🎉 All tests passed!")
     print("\n🚀 Ready to use:")
     print("   • Web Interface: python3 web_server.py")
@@ -6,16 +6,119 @@ Provides rich musical experience through visual feedback in any environment
 
 import http.server
 import socketserver
+import argparse
 import json
+import logging
 import threading
 import time
 import os
 import sys
+from typing import Dict, NamedTuple
 from urllib.parse import urlparse, parse_qs
 from disney_coordinator import DisneyCoordinatorVisualAudio
-
-# Create global coordinator instance
-coordinator = DisneyCoordinatorVisualAudio()
+from performance_clock import clock_from_environment
+from agent_pool import replicas_from_environment
+from event_broadcaster import PerformanceEventBroadcaster
+from terminal_renderer import DEFAULT_FPS
+from output_sinks import NullSink, sink_from_spec
+from job_output import JobOutputCapture
+from event_log import DEFAULT_LOG_LIMIT
+from search_index import DEFAULT_SEARCH_LIMIT, SearchIndexError, default_search_index_if_ready
+from rendered_page import RenderedPage
+from concurrent_http_server import (
+    BoundedThreadPoolHTTPServer, DEFAULT_WORKERS, DEFAULT_BACKLOG, DEFAULT_CONNECTION_TIMEOUT
+)
+from performance_jobs import (
+    PerformanceJobQueue, JobQueueFull, JobFactory, DEFAULT_JOB_WORKERS, DEFAULT_QUEUE_DEPTH
+)
+
+PORT = 8081
+
+# Create global coordinator instance (set DISNEY_TIME_SCALE to speed up pacing
+# and DISNEY_REPLICAS to run several copies of each character)
+# The server runs headless: performance output is discarded, so terminal or
+# log I/O never slows a show down (choose a sink with --output)
+coordinator = DisneyCoordinatorVisualAudio(clock=clock_from_environment(), output=NullSink(),
+                                           replicas=replicas_from_environment())
+
+# Live performance events for the browser (Server-Sent Events)
+broadcaster = PerformanceEventBroadcaster()
+# Stream ids are event log sequence numbers, so the page resumes from its log cursor
+coordinator.event_log.subscribe(broadcaster.publish)
+
+# Each job's output, kept apart from everyone else's (GET /api/jobs/<id>/output)
+job_output = JobOutputCapture()
+coordinator.engine.subscribe(job_output)
+
+# Seconds between keep-alive comments on idle event streams
+SSE_KEEPALIVE_INTERVAL = 15
+
+class ActionRoute(NamedTuple):
+    """A POST endpoint and the coordinator performance it runs."""
+    agent: str
+    action: str
+    message: str
+
+# Acknowledgements sent when a performance is queued
+ACTION_MESSAGES = {
+    "sing": "{agent} is singing with visual audio!",
+    "dance": "{agent} is dancing with visual audio!",
+    "wave": "{agent} is waving with visual audio!",
+    "show": "{agent} is performing a show with visual audio!",
+    "rest": "{agent} is resting with visual audio!",
+    "duet_song": "Mickey and Donald are performing a duet song with visual audio!",
+    "duet_dance": "Mickey and Donald are performing a duet dance with visual audio!",
+    "ensemble_show": "Mickey and Donald are putting on an ensemble show with visual audio!",
+    "energy_check": "Checking energy levels with visual audio!",
+    "rest_both": "Both agents are taking a rest with visual audio!"
+}
+
+def build_action_routes(coordinator) -> Dict[str, ActionRoute]:
+    """Map POST paths to performances, from the coordinator's available performances."""
+    routes = {}
+    available = coordinator.get_available_performances()
+    for agent, actions in available["individual"].items():
+        for action in actions:
+            message = ACTION_MESSAGES.get(action, "{agent} is performing " + action + "!")
+            routes[f"/api/{agent}/{action}"] = ActionRoute(agent, action, message.format(agent=agent.title()))
+    for name in available["duet"] + available["management"]:
+        if "_" not in name:
+            # e.g. status, which is read with GET
+            continue
+        group, action = name.split("_", 1)
+        message = ACTION_MESSAGES.get(name, f"Performing {group} {action}!")
+        routes[f"/api/{group}/{action}"] = ActionRoute(group, action, message)
+    # Older clients check energy levels with a shorter path
+    if "/api/energy/check" in routes:
+        routes["/api/energy"] = routes["/api/energy/check"]
+    return routes
+
+# POST endpoints, looked up by path
+action_routes = build_action_routes(coordinator)
+
+# The main page never changes while the server runs, so it is rendered once
+_index_page = None
+_index_page_lock = threading.Lock()
+
+# Bounded executor for POST actions (resized from the command line in main)
+job_queue = PerformanceJobQueue()
+
+def performance_job(agent: str, action: str, data: Dict) -> JobFactory:
+    """Check a requested performance and return the job that runs it; raises ValueError if invalid."""
+    data = dict(data)
+    # Scheduling options travel with the performance's own parameters
+    priority = data.pop('priority', None)
+    deadline = data.pop('deadline', None)
+    params = coordinator.validate_performance(agent, action, data)
+    coordinator.scheduler.validate_options(agent, action, priority, deadline)
+    
+    async def perform_action():
+        # Waits for busy agents instead of being turned away
+        result = await coordinator.perform_queued_async(agent, action, priority, deadline, **params)
+        coordinator.output.write_line(f"{agent.title()} {action}: {result}")
+        return result
+    
+    return perform_action
 
 class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
     """Custom HTTP handler for Disney Coordinator with visual audio."""
@@ -26,12 +129,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
         
         if parsed_path.path == '/':
             # Serve the main HTML page
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            
-            html_content = self.get_html_content()
-            self.wfile.write(html_content.encode())
+            self.send_index_page()
             
         elif parsed_path.path == '/api/status':
             # Return coordinator status
@@ -42,20 +140,195 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
             
             status = {
                 'coordinator': coordinator.get_coordinator_status(),
-                'agents': coordinator.get_agent_status()
+                'agents': coordinator.get_agent_status(),
+                'reservations': coordinator.get_reservation_stats(),
+                'jobs': job_queue.get_stats(),
+                'scheduler': coordinator.scheduler.get_stats(),
+                'energy': coordinator.get_energy_report(),
+                'render_cache': coordinator.frames.get_stats(),
+                'output': coordinator.get_output_stats(),
+                'job_output': job_output.get_stats(),
+                'event_log': coordinator.event_log.get_stats()
             }
             self.wfile.write(json.dumps(status).encode())
             
+        elif parsed_path.path == '/api/queue':
+            # Return job queue depth and worker utilisation
+            self.send_json(job_queue.get_stats())
+            
+        elif parsed_path.path == '/api/jobs':
+            # Recent performance jobs, newest first
+            query = parse_qs(parsed_path.query)
+            try:
+                limit = int(query.get('limit', ['50'])[0])
+            except ValueError:
+                limit = 50
+            self.send_json({'jobs': job_queue.list_jobs(limit)})
+            
+        elif parsed_path.path.startswith('/api/jobs/') and parsed_path.path.endswith('/output'):
+            # What one performance job rendered, capped in size
+            job_id = parsed_path.path[len('/api/jobs/'):-len('/output')]
+            output = job_output.get_output(job_id)
+            if output is not None:
+                self.send_json(output)
+            elif job_queue.get_job(job_id) is not None:
+                # Known job that hasn't rendered anything yet (or whose output was evicted)
+                self.send_json({'job_id': job_id, 'lines': [], 'bytes': 0, 'truncated': False})
+            else:
+                self.send_json({'status': 'error', 'message': 'Unknown job'}, 404)
+            
+        elif parsed_path.path.startswith('/api/jobs/'):
+            # State, timings and result of one performance job
+            job = job_queue.get_job(parsed_path.path[len('/api/jobs/'):])
+            if job is None:
+                self.send_json({'status': 'error', 'message': 'Unknown job'}, 404)
+            else:
+                self.send_json(job)
+            
+        elif parsed_path.path == '/api/logs':
+            # Logged performance events after a cursor: ?since=<seq>&limit=N
+            query = parse_qs(parsed_path.query)
+            try:
+                since = query.get('since', [None])[0]
+                since = None if since is None else int(since)
+                limit = int(query.get('limit', [str(DEFAULT_LOG_LIMIT)])[0])
+                if (since is not None and since < 0) or limit < 0:
+                    raise ValueError
+            except ValueError:
+                self.send_json({'status': 'error',
+                                'message': 'since and limit must be non-negative integers'}, 400)
+            else:
+                self.send_json(coordinator.get_logs(since, limit))
+            
+        elif parsed_path.path == '/api/search':
+            # Songs and dances by title, lyrics or steps: ?q=quack*&limit=N
+            query = parse_qs(parsed_path.query)
+            text = query.get('q', [''])[0].strip()
+            try:
+                limit = int(query.get('limit', [str(DEFAULT_SEARCH_LIMIT)])[0])
+                if limit < 0:
+                    raise ValueError
+            except ValueError:
+                self.send_json({'status': 'error', 'message': 'limit must be a non-negative integer'}, 400)
+                return
+            if not text:
+                self.send_json({'status': 'error', 'message': 'Missing search query q'}, 400)
+                return
+            started = time.perf_counter()
+            try:
+                results = coordinator.search_catalog(text, limit, wait=False)
+            except SearchIndexError as error:
+                # Already logged; the next search starts a new build
+                self.send_json({'status': 'error', 'message': str(error)}, 500)
+                return
+            if results is None:
+                self.send_json({'status': 'error', 'message': 'The search index is still being built'},
+                               503, {'Retry-After': '5'})
+                return
+            self.send_json({
+                'query': text,
+                'results': [result._asdict() for result in results],
+                'took_ms': round((time.perf_counter() - started) * 1000, 3)
+            })
+            
+        elif parsed_path.path == '/api/events':
+            # Stream live performance events
+            self.stream_events(parsed_path)
+            
         else:
             # Serve static files
             super().do_GET()
     
+    def do_HEAD(self):
+        """Handle HEAD requests."""
+        if urlparse(self.path).path == '/':
+            self.send_index_page()
+        else:
+            super().do_HEAD()
+    
+    def send_index_page(self):
+        """Serve the pre-rendered page, honouring conditional GET and gzip."""
+        page = get_index_page(self.get_html_content)
+        body, etag, encoding = page.variant(self.headers.get('Accept-Encoding'))
+        
+        not_modified = page.is_not_modified(self.headers.get('If-None-Match'),
+                                            self.headers.get('If-Modified-Since'))
+        if not_modified:
+            self.send_response(304)
+        else:
+            self.send_response(200)
+            self.send_header('Content-type', page.content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', page.last_modified_header)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        if not not_modified and self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    def send_json(self, payload, status_code=200, headers=None):
+        """Send a JSON response."""
+        self.send_response(status_code)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
+    
+    def stream_events(self, parsed_path):
+        """Stream performance events as Server-Sent Events, resuming after Last-Event-ID."""
+        query = parse_qs(parsed_path.query)
+        last_event_id = self.headers.get('Last-Event-ID') or query.get('last_event_id', [None])[0]
+        try:
+            last_id = int(last_event_id)
+        except (TypeError, ValueError):
+            # New viewers start with the live tail
+            last_id = broadcaster.last_id
+        
+        # Streams hold a pooled worker for as long as the viewer stays connected
+        limited = isinstance(self.server, BoundedThreadPoolHTTPServer)
+        if limited and not self.server.try_open_event_stream():
+            self.send_response(503)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Retry-After', '5')
+            self.end_headers()
+            self.wfile.write(json.dumps({'status': 'error', 'message': 'Too many event streams'}).encode())
+            return
+        
+        try:
+            self.send_response(200)
+            self.send_header('Content-type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            self.wfile.write(b"retry: 2000\n\n")
+            self.wfile.flush()
+            while True:
+                entries = broadcaster.wait_for_events(last_id, timeout=SSE_KEEPALIVE_INTERVAL)
+                if not entries:
+                    self.wfile.write(b": keep-alive\n\n")
+                for event_id, payload in entries:
+                    self.wfile.write(f"id: {event_id}\ndata: {payload}\n\n".encode())
+                    last_id = event_id
+                self.wfile.flush()
+        except OSError:
+            # Viewer went away or stopped reading
+            pass
+        finally:
+            if limited:
+                self.server.close_event_stream()
+    
     def do_POST(self):
         """Handle POST requests for coordinator actions."""
         parsed_path = urlparse(self.path)
         
         # Read request body
-        content_length = int(self.headers['Content-Length'])
+        content_length = int(self.headers.get('Content-Length', 0))
         post_data = self.rfile.read(content_length)
         
         try:
@@ -63,152 +336,73 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
         except:
             data = {}
         
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
+        if parsed_path.path == '/api/batch':
+            self.handle_batch(data)
+            return
         
-        response = {'status': 'success', 'message': 'Action completed'}
+        route = action_routes.get(parsed_path.path)
+        if route is None:
+            self.send_json({'status': 'error', 'message': 'Unknown endpoint'}, 404)
+            return
         
-        if parsed_path.path == '/api/mickey/sing':
-            def perform_action():
-                result = coordinator.ask_mickey_to_perform("sing", song_name=data.get('song_name', 'Disney Song'))
-                print(f"Mickey sing: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Mickey is singing with visual audio!'
-            
-        elif parsed_path.path == '/api/mickey/dance':
-            def perform_action():
-                result = coordinator.ask_mickey_to_perform("dance", dance_move=data.get('dance_move', 'Mickey Shuffle'))
-                print(f"Mickey dance: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Mickey is dancing with visual audio!'
-            
-        elif parsed_path.path == '/api/mickey/wave':
-            def perform_action():
-                result = coordinator.ask_mickey_to_perform("wave", style=data.get('style', 'friendly'))
-                print(f"Mickey wave: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Mickey is waving with visual audio!'
-            
-        elif parsed_path.path == '/api/mickey/show':
-            def perform_action():
-                result = coordinator.ask_mickey_to_perform("show")
-                print(f"Mickey show: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Mickey is performing a show with visual audio!'
-            
-        elif parsed_path.path == '/api/mickey/rest':
-            def perform_action():
-                result = coordinator.ask_mickey_to_perform("rest")
-                print(f"Mickey rest: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Mickey is resting with visual audio!'
-            
-        elif parsed_path.path == '/api/donald/sing':
-            def perform_action():
-                result = coordinator.ask_donald_to_perform("sing", song_name=data.get('song_name', 'Donald Song'))
-                print(f"Donald sing: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Donald is singing with visual audio!'
-            
-        elif parsed_path.path == '/api/donald/dance':
-            def perform_action():
-                result = coordinator.ask_donald_to_perform("dance", dance_move=data.get('dance_move', 'Quack Attack'))
-                print(f"Donald dance: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Donald is dancing with visual audio!'
-            
-        elif parsed_path.path == '/api/donald/wave':
-            def perform_action():
-                result = coordinator.ask_donald_to_perform("wave", style=data.get('style', 'friendly'))
-                print(f"Donald wave: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Donald is waving with visual audio!'
-            
-        elif parsed_path.path == '/api/donald/show':
-            def perform_action():
-                result = coordinator.ask_donald_to_perform("show")
-                print(f"Donald show: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Donald is performing a show with visual audio!'
-            
-        elif parsed_path.path == '/api/donald/rest':
-            def perform_action():
-                result = coordinator.ask_donald_to_perform("rest")
-                print(f"Donald rest: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Donald is resting with visual audio!'
-            
-        elif parsed_path.path == '/api/duet/song':
-            def perform_action():
-                result = coordinator.perform_duet_song(data.get('song_name'))
-                print(f"Duet song: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Mickey and Donald are performing a duet song with visual audio!'
-            
-        elif parsed_path.path == '/api/duet/dance':
-            def perform_action():
-                result = coordinator.perform_duet_dance(data.get('dance_name'))
-                print(f"Duet dance: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Mickey and Donald are performing a duet dance with visual audio!'
-            
-        elif parsed_path.path == '/api/ensemble/show':
-            def perform_action():
-                result = coordinator.perform_ensemble_show()
-                print(f"Ensemble show: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Mickey and Donald are putting on an ensemble show with visual audio!'
-            
-        elif parsed_path.path == '/api/energy':
-            def perform_action():
-                result = coordinator.check_energy_levels()
-                print(f"Energy check: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Checking energy levels with visual audio!'
-            
-        elif parsed_path.path == '/api/rest/both':
-            def perform_action():
-                result = coordinator.rest_both_agents()
-                print(f"Rest both: {result}")
-            
-            thread = threading.Thread(target=perform_action)
-            thread.start()
-            response['message'] = 'Both agents are taking a rest with visual audio!'
-            
-        else:
-            response = {'status': 'error', 'message': 'Unknown endpoint'}
+        # Reject bad parameters before anything is queued
+        try:
+            if not isinstance(data, dict):
+                raise ValueError("Request body must be a JSON object")
+            perform_action = performance_job(route.agent, route.action, data)
+        except ValueError as e:
+            self.send_json({'status': 'error', 'message': str(e)}, 400)
+            return
+        
+        try:
+            job = job_queue.submit(parsed_path.path, perform_action)
+        except JobQueueFull as e:
+            self.send_queue_full(e)
+            return
         
-        self.wfile.write(json.dumps(response).encode())
+        self.send_json({'status': 'success', 'message': route.message,
+                        'job_id': job.id, 'job_url': f'/api/jobs/{job.id}'}, 202)
+    
+    def handle_batch(self, data):
+        """Queue many performances from one request: all of them or, if any is invalid or won't fit, none."""
+        # A bare array of items, or {"items": [...], "mode": "parallel" | "sequential"}
+        if isinstance(data, list):
+            data = {'items': data}
+        try:
+            if not isinstance(data, dict) or not isinstance(data.get('items'), list):
+                raise ValueError("Batch body must be an array of {agent, action, params} items")
+            mode = data.get('mode', 'parallel')
+            if mode not in ('parallel', 'sequential'):
+                raise ValueError("Batch mode must be 'parallel' or 'sequential'")
+            jobs = []
+            for index, item in enumerate(data['items']):
+                try:
+                    if not isinstance(item, dict):
+                        raise ValueError("Item must be an object")
+                    agent, action = item.get('agent'), item.get('action')
+                    params = item.get('params', {})
+                    if not isinstance(agent, str) or not isinstance(action, str) or not isinstance(params, dict):
+                        raise ValueError("Item needs string 'agent' and 'action' and an object 'params'")
+                    jobs.append((f'/api/{agent}/{action}', performance_job(agent, action, params)))
+                except ValueError as e:
+                    raise ValueError(f"Item {index}: {e}")
+            submitted = job_queue.submit_batch(jobs, sequential=(mode == 'sequential'))
+        except ValueError as e:
+            self.send_json({'status': 'error', 'message': str(e)}, 400)
+            return
+        except JobQueueFull as e:
+            self.send_queue_full(e)
+            return
+        
+        self.send_json({'status': 'success', 'message': f'Queued {len(submitted)} performances ({mode})',
+                        'mode': mode,
+                        'jobs': [{'name': job.name, 'job_id': job.id, 'job_url': f'/api/jobs/{job.id}'}
+                                 for job in submitted]}, 202)
+    
+    def send_queue_full(self, error: JobQueueFull):
+        """Shed load instead of queueing without bound."""
+        self.send_json({'status': 'error', 'message': 'Too many performances queued, please try again shortly',
+                        'queue': job_queue.get_stats()}, 503, {'Retry-After': str(error.retry_after)})
     
     def get_html_content(self):
         """Generate the HTML content for the web interface."""
@@ -604,6 +798,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
     <script>
         // Global state
         let isPerforming = false;
+        let activeAction = null;
 
         // Utility functions
         function showNotification(message, type = 'success') {{
@@ -628,13 +823,90 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
             }}
         }}
 
-        function addConsoleOutput(message) {{
+        // The console keeps only the most recent lines, however long the page is open
+        const MAX_CONSOLE_LINES = 500;
+        const consoleLines = [];
+
+        function addConsoleOutput(message, label) {{
             const consoleOutput = document.getElementById('console-output');
-            const timestamp = new Date().toLocaleTimeString();
-            consoleOutput.innerHTML += `[${{timestamp}}] ${{message}}\\n`;
+            consoleLines.push(`[${{label || new Date().toLocaleTimeString()}}] ${{message}}`);
+            if (consoleLines.length > MAX_CONSOLE_LINES) {{
+                consoleLines.splice(0, consoleLines.length - MAX_CONSOLE_LINES);
+            }}
+            consoleOutput.textContent = consoleLines.join('\\n') + '\\n';
             consoleOutput.scrollTop = consoleOutput.scrollHeight;
         }}
 
+        // After a refresh, show what happened recently from the server's event log.
+        // Returns the log cursor; stream event ids use the same sequence.
+        async function loadRecentLogs() {{
+            try {{
+                const response = await fetch(`/api/logs?limit=${{MAX_CONSOLE_LINES}}`);
+                const data = await response.json();
+                data.entries.filter(entry => entry.text)
+                    .forEach(entry => addConsoleOutput(entry.text, `#${{entry.seq}}`));
+                return data.next;
+            }} catch (error) {{
+                console.error('Error loading logs:', error);
+                return null;
+            }}
+        }}
+
+        // Live performance events from the server (Server-Sent Events), starting
+        // right after the logged ones. EventSource reconnects by itself and
+        // resumes from the last event id.
+        function connectEventStream(cursor) {{
+            const query = cursor === null || cursor === undefined ? '' : `?last_event_id=${{cursor}}`;
+            const source = new EventSource(`/api/events${{query}}`);
+            source.onmessage = (message) => {{
+                handlePerformanceEvent(JSON.parse(message.data));
+            }};
+        }}
+
+        function handlePerformanceEvent(event) {{
+            if (event.text) {{
+                addConsoleOutput(event.text);
+            }}
+
+            const agent = event.performer.split(' ')[0].toLowerCase();
+            const energy = document.getElementById(`${{agent}}-energy`);
+            const performing = document.getElementById(`${{agent}}-performing`);
+
+            if (event.kind === 'energy_changed' && energy) {{
+                energy.textContent = `${{event.new_energy}}%`;
+            }} else if (event.kind === 'started' && performing) {{
+                performing.textContent = 'Performing';
+            }} else if (event.kind === 'finished') {{
+                if (performing) {{
+                    performing.textContent = 'Available';
+                }}
+                if (event.action === activeAction) {{
+                    addConsoleOutput(`✅ ${{event.result}}`);
+                    finishPerformance();
+                }}
+            }}
+        }}
+
+        function startPerformance(action, agents) {{
+            isPerforming = true;
+            activeAction = action;
+            agents.forEach(agent => setLoading(agent, true));
+        }}
+
+        function finishPerformance() {{
+            isPerforming = false;
+            activeAction = null;
+            setLoading('mickey', false);
+            setLoading('donald', false);
+        }}
+
+        function performanceRejected(data) {{
+            // e.g. the server's performance queue is full
+            showNotification(data.message, 'warning');
+            addConsoleOutput(`❌ ${{data.message}}`);
+            finishPerformance();
+        }}
+
         // Individual agent actions with visual audio
         function performAction(agent, action) {{
             if (isPerforming) {{
@@ -642,8 +914,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
                 return;
             }}
 
-            setLoading(agent, true);
-            isPerforming = true;
+            startPerformance(action, [agent]);
 
             // Show immediate feedback
             showNotification(`${{agent.charAt(0).toUpperCase() + agent.slice(1)}} is performing ${{action}} with visual audio!`);
@@ -660,6 +931,10 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
             .then(response => response.json())
             .then(data => {{
                 console.log('Response:', data);
+                if (data.status === 'error') {{
+                    performanceRejected(data);
+                    return;
+                }}
                 showNotification(`${{data.message}} Check console for visual audio output!`);
                 addConsoleOutput(`✅ ${{data.message}}`);
             }})
@@ -667,12 +942,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
                 console.error('Error:', error);
                 showNotification('Error performing action!', 'error');
                 addConsoleOutput(`❌ Error: ${{error.message}}`);
-            }})
-            .finally(() => {{
-                setTimeout(() => {{
-                    setLoading(agent, false);
-                    isPerforming = false;
-                }}, 3000);
+                finishPerformance();
             }});
         }}
 
@@ -683,9 +953,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
                 return;
             }}
 
-            isPerforming = true;
-            setLoading('mickey', true);
-            setLoading('donald', true);
+            startPerformance(`duet_${{type}}`, ['mickey', 'donald']);
 
             showNotification(`Mickey and Donald are performing a duet ${{type}} with visual audio!`);
             addConsoleOutput(`🎵 Starting duet ${{type}} performance...`);
@@ -701,6 +969,10 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
             .then(response => response.json())
             .then(data => {{
                 console.log('Response:', data);
+                if (data.status === 'error') {{
+                    performanceRejected(data);
+                    return;
+                }}
                 showNotification(`${{data.message}} Check console for visual audio output!`);
                 addConsoleOutput(`✅ ${{data.message}}`);
             }})
@@ -708,13 +980,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
                 console.error('Error:', error);
                 showNotification('Error performing duet!', 'error');
                 addConsoleOutput(`❌ Error: ${{error.message}}`);
-            }})
-            .finally(() => {{
-                setTimeout(() => {{
-                    setLoading('mickey', false);
-                    setLoading('donald', false);
-                    isPerforming = false;
-                }}, 5000);
+                finishPerformance();
             }});
         }}
 
@@ -724,9 +990,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
                 return;
             }}
 
-            isPerforming = true;
-            setLoading('mickey', true);
-            setLoading('donald', true);
+            startPerformance('ensemble_show', ['mickey', 'donald']);
 
             showNotification('Mickey and Donald are putting on an ensemble show with visual audio!');
             addConsoleOutput(`🎭 Starting ensemble show performance...`);
@@ -742,6 +1006,10 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
             .then(response => response.json())
             .then(data => {{
                 console.log('Response:', data);
+                if (data.status === 'error') {{
+                    performanceRejected(data);
+                    return;
+                }}
                 showNotification(`${{data.message}} Check console for visual audio output!`);
                 addConsoleOutput(`✅ ${{data.message}}`);
             }})
@@ -749,13 +1017,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
                 console.error('Error:', error);
                 showNotification('Error performing ensemble!', 'error');
                 addConsoleOutput(`❌ Error: ${{error.message}}`);
-            }})
-            .finally(() => {{
-                setTimeout(() => {{
-                    setLoading('mickey', false);
-                    setLoading('donald', false);
-                    isPerforming = false;
-                }}, 8000);
+                finishPerformance();
             }});
         }}
 
@@ -790,7 +1052,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
             showNotification('Checking energy levels...');
             addConsoleOutput(`🔋 Checking energy levels...`);
             
-            fetch('/api/energy', {{
+            fetch('/api/energy/check', {{
                 method: 'POST',
                 headers: {{
                     'Content-Type': 'application/json',
@@ -816,8 +1078,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
                 return;
             }}
 
-            setLoading('mickey', true);
-            setLoading('donald', true);
+            startPerformance('rest_both', ['mickey', 'donald']);
 
             showNotification('Both agents are taking a rest with visual audio!');
             addConsoleOutput(`😴 Both agents taking a rest...`);
@@ -832,6 +1093,10 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
             .then(response => response.json())
             .then(data => {{
                 console.log('Rest both:', data);
+                if (data.status === 'error') {{
+                    performanceRejected(data);
+                    return;
+                }}
                 showNotification(`${{data.message}} Check console for details!`);
                 addConsoleOutput(`✅ ${{data.message}}`);
             }})
@@ -839,12 +1104,7 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
                 console.error('Error:', error);
                 showNotification('Error resting agents!', 'error');
                 addConsoleOutput(`❌ Error: ${{error.message}}`);
-            }})
-            .finally(() => {{
-                setTimeout(() => {{
-                    setLoading('mickey', false);
-                    setLoading('donald', false);
-                }}, 3000);
+                finishPerformance();
             }});
         }}
 
@@ -855,17 +1115,73 @@ class DisneyVisualAudioHandler(http.server.SimpleHTTPRequestHandler):
             addConsoleOutput(`✨ Musical symbols: ♪ ♫ ♬ ♩ ♭ ♮ ♯`);
             addConsoleOutput(`🎶 Harmony symbols: 🎵 🎶 🎼 🎤 🎧 🎹 🎸 🎺 🎻`);
             checkStatus();
+            loadRecentLogs().then(connectEventStream);
         }});
     </script>
 </body>
 </html>
 """
 
-def main():
+def get_index_page(render) -> RenderedPage:
+    """The main page, rendered and compressed on first use and then reused."""
+    global _index_page
+    if _index_page is None:
+        with _index_page_lock:
+            if _index_page is None:
+                _index_page = RenderedPage(render())
+    return _index_page
+
+def create_server(port: int = PORT, workers: int = DEFAULT_WORKERS, backlog: int = DEFAULT_BACKLOG,
+                  timeout: float = DEFAULT_CONNECTION_TIMEOUT, single_threaded: bool = False):
+    """Create the HTTP server: a bounded worker pool, or the legacy one-connection-at-a-time server."""
+    if single_threaded:
+        return socketserver.TCPServer(("", port), DisneyVisualAudioHandler)
+    return BoundedThreadPoolHTTPServer(("", port), DisneyVisualAudioHandler,
+                                       max_workers=workers, backlog=backlog,
+                                       connection_timeout=timeout)
+
+def parse_args(argv=None):
+    """Parse web server command line options."""
+    parser = argparse.ArgumentParser(description="Disney Coordinator Visual Audio Web Server")
+    parser.add_argument("--port", type=int, default=PORT, help="port to listen on")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="worker threads serving connections")
+    parser.add_argument("--backlog", type=int, default=DEFAULT_BACKLOG,
+                        help="listen backlog for connections waiting for a worker")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_CONNECTION_TIMEOUT,
+                        help="per-connection socket timeout in seconds")
+    parser.add_argument("--job-workers", type=int, default=DEFAULT_JOB_WORKERS,
+                        help="performances that may run at the same time")
+    parser.add_argument("--queue-depth", type=int, default=DEFAULT_QUEUE_DEPTH,
+                        help="performances that may wait for a job worker before requests get 503")
+    parser.add_argument("--output", default="null",
+                        help="where performance output goes: null (headless), stdout, "
+                             "file:<path> (rotating log) or ring[:<lines>] (in memory)")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS,
+                        help="times a second performance output is written with --output stdout")
+    parser.add_argument("--single-threaded", action="store_true",
+                        help="serve one connection at a time (legacy behaviour, for benchmarks)")
+    args = parser.parse_args(argv)
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    try:
+        args.output_sink = sink_from_spec(args.output, args.fps)
+    except (ValueError, OSError) as e:
+        parser.error(f"--output: {e}")
+    return args
+
+def main(argv=None):
     """Start the visual audio web server."""
-    PORT = 8081
+    global job_queue
+    args = parse_args(argv)
+    PORT = args.port
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    job_queue = PerformanceJobQueue(args.job_workers, args.queue_depth)
+    coordinator.set_output(args.output_sink)
+    # Index the catalog in the background; /api/search answers 503 until it's done
+    default_search_index_if_ready()
     
-    with socketserver.TCPServer(("", PORT), DisneyVisualAudioHandler) as httpd:
+    with create_server(args.port, args.workers, args.backlog, args.timeout, args.single_threaded) as httpd:
         print("🎭🎵🦆🐭")
         print("=" * 60)
         print("    DISNEY COORDINATOR VISUAL AUDIO WEB SERVER")
@@ -876,6 +1192,15 @@ def main():
         print(f"✨ Audio System: Visual Audio (Musical Symbols & Animations)")
         print(f"🌐 Open http://localhost:{PORT} in your browser")
         print(f"🎵 Click the buttons to see rich visual musical performances!")
+        if args.single_threaded:
+            print("🧵 Serving one connection at a time")
+        else:
+            print(f"🧵 {args.workers} workers, backlog {args.backlog}, {args.timeout:g}s connection timeout")
+        print(f"🎬 {args.job_workers} performance workers, queue depth {args.queue_depth}")
+        if args.output == "null":
+            print("🔇 Headless: performance output is discarded (see --output)")
+        else:
+            print(f"📝 Performance output: {args.output}")
         print()
         print("🎭 Available Features:")
         print("   • Individual performances with visual audio")